@@ -14,3 +14,15 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "anomalytoolkit.settings")
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+# ANOMALY_ASYNC_EXECUTOR=1 이면 서버 프로세스가 대기열도 직접 처리 (시작 시 남은 작업 / 중단된 작업 재실행)
+if settings.ANOMALY_ASYNC_EXECUTOR:
+    from apps.web.executor import with_job_sweeper
+    application = with_job_sweeper(application)
+
+# ANOMALY_WARMUP=1 이면 탐지 엔진을 미리 로드 (gunicorn --preload 면 fork 전에 한 번, 아니면 워커마다)
+if settings.ANOMALY_WARMUP:
+    from apps.web.warmup import warm_up
+    warm_up()
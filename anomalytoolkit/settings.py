@@ -17,6 +17,9 @@ from dotenv import load_dotenv
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# .env 는 아래 ANOMALY_* 설정보다 먼저 읽어야 한다
+load_dotenv()
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -32,14 +35,60 @@ TEMPLATES = [
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 MEDIA_URL = '/media/'
 
+# 이상 탐지 설정
+# 업로드 파일이 이 크기(byte) 이상이면 청크 단위 스트리밍 모드로 분석
+ANOMALY_STREAMING_THRESHOLD = int(os.getenv("ANOMALY_STREAMING_THRESHOLD", 200 * 1024 * 1024))
+ANOMALY_CHUNK_SIZE = int(os.getenv("ANOMALY_CHUNK_SIZE", 100_000))
+# 기본 탐지 백엔드 ('pycaret' 또는 PyCaret 오버헤드가 없는 'sklearn', 여러 탐지기를 함께 학습하는 'ensemble')
+ANOMALY_BACKEND = os.getenv("ANOMALY_BACKEND", "pycaret")
+# 'ensemble' 백엔드에서 탐지기를 고르지 않았을 때 함께 학습할 탐지기 (쉼표로 구분)
+ANOMALY_ENSEMBLE_DETECTORS = os.getenv("ANOMALY_ENSEMBLE_DETECTORS", "iforest,lof,knn,hbos").split(",")
+# 병렬 워커 수 (-1 = 전체 코어, 비워두면 백엔드 기본값으로 학습하고 점수는 단일 프로세스)
+ANOMALY_N_JOBS = int(os.getenv("ANOMALY_N_JOBS")) if os.getenv("ANOMALY_N_JOBS") else None
+# 업로드 CSV를 내용 해시 기준으로 변환해두는 Arrow(컬럼형) 캐시 위치
+ANOMALY_COLUMNAR_CACHE_DIR = os.path.join(MEDIA_ROOT, 'cache', 'columnar')
+# 전처리 결과(스케일링된 feature 행렬) 캐시 위치와 크기 상한 (byte) - 같은 파일을 다른 모델로 다시 분석할 때 바로 학습
+# 상한을 넘으면 오래 안 쓴 항목부터 삭제, 0 이면 캐시를 쓰지 않는다
+ANOMALY_FEATURE_CACHE_DIR = os.path.join(MEDIA_ROOT, 'cache', 'features')
+ANOMALY_FEATURE_CACHE_SIZE = int(os.getenv("ANOMALY_FEATURE_CACHE_SIZE", 2 * 1024 ** 3))
+# 고유값 수가 이보다 많은 범주형 컬럼은 Count-Min Sketch 로 빈도 근사 (비워두면 항상 정확한 빈도)
+ANOMALY_SKETCH_THRESHOLD = int(os.getenv("ANOMALY_SKETCH_THRESHOLD")) if os.getenv("ANOMALY_SKETCH_THRESHOLD") else None
+# 배치 증분 추가 시 모델을 다시 학습하는 최근 행 수 (슬라이딩 윈도우)
+ANOMALY_WINDOW_SIZE = int(os.getenv("ANOMALY_WINDOW_SIZE", 50_000))
+# 이 행 수만 표본으로 뽑아 학습하고 전체 행은 배치 단위로 점수 계산 (비워두면 전체 행으로 학습)
+ANOMALY_FIT_SAMPLE_SIZE = int(os.getenv("ANOMALY_FIT_SAMPLE_SIZE")) if os.getenv("ANOMALY_FIT_SAMPLE_SIZE") else None
+# 표본 추출 방식 ('random' 또는 ANOMALY_STRATIFY_COLUMN 값 비율을 유지하는 'stratified')
+ANOMALY_SAMPLE_STRATEGY = os.getenv("ANOMALY_SAMPLE_STRATEGY", "random")
+ANOMALY_STRATIFY_COLUMN = os.getenv("ANOMALY_STRATIFY_COLUMN") or None
+ANOMALY_SAMPLE_SEED = int(os.getenv("ANOMALY_SAMPLE_SEED", 42))
+# 워커 시작 시 탐지 엔진(pandas / sklearn / PyCaret)을 미리 로드 (wsgi.py / asgi.py 에서 호출)
+ANOMALY_WARMUP = os.getenv("ANOMALY_WARMUP", "0") == "1"
+# 분석 워커(run_analysis_worker)가 동시에 실행하는 분석 프로세스 수 (CPU / 메모리 과점유 방지)
+ANOMALY_WORKER_CONCURRENCY = int(os.getenv("ANOMALY_WORKER_CONCURRENCY", max((os.cpu_count() or 2) // 2, 1)))
+ANOMALY_WORKER_POLL_INTERVAL = float(os.getenv("ANOMALY_WORKER_POLL_INTERVAL", 1.0))
+# 실행 중 작업의 heartbeat 가 이 시간(초) 이상 끊기면 워커가 죽은 것으로 보고 다시 대기열로
+ANOMALY_JOB_STALE_SECONDS = int(os.getenv("ANOMALY_JOB_STALE_SECONDS", 60))
+ANOMALY_JOB_MAX_ATTEMPTS = int(os.getenv("ANOMALY_JOB_MAX_ATTEMPTS", 3))
+# ASGI 비동기 업로드(api/upload/)의 분석을 서버 프로세스의 프로세스 풀에서 바로 실행
+# 켜져 있으면 ASGI 서버가 대기열도 주기적으로 확인해 남은 작업 / 중단된 작업을 실행한다
+# (0 이면 작업 등록만 하고 run_analysis_worker 에 맡긴다 - WSGI 배포는 설정과 관계없이 워커가 필요)
+ANOMALY_ASYNC_EXECUTOR = os.getenv("ANOMALY_ASYNC_EXECUTOR", "1") == "1"
+# 청크 업로드(api/uploads/)의 청크 크기 (byte) - 연결이 끊기면 이 단위로 다시 보낸다
+ANOMALY_UPLOAD_CHUNK_SIZE = int(os.getenv("ANOMALY_UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024))
+# 저장 공간 관리(run_storage_manager): MEDIA_ROOT 쿼터 (byte) / 원본 업로드 보관 기간 (일) / 정리 주기 (초)
+# 쿼터를 넘거나 보관 기간이 지나면 오래 안 쓴 원본 업로드와 컬럼형 캐시부터 삭제 (결과 / 아티팩트는 유지)
+ANOMALY_STORAGE_QUOTA = int(os.getenv("ANOMALY_STORAGE_QUOTA")) if os.getenv("ANOMALY_STORAGE_QUOTA") else None
+ANOMALY_UPLOAD_RETENTION_DAYS = float(os.getenv("ANOMALY_UPLOAD_RETENTION_DAYS")) if os.getenv("ANOMALY_UPLOAD_RETENTION_DAYS") else None
+ANOMALY_STORAGE_INTERVAL = int(os.getenv("ANOMALY_STORAGE_INTERVAL", 3600))
+# 분석 대기열 / 작업 실행 / 업로드(apps.*) 로그 수준 - 콘솔(stderr)로 출력
+ANOMALY_LOG_LEVEL = os.getenv("ANOMALY_LOG_LEVEL", "INFO")
+
 
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-load_dotenv()
-
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -95,13 +144,54 @@ WSGI_APPLICATION = "anomalytoolkit.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite 는 WAL 모드로 - 분석 워커의 결과 저장과 대시보드 조회가 서로 막지 않는다
+# (읽기는 쓰기 중에도 마지막 커밋 시점을 읽고, 쓰기끼리만 busy_timeout 동안 차례를 기다린다)
+# 트랜잭션은 IMMEDIATE 로 시작 - 읽기 후 쓰기로 올라가다 'database is locked' 로 바로 실패하지 않도록
+ANOMALY_SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+]
+# 쓰기 잠금을 기다리는 최대 시간 (초)
+ANOMALY_DB_TIMEOUT = int(os.getenv("ANOMALY_DB_TIMEOUT", 20))
+# 연결 유지 시간 (초, 0 = 요청마다 새 연결). 워커 / WSGI 프로세스는 연결을 재사용
+ANOMALY_DB_CONN_MAX_AGE = int(os.getenv("ANOMALY_DB_CONN_MAX_AGE", 60))
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.getenv("ANOMALY_DB_PATH") or BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": ";".join(ANOMALY_SQLITE_PRAGMAS),
+            "transaction_mode": "IMMEDIATE",
+            "timeout": ANOMALY_DB_TIMEOUT,
+        },
+        "CONN_MAX_AGE": ANOMALY_DB_CONN_MAX_AGE,
+        # 재사용하는 연결이 끊겼으면 요청 시작 시 다시 연결
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# PostgreSQL 을 쓰면 (ANOMALY_DB_ENGINE=postgresql) psycopg 연결 풀 사용 - 풀과 CONN_MAX_AGE 는 함께 쓸 수 없다
+if os.getenv("ANOMALY_DB_ENGINE") == "postgresql":
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("ANOMALY_DB_NAME", "anomalytoolkit"),
+        "USER": os.getenv("ANOMALY_DB_USER", ""),
+        "PASSWORD": os.getenv("ANOMALY_DB_PASSWORD", ""),
+        "HOST": os.getenv("ANOMALY_DB_HOST", ""),
+        "PORT": os.getenv("ANOMALY_DB_PORT", ""),
+        "OPTIONS": {
+            "pool": {
+                "min_size": int(os.getenv("ANOMALY_DB_POOL_MIN", 2)),
+                "max_size": int(os.getenv("ANOMALY_DB_POOL_MAX", 10)),
+                "timeout": ANOMALY_DB_TIMEOUT,
+            },
+        },
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -144,4 +234,16 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "simple": {"format": "%(asctime)s %(levelname)s %(name)s: %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "simple"},
+    },
+    "loggers": {
+        "apps": {"handlers": ["console"], "level": ANOMALY_LOG_LEVEL},
+    },
+}
@@ -14,3 +14,10 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "anomalytoolkit.settings")
 
 application = get_wsgi_application()
+
+# ANOMALY_WARMUP=1 이면 탐지 엔진을 미리 로드 (gunicorn --preload 면 fork 전에 한 번, 아니면 워커마다)
+from django.conf import settings  # noqa: E402
+
+if settings.ANOMALY_WARMUP:
+    from apps.web.warmup import warm_up
+    warm_up()
@@ -1,2 +1,10 @@
-from .web.routes import bp as web_bp
+# Flask 블루프린트는 실제로 쓸 때만 불러온다
+# (Django 가 apps 패키지를 import 할 때 Flask / 탐지 엔진까지 함께 로드되지 않도록)
 # app.register_blueprint(web_bp)
+
+
+def __getattr__(name):
+    if name == 'web_bp':
+        from .web.routes import bp
+        return bp
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
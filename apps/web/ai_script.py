@@ -1,57 +1,687 @@
 # ai_script.py
 
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from pycaret.anomaly import setup, create_model, assign_model
-import category_encoders as ce
 
-def detect_anomalies(file_path):
+from .artifacts import save_artifact, load_artifact, update_artifact
+from .backends import BACKENDS, DEFAULT_BACKEND, ShardedScorer, get_backend, resolve_n_jobs
+from .columnar import count_rows, file_sha256, is_columnar, iter_columnar_chunks, read_columnar
+from .encoding import FrequencyEncoder
+from .features import feature_cache_key, load_features, store_features
+from .profiling import StageProfiler
+from .results import ResultWriter, TopK, append_results, top_rows, write_results
+from .schema import optimize_dtypes, split_columns, to_feature_matrix
+
+# 스트리밍 모드에서 모델 학습에 쓰는 기본 표본 크기 (reservoir sampling)
+FIT_SAMPLE_SIZE = 100_000
+SAMPLE_STRATEGIES = ('random', 'stratified')
+# 증분 추가(append_batch) 시 모델을 다시 학습하는 최근 행 수 (슬라이딩 윈도우)
+WINDOW_SIZE = 50_000
+# 결과 파일 없이 HTML 표로 반환할 때 담는 최대 이상치 행 수 (점수 상위 행)
+TABLE_ROW_LIMIT = 1_000
+
+def detect_anomalies(file_path, artifact_path=None, save_artifact_to=None,
+                     chunksize=None, fit_sample_size=None, backend=None,
+                     n_jobs=None, sketch_threshold=None, window_size=WINDOW_SIZE,
+                     sample_strategy='random', sample_seed=42, stratify_col=None,
+                     profiler=None, save_results_to=None, detectors=None,
+                     feature_cache_dir=None, feature_cache_size=None, content_hash=None,
+                     full_table=False):
+    """
+    업로드된 CSV 파일 경로(file_path, 또는 columnar.ensure_columnar 로 만든 .arrow 캐시)를 받아
+    1) 전처리 → 2) 이상 탐지 (PyCaret / sklearn 백엔드) → 3) 요약 + 이상치 결과 반환
+
+    artifact_path    : 저장된 아티팩트(인코더/스케일러/모델)로 재학습 없이 점수만 계산
+    save_artifact_to : 새로 학습한 인코더/스케일러/모델을 저장할 경로
+    chunksize        : 지정하면 CSV를 청크 단위로 읽는 스트리밍 모드로 실행
+                       (메모리 사용량이 파일 크기가 아닌 청크 크기에 비례)
+    fit_sample_size  : 모델 학습에 쓰는 표본 행 수. 지정하면 표본으로만 학습하고
+                       전체 행은 배치 단위로 점수 계산 (학습 시간이 업로드 크기와 무관)
+                       스트리밍 모드에서는 지정하지 않으면 FIT_SAMPLE_SIZE
+    backend          : 탐지 백엔드 이름 ('pycaret', 'sklearn', 'ensemble', 기본값 DEFAULT_BACKEND)
+                       아티팩트로 점수만 계산할 때는 아티팩트의 백엔드를 사용
+    detectors        : backend='ensemble' 일 때 함께 학습할 탐지기 이름 목록 (기본값 DEFAULT_ENSEMBLE)
+                       전처리한 행렬 하나로 병렬 학습하고 모델별 점수(Score_<모델>) + 순위 평균 점수를 저장
+    n_jobs           : 병렬 워커 수 (-1 = 전체 코어). 트리 학습을 나눠 수행하고
+                       점수 계산은 행 블록 단위로 프로세스 풀에서 처리 (결과는 직렬 실행과 동일)
+    sketch_threshold : 고유값 수가 이보다 많은 범주형 컬럼은 Count-Min Sketch 로 빈도를 근사
+                       (None 이면 모든 컬럼 정확한 빈도 - ce.CountEncoder 와 같은 결과)
+    window_size      : 아티팩트에 함께 저장할 최근 원본 행 수 (append_batch 재학습용)
+    sample_strategy  : 'random' 또는 stratify_col 값 비율을 유지하는 'stratified'
+                       (스트리밍은 random 으로 대신하고 fit_sample["note"] 에 기록)
+    sample_seed      : 표본 추출 seed (결과의 fit_sample 에 함께 기록 → 재현 가능)
+    profiler         : 단계별 시간/메모리를 기록할 StageProfiler (결과의 profile 에 저장)
+    save_results_to  : 이상치 행을 저장할 결과 파일(Arrow) 경로 - results.query_results 로 페이지 조회
+                       지정하지 않으면 이상치 표를 결과의 table_html 로 반환
+    feature_cache_dir  : 전처리 결과(스케일링된 행렬 + 인코더 / 스케일러) 캐시 폴더 (features.py)
+                         같은 내용 + 같은 전처리 설정이면 CSV 읽기 / 인코딩 / 스케일링 없이 바로 학습
+                         (인메모리 학습 + random 표본 추출일 때만, 스트리밍 모드는 사용하지 않음)
+    feature_cache_size : 캐시 폴더 크기 상한 (byte) - 넘으면 오래 안 쓴 항목부터 삭제
+    content_hash       : 입력 내용 해시 (캐시 키) - 없으면 file_path 를 읽어 계산
+    full_table         : 점수를 매긴 전체 행을 table_html 로 반환 (이전 호출 경로용, 인메모리 모드만)
+    """
+    if sample_strategy not in SAMPLE_STRATEGIES:
+        raise ValueError(f"알 수 없는 표본 추출 방식입니다: {sample_strategy}")
+    profiler = profiler or StageProfiler()
+    profiler.expect(pipeline_stages(
+        chunksize, artifact_path, save_artifact_to, fit_sample_size, n_jobs, backend, bool(feature_cache_dir),
+    ))
+
+    if chunksize:
+        return detect_anomalies_streaming(
+            file_path, chunksize,
+            artifact_path=artifact_path,
+            save_artifact_to=save_artifact_to,
+            fit_sample_size=fit_sample_size,
+            backend=backend,
+            n_jobs=n_jobs,
+            sketch_threshold=sketch_threshold,
+            window_size=window_size,
+            sample_strategy=sample_strategy,
+            sample_seed=sample_seed,
+            profiler=profiler,
+            save_results_to=save_results_to,
+            detectors=detectors,
+        )
+
+    if artifact_path:
+        # 1~5. 저장된 아티팩트가 쓰는 컬럼만 불러와 변환 + 점수 계산 (fit 없음)
+        with profiler.stage('load_artifact'):
+            artifact = load_artifact(artifact_path)
+        with profiler.stage('load') as stage:
+            data = load_data(file_path, columns=artifact["numeric_cols"] + artifact["categorical_cols"])
+            stage["rows"] = len(data)
+        with profiler.stage('optimize_dtypes', rows=len(data)):
+            data, dtype_report = optimize_dtypes(data)
+        with profiler.stage('transform', rows=len(data)):
+            data_scaled = transform_features(
+                data,
+                artifact["encoder"],
+                artifact["scaler"],
+                artifact["numeric_cols"],
+                artifact["categorical_cols"],
+            )
+        with profiler.stage('score', rows=len(data_scaled)):
+            with ShardedScorer(artifact["backend"], n_jobs) as scorer:
+                results = score_with_backend(scorer, data_scaled)
+        with profiler.stage('summarize', rows=len(results)):
+            result = summarize_results(results, artifact["backend"], save_results_to, full_table=full_table)
+        result["dtype_report"] = dtype_report
+        result["profile"] = profiler.report()
+        return result
+
+    # 0. 전처리 결과 캐시 (층화 추출은 원본 컬럼이 필요하므로 캐시를 쓰지 않는다)
+    cache_key = cached = data = None
+    if feature_cache_dir and sample_strategy == 'random':
+        cache_key = feature_cache_key(content_hash or file_sha256(file_path), sketch_threshold)
+        with profiler.stage('load_features') as stage:
+            cached = load_features(feature_cache_dir, cache_key)
+            # 캐시에 남긴 윈도우가 이번 window_size 보다 짧으면 다시 전처리
+            if cached and len(cached[1]["window"]) < min(window_size, cached[1]["rows"]):
+                cached = None
+            stage["hit"] = cached is not None
+    if cached:
+        profiler.skip(['load', 'optimize_dtypes', 'encode', 'scale', 'store_features'])
+        data_scaled, meta = cached
+        encoder, scaler = meta["encoder"], meta["scaler"]
+        numeric_cols, categorical_cols = meta["numeric_cols"], meta["categorical_cols"]
+        dtype_report = meta["dtype_report"]
+        window = meta["window"].iloc[-window_size:]
+    else:
+        if cache_key is None:
+            profiler.skip(['load_features', 'store_features'])
+        # 1. 데이터 불러오기 + dtype 축소 (작은 정수/실수형, 문자열 → category)
+        with profiler.stage('load') as stage:
+            data = load_data(file_path)
+            stage["rows"] = len(data)
+        with profiler.stage('optimize_dtypes', rows=len(data)):
+            data, dtype_report = optimize_dtypes(data)
+
+        # 2. 숫자형 / 문자형 분리
+        numeric_cols, categorical_cols = split_columns(data)
+
+        # 3. Frequency Encoding
+        with profiler.stage('encode', rows=len(data)):
+            encoder = FrequencyEncoder(categorical_cols, sketch_threshold=sketch_threshold)
+            data_encoded = encoder.fit_transform(data)
+
+        # 4. 합치기(float32 feature 행렬) + 스케일링
+        with profiler.stage('scale', rows=len(data)):
+            full_data = to_feature_matrix(pd.concat([
+                data[numeric_cols].reset_index(drop=True),
+                data_encoded .reset_index(drop=True)
+            ], axis=1))
+            scaler     = StandardScaler()
+            data_scaled = pd.DataFrame(
+                scaler.fit_transform(full_data),
+                columns=full_data.columns
+            )
+        window = data[numeric_cols + categorical_cols].iloc[-window_size:]
+
+        # 4-1. 다음 분석(다른 모델 / 설정)이 바로 학습할 수 있도록 전처리 결과 저장
+        if cache_key:
+            with profiler.stage('store_features', rows=len(data_scaled)):
+                store_features(feature_cache_dir, cache_key, data_scaled, {
+                    "numeric_cols": numeric_cols,
+                    "categorical_cols": categorical_cols,
+                    "encoder": encoder,
+                    "scaler": scaler,
+                    "dtype_report": dtype_report,
+                    "window": window,
+                }, max_bytes=feature_cache_size)
+
+    # 5. 탐지 모델 학습 + 점수 계산
+    detector = new_backend(backend, n_jobs, detectors)
+    fit_sample = None
+    if fit_sample_size and fit_sample_size < len(data_scaled):
+        # 표본으로만 학습하고 전체 행은 배치 단위로 점수 계산
+        positions = sample_rows(data_scaled if data is None else data, fit_sample_size,
+                                sample_strategy, sample_seed, stratify_col)
+        with profiler.stage('fit', rows=len(positions)) as stage:
+            detector.fit(data_scaled.iloc[positions])
+            _record_steps(stage, detector)
+        with profiler.stage('score', rows=len(data_scaled)):
+            with ShardedScorer(detector, n_jobs) as scorer:
+                outcome = scorer.score(data_scaled)
+        fit_sample = {
+            "size": len(positions),
+            "total_rows": len(data_scaled),
+            "strategy": sample_strategy,
+            "seed": sample_seed,
+            "stratify_col": stratify_col if sample_strategy == 'stratified' else None,
+        }
+    elif fit_separately(fit_sample_size, n_jobs, backend):
+        # 표본 크기가 전체 행 이상이면 전체로 학습 (단계는 pipeline_stages 가 예정한 fit / score 그대로)
+        with profiler.stage('fit', rows=len(data_scaled)) as stage:
+            detector.fit(data_scaled)
+            _record_steps(stage, detector)
+        with profiler.stage('score', rows=len(data_scaled)):
+            with ShardedScorer(detector, n_jobs) as scorer:
+                outcome = scorer.score(data_scaled)
+    else:
+        with profiler.stage('fit_score', rows=len(data_scaled)) as stage:
+            outcome = detector.fit_score(data_scaled)
+            _record_steps(stage, detector)
+    results = _with_scores(data_scaled, outcome)
+
+    # 5-1. 학습된 파이프라인 저장 (다음 업로드에서 재사용)
+    if save_artifact_to:
+        with profiler.stage('save_artifact'):
+            save_artifact(save_artifact_to, encoder, scaler, detector, numeric_cols, categorical_cols, window)
+
+    with profiler.stage('summarize', rows=len(results)):
+        result = summarize_results(results, detector, save_results_to, full_table=full_table)
+    result["dtype_report"] = dtype_report
+    if fit_sample:
+        result["fit_sample"] = fit_sample
+    result["profile"] = profiler.report()
+    return result
+
+
+def pipeline_stages(chunksize=None, artifact_path=None, save_artifact_to=None,
+                    fit_sample_size=None, n_jobs=None, backend=None, feature_cache=False):
+    """detect_anomalies 가 실행할 단계 이름 목록 (진행률 계산용 - 실제 stage 이름과 같아야 함)"""
+    if chunksize:
+        if artifact_path:
+            return ['load_artifact', 'pass2_score', 'summarize']
+        stages = ['pass1_statistics', 'fit']
+        if save_artifact_to:
+            stages.append('save_artifact')
+        return stages + ['pass2_score', 'summarize']
+
+    if artifact_path:
+        return ['load_artifact', 'load', 'optimize_dtypes', 'transform', 'score', 'summarize']
+    # 전처리 캐시는 적중 여부를 실행할 때 알 수 있으므로 두 경우의 단계를 모두 예정하고 실행 중 뺀다
+    stages = ['load_features'] if feature_cache else []
+    stages += ['load', 'optimize_dtypes', 'encode', 'scale']
+    if feature_cache:
+        stages.append('store_features')
+    stages += ['fit', 'score'] if fit_separately(fit_sample_size, n_jobs, backend) else ['fit_score']
+    if save_artifact_to:
+        stages.append('save_artifact')
+    return stages + ['summarize']
+
+
+def fit_separately(fit_sample_size=None, n_jobs=None, backend=None):
     """
-    업로드된 CSV 파일 경로(file_path)를 받아
-    1) 전처리 → 2) PyCaret 이상 탐지 → 3) HTML 테이블 형태 결과 반환
+    학습과 점수 계산을 fit / score 두 단계로 나눌지 (pipeline_stages 와 detect_anomalies 가 같은 조건을 쓴다)
+    표본 학습이면 표본 크기와 관계없이 나누고, 병렬 점수 계산이면 나눈다
+    학습을 스스로 나눠 하는 백엔드(앙상블)는 전체 데이터면 fit_score 한 번
     """
+    parallel_fit = getattr(BACKENDS.get(backend or DEFAULT_BACKEND), 'parallel_fit', False)
+    return bool(fit_sample_size) or (resolve_n_jobs(n_jobs) > 1 and not parallel_fit)
 
-    # 1. 데이터 불러오기
-    data = pd.read_csv(file_path, index_col=0).dropna()
 
-    # 2. 숫자형 / 문자형 분리
-    numeric_cols     = data.select_dtypes(include=['int64', 'float64']).columns
-    categorical_cols = data.select_dtypes(include=['object']).columns
+def sample_rows(data, size, strategy='random', seed=42, stratify_col=None):
+    """
+    학습용 표본의 행 위치(정렬됨) 반환
+    random     : 균등 비복원 추출
+    stratified : stratify_col 값별 비율대로 할당 (최대 나머지 방식이라 표본 크기는 정확히 size)
+    """
+    rng = np.random.default_rng(seed)
+    if strategy == 'random':
+        return np.sort(rng.choice(len(data), size=size, replace=False))
+
+    if stratify_col not in data.columns:
+        raise ValueError(f"층화 추출 기준 컬럼이 없습니다: {stratify_col}")
+    # 값별 할당량: 비례 배분의 정수부 + 소수부가 큰 값부터 남은 자리 배분
+    group_sizes = data[stratify_col].value_counts(sort=False, dropna=False)
+    exact = group_sizes.to_numpy() * size / len(data)
+    quota = np.floor(exact).astype(np.int64)
+    quota[np.argsort(quota - exact, kind='stable')[:size - quota.sum()]] += 1
+    quota = pd.Series(quota, index=group_sizes.index)
 
-    # 3. Frequency Encoding
-    encoder = ce.CountEncoder()
-    data_encoded = encoder.fit_transform(data[categorical_cols])
+    # 행을 섞은 뒤 값별 순번이 할당량보다 작은 행만 남긴다
+    order  = rng.permutation(len(data))
+    strata = data[stratify_col].iloc[order].reset_index(drop=True)
+    rank   = strata.groupby(strata, sort=False, dropna=False, observed=True).cumcount().to_numpy()
+    return np.sort(order[rank < strata.map(quota).to_numpy()])
 
-    # 4. 합치기 + 스케일링
-    full_data = pd.concat([
+
+def new_backend(backend=None, n_jobs=None, detectors=None):
+    """새로 학습할 백엔드 생성 (detectors 는 앙상블에만 전달)"""
+    if detectors and (backend or DEFAULT_BACKEND) == 'ensemble':
+        return get_backend(backend, n_jobs=n_jobs, detectors=detectors)
+    return get_backend(backend, n_jobs=n_jobs)
+
+
+def _record_steps(stage, detector):
+    # PyCaret setup / create_model / assign_model 처럼 백엔드 내부 단계 시간이 있으면 함께 기록
+    if detector.timings_:
+        stage["steps"] = dict(detector.timings_)
+
+
+def transform_features(data, encoder, scaler, numeric_cols, categorical_cols):
+    """학습된 인코더/스케일러로 새 데이터를 변환 (fit 없음)"""
+    _check_columns(data, list(numeric_cols) + list(categorical_cols))
+    data_encoded = encoder.transform(data)
+    full_data = to_feature_matrix(pd.concat([
         data[numeric_cols].reset_index(drop=True),
-        data_encoded .reset_index(drop=True)
-    ], axis=1)
-    scaler     = StandardScaler()
-    data_scaled = pd.DataFrame(
-        scaler.fit_transform(full_data),
+        data_encoded.reset_index(drop=True)
+    ], axis=1))
+    return pd.DataFrame(
+        scaler.transform(full_data),
         columns=full_data.columns
     )
 
-    # 5. PyCaret 환경 설정 및 모델 생성
-    exp   = setup(data_scaled, session_id=42, verbose=False, index=False)
-    model = create_model('iforest')
-    results = assign_model(model, score=True)
 
+def _check_columns(data, columns):
+    missing = [c for c in columns if c not in data.columns]
+    if missing:
+        raise ValueError(f"저장된 모델과 컬럼이 맞지 않습니다. 누락된 컬럼: {', '.join(missing)}")
+
+
+def score_with_backend(detector, data_scaled):
+    """학습된 백엔드(또는 ShardedScorer)로 Anomaly / Anomaly_Score 컬럼 추가 (assign_model과 같은 형태)"""
+    return _with_scores(data_scaled, detector.score(data_scaled))
+
+
+def _with_scores(data_scaled, outcome):
+    """(라벨, 점수[, 모델별 점수]) → 결과 DataFrame (앙상블이면 Score_<모델> 컬럼도 추가)"""
+    labels, scores, *components = outcome
+    results = data_scaled.copy()
+    for name, values in (components[0] if components else {}).items():
+        results[f'Score_{name}'] = values
+    results['Anomaly']       = labels
+    results['Anomaly_Score'] = scores
+    return results
+
+
+def detect_anomalies_streaming(file_path, chunksize, artifact_path=None,
+                               save_artifact_to=None, fit_sample_size=None,
+                               backend=None, n_jobs=None, sketch_threshold=None,
+                               window_size=WINDOW_SIZE, sample_strategy='random', sample_seed=42,
+                               profiler=None, save_results_to=None, detectors=None):
+    """
+    대용량 CSV용 2-pass 스트리밍 탐지
+    1차 패스: 빈도수 / 수치형 평균·분산 누적 + 학습용 표본 추출
+    2차 패스: 청크별 인코딩 → 스케일링 → 점수 계산
+    """
+    # 층화 추출은 전체 값 분포가 필요해 1차 패스 저장소 표본(reservoir)으로는 할 수 없다 - random 으로 대신한다
+    sample_note = None
+    if sample_strategy != 'random':
+        sample_note = f"스트리밍 모드는 {sample_strategy} 표본 추출을 지원하지 않아 random 으로 추출했습니다."
+        sample_strategy = 'random'
+    fit_sample_size = fit_sample_size or FIT_SAMPLE_SIZE
+    fit_sample = None
+    profiler = profiler or StageProfiler()
+    profiler.expect(pipeline_stages(chunksize, artifact_path, save_artifact_to, fit_sample_size, n_jobs, backend))
+    # Arrow 캐시는 전체 행 수를 메타데이터로 바로 알 수 있다 (ETA 계산용)
+    total_rows = count_rows(file_path) if is_columnar(file_path) else None
+
+    if artifact_path:
+        with profiler.stage('load_artifact'):
+            artifact = load_artifact(artifact_path)
+        encoder, scaler, detector = artifact["encoder"], artifact["scaler"], artifact["backend"]
+        numeric_cols = artifact["numeric_cols"]
+        categorical_cols = artifact["categorical_cols"]
+        columns = numeric_cols + categorical_cols
+    else:
+        columns = None
+        # 1차 패스: 통계 누적
+        numeric_cols = categorical_cols = None
+        encoder = numeric_scaler = None
+        sample, seen = None, 0
+        window = None
+        rng = np.random.default_rng(sample_seed)
+        with profiler.stage('pass1_statistics', expected_rows=total_rows) as stage:
+            for chunk in _read_chunks(file_path, chunksize):
+                if numeric_cols is None:
+                    numeric_cols, categorical_cols = split_columns(chunk)
+                    encoder        = FrequencyEncoder(categorical_cols, sketch_threshold=sketch_threshold)
+                    numeric_scaler = StandardScaler()
+                if chunk.empty:
+                    continue
+                encoder.partial_fit(chunk)
+                if numeric_cols:
+                    numeric_scaler.partial_fit(chunk[numeric_cols])
+                sample, seen = _update_reservoir(sample, chunk, seen, fit_sample_size, rng)
+                window = pd.concat([window, chunk], ignore_index=True).iloc[-window_size:]
+                profiler.advance(len(chunk))
+            stage["rows"] = seen
+
+        if not seen:
+            raise ValueError("분석할 데이터가 없습니다.")
+
+        with profiler.stage('fit', rows=len(sample)) as stage:
+            # 수치형은 누적 통계, 인코딩 컬럼은 빈도표로 평균/분산 계산
+            enc_mean, enc_var = _encoded_moments(encoder, sample)
+            if numeric_cols:
+                mean = np.concatenate([numeric_scaler.mean_, enc_mean])
+                var  = np.concatenate([numeric_scaler.var_, enc_var])
+            else:
+                mean, var = enc_mean, enc_var
+            scaler = _scaler_from_moments(numeric_cols + categorical_cols, mean, var, seen)
+
+            # 표본으로 모델 학습
+            sample_scaled = transform_features(sample, encoder, scaler, numeric_cols, categorical_cols)
+            detector = new_backend(backend, n_jobs, detectors).fit(sample_scaled)
+            _record_steps(stage, detector)
+        fit_sample = {
+            "size": len(sample),
+            "total_rows": seen,
+            "strategy": sample_strategy,
+            "seed": sample_seed,
+            "stratify_col": None,
+        }
+        if sample_note:
+            fit_sample["note"] = sample_note
+
+        if save_artifact_to:
+            with profiler.stage('save_artifact'):
+                save_artifact(save_artifact_to, encoder, scaler, detector, numeric_cols, categorical_cols, window)
+
+    # 2차 패스: 청크별 점수 계산, 이상치만 디스크에 이어쓰기
+    count_anomaly, total = 0, 0
+    writer = ResultWriter(save_results_to) if save_results_to else None
+    top = TopK(TABLE_ROW_LIMIT) if writer is None else None
+    with profiler.stage('pass2_score', expected_rows=total_rows) as stage:
+        with ShardedScorer(detector, n_jobs) as scorer:
+            for chunk in _read_chunks(file_path, chunksize, columns):
+                if chunk.empty:
+                    continue
+                results  = score_with_backend(scorer, transform_features(chunk, encoder, scaler, numeric_cols, categorical_cols))
+                detected = results[results['Anomaly'] == 1]
+                count_anomaly += len(detected)
+                total         += len(results)
+                profiler.advance(len(results))
+                if writer is not None:
+                    writer.write(detected)
+                elif len(detected):
+                    top.update(detected)
+        stage["rows"] = total
+
+    with profiler.stage('summarize', rows=count_anomaly):
+        if writer is not None:
+            # 결과 파일은 Anomaly_Score 순으로 정렬해 저장
+            writer.close()
+            result = build_result(None, count_anomaly, total, detector)
+        else:
+            # 점수 상위 TABLE_ROW_LIMIT 행만 표로
+            result = build_result(top.result(), count_anomaly, total, detector)
+            if top.truncated:
+                result["table_truncated"] = True
+    if fit_sample:
+        result["fit_sample"] = fit_sample
+    result["profile"] = profiler.report()
+    return result
+
+
+def score_chunks(file_path, artifact_path, chunksize):
+    """
+    저장된 아티팩트로 파일 전체를 청크 단위로 점수 계산해 결과(변환된 피처 + Anomaly / Anomaly_Score) 청크를 yield
+    (전체 행 내보내기용 - 메모리 사용량은 청크 크기 수준, 배치 추가로 아티팩트가 갱신됐으면 갱신된 모델 기준)
+    """
+    artifact = load_artifact(artifact_path)
+    numeric_cols, categorical_cols = artifact["numeric_cols"], artifact["categorical_cols"]
+    for chunk in _read_chunks(file_path, chunksize, numeric_cols + categorical_cols):
+        if chunk.empty:
+            continue
+        yield score_with_backend(
+            artifact["backend"],
+            transform_features(chunk, artifact["encoder"], artifact["scaler"], numeric_cols, categorical_cols),
+        )
+
+
+def detect_anomalies_html(file_path):
+    """
+    이전 호출 경로(루트 ai_script.py / apps/ai/ai_script.py)용 - 요약 + 점수를 매긴 전체 행 HTML 표
+    세션 결과와 달리 이상치만 / TABLE_ROW_LIMIT 행으로 자르지 않는다 (통합 전 엔진의 반환값과 같은 형태)
+    """
+    result = detect_anomalies(file_path, full_table=True)
+    return f"<p>{result['summary']}</p>" + result["table_html"]
+
+
+def load_data(file_path, columns=None):
+    """
+    CSV 또는 Arrow 캐시에서 데이터 불러오기 (결측치가 있는 행 제외)
+    columns 를 주면 그 컬럼만 읽는다 (Arrow 캐시는 나머지 컬럼을 아예 읽지 않음)
+    """
+    if is_columnar(file_path):
+        data = read_columnar(file_path, columns)
+    else:
+        data = pd.read_csv(file_path, index_col=0)
+        if columns:
+            data = data[[c for c in columns if c in data.columns]]
+    return data.dropna()
+
+
+def _read_chunks(file_path, chunksize, columns=None):
+    if is_columnar(file_path):
+        chunks = iter_columnar_chunks(file_path, chunksize, columns)
+    else:
+        chunks = pd.read_csv(file_path, index_col=0, chunksize=chunksize)
+    for chunk in chunks:
+        if columns:
+            chunk = chunk[[c for c in columns if c in chunk.columns]]
+        chunk, _ = optimize_dtypes(chunk.dropna())
+        yield chunk
+
+
+def _update_reservoir(sample, chunk, seen, size, rng):
+    """청크 단위 reservoir sampling (Algorithm R) - 전체 행에서 균등한 고정 크기 표본"""
+    chunk = chunk.reset_index(drop=True)
+    if sample is None:
+        sample = chunk.iloc[:0]
+    room = size - len(sample)
+    if room > 0:
+        sample = pd.concat([sample, chunk.iloc[:room]], ignore_index=True)
+        seen += min(room, len(chunk))
+        chunk = chunk.iloc[room:]
+    if len(chunk):
+        # t번째 행(0부터)은 [0, t] 에서 뽑은 위치가 표본 크기보다 작으면 그 자리를 대체
+        slots = rng.integers(0, seen + np.arange(1, len(chunk) + 1))
+        hit = np.flatnonzero(slots < size)
+        if len(hit):
+            replace = pd.Series(hit, index=slots[hit])
+            replace = replace[~replace.index.duplicated(keep='last')]
+            sample = pd.concat([
+                sample.drop(index=replace.index),
+                chunk.iloc[replace.to_numpy()],
+            ], ignore_index=True)
+        seen += len(chunk)
+    return sample, seen
+
+
+def append_batch(file_path, artifact_path, window_size=WINDOW_SIZE, n_jobs=None, results_path=None,
+                 save_artifact_to=None):
+    """
+    기존 세션의 아티팩트에 새 로그 배치를 증분 추가
+    1) 빈도수 / 스케일러 통계를 증분 갱신 (이전 데이터 재스캔 없음)
+    2) 최근 window_size 행(슬라이딩 윈도우)으로 모델 재학습
+    3) 새 행만 점수 계산 → 배치 결과 반환, 아티팩트는 새 리비전으로 저장
+       (save_artifact_to 가 있으면 그 경로에, 없으면 artifact_path 를 덮어쓴다.
+        results_path 가 있으면 새 이상치를 그 결과 파일에 합친다)
+    배치당 비용은 누적된 전체 데이터가 아니라 배치 크기 + 윈도우 크기에 비례
+    """
+    artifact = load_artifact(artifact_path)
+    encoder, scaler, detector = artifact["encoder"], artifact["scaler"], artifact["backend"]
+    numeric_cols = artifact["numeric_cols"]
+    categorical_cols = artifact["categorical_cols"]
+
+    data, _ = optimize_dtypes(load_data(file_path, columns=numeric_cols + categorical_cols))
+    _check_columns(data, numeric_cols + categorical_cols)
+    if data.empty:
+        raise ValueError("분석할 데이터가 없습니다.")
+
+    # 1. 빈도수 / 스케일러 통계 증분 갱신
+    window = pd.concat([artifact.get("window"), data], ignore_index=True).iloc[-window_size:]
+    encoder.partial_fit(data)
+    scaler = _update_scaler(scaler, encoder, data, numeric_cols, categorical_cols, window)
+
+    # 2. 슬라이딩 윈도우로 모델 재학습
+    detector.fit(transform_features(window, encoder, scaler, numeric_cols, categorical_cols))
+
+    # 3. 새 행만 점수 계산
+    with ShardedScorer(detector, n_jobs) as scorer:
+        results = score_with_backend(scorer, transform_features(data, encoder, scaler, numeric_cols, categorical_cols))
+
+    artifact.update(encoder=encoder, scaler=scaler, backend=detector, window=window)
+    update_artifact(save_artifact_to or artifact_path, artifact)
+    return summarize_results(results, detector, results_path, append=True)
+
+
+def _update_scaler(scaler, encoder, data, numeric_cols, categorical_cols, sample):
+    """
+    기존 StandardScaler 에 새 배치 반영
+    수치형은 기존 평균/분산에 배치를 합치고(partial_fit),
+    인코딩 컬럼은 갱신된 빈도표로 다시 계산
+    """
+    n_num = len(numeric_cols)
+    encoder_mean, encoder_var = _encoded_moments(encoder, sample)
+    mean, var = encoder_mean, encoder_var
+    if n_num:
+        numeric_scaler = StandardScaler()
+        numeric_scaler.mean_ = scaler.mean_[:n_num].copy()
+        numeric_scaler.var_ = scaler.var_[:n_num].copy()
+        numeric_scaler.scale_ = scaler.scale_[:n_num].copy()
+        numeric_scaler.n_samples_seen_ = scaler.n_samples_seen_
+        numeric_scaler.n_features_in_ = n_num
+        numeric_scaler.feature_names_in_ = np.asarray(numeric_cols, dtype=object)
+        numeric_scaler.partial_fit(data[numeric_cols])
+        mean = np.concatenate([numeric_scaler.mean_, encoder_mean])
+        var  = np.concatenate([numeric_scaler.var_, encoder_var])
+    return _scaler_from_moments(
+        list(numeric_cols) + list(categorical_cols), mean, var,
+        scaler.n_samples_seen_ + len(data),
+    )
+
+
+def _encoded_moments(encoder, sample):
+    """인코딩 컬럼의 평균/분산 - Sketch 컬럼은 값 목록이 없으므로 균등 표본을 인코딩해서 추정"""
+    mean, var = encoder.encoded_moments()
+    if encoder.sketched_cols:
+        sample_encoded = encoder.transform(sample)
+        for i, col in enumerate(encoder.cols):
+            if col in encoder.sketched_cols:
+                mean[i] = sample_encoded[col].mean()
+                var[i]  = sample_encoded[col].var(ddof=0)
+    return mean, var
+
+
+def _scaler_from_moments(columns, mean, var, n_samples):
+    """누적한 평균/분산으로 학습이 끝난 StandardScaler 구성"""
+    scaler = StandardScaler()
+    scale = np.sqrt(var)
+    scale[scale < 10 * np.finfo(scale.dtype).eps] = 1.0
+    scaler.mean_ = mean
+    scaler.var_ = var
+    scaler.scale_ = scale
+    scaler.n_samples_seen_ = n_samples
+    scaler.n_features_in_ = len(columns)
+    scaler.feature_names_in_ = np.asarray(columns, dtype=object)
+    return scaler
+
+
+def summarize_results(results, detector, save_results_to=None, append=False, full_table=False):
     # 6. 탐지 개수 집계
     count_anomaly = int(results['Anomaly'].sum())
     total         = len(results)
 
+    # 이전 호출 경로: 학습 단계에서 점수를 매긴 전체 행을 그대로 표로
+    if full_table:
+        result = build_result(None, count_anomaly, total, detector)
+        result["table_html"] = results.to_html(index=False, classes="table table-sm")
+        return result
+
     # 7. 이상 탐지된 항목만 추출
     detected = results[results['Anomaly'] == 1]
-    detected.to_csv("pycaret_detected_anomalies.csv", index=False)
 
-    # 8. 결과를 HTML 테이블 + 요약 문자열로 반환
+    # 7-1. 결과 파일에 저장 (세션 결과는 JSON 에 표를 넣지 않고 페이지 단위로 조회)
+    if save_results_to:
+        if append:
+            append_results(save_results_to, detected)
+        else:
+            write_results(detected, save_results_to)
+        return build_result(None, count_anomaly, total, detector)
+
+    # 결과 파일이 없으면 점수 상위 TABLE_ROW_LIMIT 행만 표로 (전체 이상치를 HTML 로 만들지 않는다)
+    result = build_result(top_rows(detected, TABLE_ROW_LIMIT), count_anomaly, total, detector)
+    if count_anomaly > TABLE_ROW_LIMIT:
+        result["table_truncated"] = True
+    return result
+
+
+def build_result(detected, count_anomaly, total, detector):
+    # 8. 요약 문자열 + (결과 파일이 없을 때만) 이상치 HTML 테이블 반환
     result = {
-        "summary": f"📌 이상치 {count_anomaly:,}건 / 전체 {total:,}건",
+        "summary": _summary(count_anomaly, total),
         "anomaly_count": int(count_anomaly),
         "total": int(total),
-        # ★ 이상치(Anomaly==1)만 표로 보여줌
-        "table_html": detected.to_html(index=False, classes="table table-sm") if count_anomaly > 0 else "<p>이상치가 없습니다.</p>",
+        "backend": detector.name,
     }
+    if detector.ensemble_:
+        result["ensemble"] = detector.ensemble_
+    if detected is not None:
+        # ★ 이상치(Anomaly==1)만 표로 보여줌
+        result["table_html"] = detected.to_html(index=False, classes="table table-sm") if count_anomaly > 0 else "<p>이상치가 없습니다.</p>"
     return result
+
+
+def merge_results(previous, batch):
+    """세션에 저장된 결과에 append_batch 결과를 합침 (건수 합산 + 이상치 표 이어붙이기)"""
+    merged = dict(previous)
+    merged["anomaly_count"] = previous.get("anomaly_count", 0) + batch["anomaly_count"]
+    merged["total"]         = previous.get("total", 0) + batch["total"]
+    merged["summary"]       = _summary(merged["anomaly_count"], merged["total"])
+    merged["backend"]       = batch["backend"]
+    if batch.get("ensemble"):
+        merged["ensemble"] = batch["ensemble"]
+    merged["appended_batches"] = previous.get("appended_batches", 0) + 1
+
+    # 결과 파일이 있는 세션은 append_batch 가 파일에 직접 합친다 (table_html 은 이전 형식의 세션만)
+    previous_table = previous.get("table_html", "")
+    batch_table = batch.get("table_html")
+    if batch_table and batch["anomaly_count"] and "</tbody>" in previous_table:
+        # 같은 아티팩트라 컬럼 구성이 같으므로 새 표의 tbody 행만 기존 표 끝에 삽입
+        new_rows = batch_table.split("<tbody>", 1)[1].rsplit("</tbody>", 1)[0]
+        head, tail = previous_table.rsplit("</tbody>", 1)
+        merged["table_html"] = head + new_rows + "</tbody>" + tail
+    elif batch_table and batch["anomaly_count"]:
+        merged["table_html"] = batch_table
+    return merged
+
+
+def _summary(count_anomaly, total):
+    return f"📌 이상치 {count_anomaly:,}건 / 전체 {total:,}건"
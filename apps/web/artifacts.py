@@ -0,0 +1,73 @@
+# apps/web/artifacts.py
+
+import os
+import re
+import joblib
+from datetime import datetime, timezone
+
+# 아티팩트 포맷 버전 - 저장 구조가 바뀌면 올린다
+# 3: 인코더를 encoding.FrequencyEncoder 로 교체 (2 이하는 ce.CountEncoder / StreamingCountEncoder)
+ARTIFACT_VERSION = 3
+
+
+def save_artifact(path, encoder, scaler, backend, numeric_cols, categorical_cols, window=None):
+    """
+    학습된 인코더 / 스케일러 / 탐지 백엔드(모델 포함)를 하나의 파일로 저장
+    (같은 시스템의 로그를 재학습 없이 점수만 계산할 때 사용)
+    window : 증분 추가 시 모델을 다시 학습할 최근 원본 행 (슬라이딩 윈도우)
+    """
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "revision": 1,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "numeric_cols": list(numeric_cols),
+        "categorical_cols": list(categorical_cols),
+        "encoder": encoder,
+        "scaler": scaler,
+        "backend": backend,
+        "window": window,
+    }
+    _dump(artifact, path)
+    return artifact
+
+
+def artifact_revision_path(path, revision):
+    """
+    아티팩트 리비전별 파일 경로 - 1 은 처음 학습한 파일, 이후는 <이름>.r<리비전><확장자>
+    (배치 추가는 기존 파일을 고치지 않고 새 리비전 파일을 쓴다 - 이전 리비전으로 만든 결과가 바뀌지 않도록)
+    """
+    root, ext = os.path.splitext(path)
+    root = re.sub(r'\.r\d+$', '', root)
+    return root + ext if revision == 1 else f"{root}.r{revision}{ext}"
+
+
+def update_artifact(path, artifact):
+    """증분 갱신한 아티팩트를 새 리비전으로 덮어쓰기"""
+    artifact["revision"] = artifact.get("revision", 1) + 1
+    artifact["updated_at"] = datetime.now(timezone.utc).isoformat()
+    _dump(artifact, path)
+    return artifact
+
+
+def _dump(artifact, path):
+    # 임시 파일에 쓴 뒤 교체 - 쓰는 도중에 읽어도 깨진 파일을 보지 않도록
+    tmp_path = f"{path}.tmp"
+    joblib.dump(artifact, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_artifact(path):
+    """저장된 아티팩트를 불러오고 포맷 버전을 확인"""
+    try:
+        artifact = joblib.load(path)
+    except (AttributeError, ModuleNotFoundError) as e:
+        # 이전 버전에만 있던 클래스(StreamingCountEncoder 등)를 담은 파일은 풀 수 없다
+        raise ValueError(
+            f"지원하지 않는 아티팩트 버전입니다: 이전 형식 (필요: {ARTIFACT_VERSION}) - 새로 학습해주세요. ({e})"
+        ) from e
+    version = artifact.get("version") if isinstance(artifact, dict) else None
+    if version != ARTIFACT_VERSION:
+        raise ValueError(
+            f"지원하지 않는 아티팩트 버전입니다: {version} (필요: {ARTIFACT_VERSION})"
+        )
+    return artifact
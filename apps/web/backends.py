@@ -0,0 +1,330 @@
+# apps/web/backends.py
+
+import importlib
+import inspect
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# numpy / sklearn / PyCaret 은 실제로 학습/점수 계산할 때만 import (폼 등에서 이 모듈을 불러도 가볍도록)
+
+# 업로드 분석에 기본으로 사용하는 백엔드
+DEFAULT_BACKEND = 'pycaret'
+# 병렬 점수 계산 시 한 프로세스에 넘기는 행 블록 크기
+SCORE_BLOCK_SIZE = 20_000
+# 앙상블에서 고를 수 있는 탐지기 (pyod 모델 - 점수가 클수록 이상): 이름 → (모듈, 클래스)
+ENSEMBLE_DETECTORS = {
+    'iforest': ('pyod.models.iforest', 'IForest'),
+    'lof': ('pyod.models.lof', 'LOF'),
+    'knn': ('pyod.models.knn', 'KNN'),
+    'hbos': ('pyod.models.hbos', 'HBOS'),
+    'ecod': ('pyod.models.ecod', 'ECOD'),
+    'copod': ('pyod.models.copod', 'COPOD'),
+    'pca': ('pyod.models.pca', 'PCA'),
+}
+DEFAULT_ENSEMBLE = ('iforest', 'lof', 'knn', 'hbos')
+# 새 데이터의 점수를 학습 데이터 안의 순위로 바꿀 때 기준으로 남기는 분위수 개수 (아티팩트 크기 제한)
+RANK_REFERENCE_SIZE = 10_001
+
+
+class DetectionBackend:
+    """
+    이상 탐지 백엔드 인터페이스
+    스케일링이 끝난 feature DataFrame을 받아 학습하고
+    (Anomaly 라벨, Anomaly_Score) 배열을 돌려준다 (점수가 클수록 이상)
+    앙상블은 세 번째 값으로 모델별 점수 dict 를 함께 돌려준다
+    """
+    name = None
+    # 학습 자체를 프로세스 풀에서 나눠 하는 백엔드 - 전체 데이터는 fit_score 한 번으로 학습 + 점수 계산
+    parallel_fit = False
+    # 백엔드 내부 단계별 소요 시간 (초) - 분석 결과의 profile 에 함께 기록
+    timings_ = None
+    # 앙상블의 모델별 요약 - 분석 결과의 ensemble 에 기록
+    ensemble_ = None
+
+    def fit(self, data_scaled):
+        raise NotImplementedError
+
+    def score(self, data_scaled):
+        raise NotImplementedError
+
+    def fit_score(self, data_scaled):
+        """학습 데이터 자체의 라벨/점수 (assign_model 과 같은 역할)"""
+        return self.fit(data_scaled).score(data_scaled)
+
+
+class PyCaretBackend(DetectionBackend):
+    """PyCaret setup() + create_model() - 비교용 기존 방식"""
+    name = 'pycaret'
+
+    def __init__(self, model_id='iforest', session_id=42, n_jobs=None):
+        self.model_id = model_id
+        self.session_id = session_id
+        self.n_jobs = n_jobs
+
+    def fit(self, data_scaled):
+        # PyCaret은 import 자체가 느리므로 실제로 쓸 때만 불러온다
+        started = time.perf_counter()
+        from pycaret.anomaly import setup, create_model
+        self.timings_ = {'import': _elapsed(started)}
+        options = {} if self.n_jobs is None else {'n_jobs': self.n_jobs}
+        started = time.perf_counter()
+        setup(data_scaled, session_id=self.session_id, verbose=False, index=False, **options)
+        self.timings_['setup'] = _elapsed(started)
+        started = time.perf_counter()
+        self.model_ = create_model(self.model_id)
+        self.timings_['create_model'] = _elapsed(started)
+        return self
+
+    def fit_score(self, data_scaled):
+        self.fit(data_scaled)
+        from pycaret.anomaly import assign_model
+        started = time.perf_counter()
+        results = assign_model(self.model_, score=True)
+        self.timings_['assign_model'] = _elapsed(started)
+        return results['Anomaly'].to_numpy(), results['Anomaly_Score'].to_numpy()
+
+    def score(self, data_scaled):
+        X = data_scaled.to_numpy()
+        return self.model_.predict(X), self.model_.decision_function(X)
+
+
+class SklearnIForestBackend(DetectionBackend):
+    """
+    scikit-learn IsolationForest 직접 사용 - PyCaret setup() 오버헤드 없음
+    PyCaret iforest 기본값(contamination=0.05, n_estimators=100)과 같은 설정이라
+    같은 session_id(random_state)면 같은 라벨/점수가 나온다
+    """
+    name = 'sklearn'
+
+    def __init__(self, contamination=0.05, n_estimators=100, session_id=42, n_jobs=None):
+        self.contamination = contamination
+        self.n_estimators = n_estimators
+        self.session_id = session_id
+        self.n_jobs = n_jobs
+
+    def fit(self, data_scaled):
+        from sklearn.ensemble import IsolationForest
+        # n_jobs 만큼 트리 생성을 나눠서 수행 (트리별 seed는 random_state로 고정)
+        self.model_ = IsolationForest(
+            n_estimators=self.n_estimators,
+            contamination=self.contamination,
+            random_state=self.session_id,
+            n_jobs=self.n_jobs,
+        ).fit(data_scaled.to_numpy())
+        return self
+
+    def score(self, data_scaled):
+        import numpy as np
+        # sklearn은 음수일수록 이상 → PyCaret(pyod)과 같은 방향으로 부호 반전
+        raw = self.model_.decision_function(data_scaled.to_numpy())
+        return (raw < 0).astype(np.int64), -raw
+
+
+class EnsembleBackend(DetectionBackend):
+    """
+    여러 pyod 탐지기를 같은 feature 행렬 하나로 학습하는 앙상블 (전처리는 한 번)
+    행렬을 임시 .npy 파일로 한 번 쓰고, 탐지기마다 프로세스를 나눠 읽기 전용 memmap 으로 열어 동시에 학습
+    → 전체 학습 시간은 탐지기 시간의 합이 아니라 가장 느린 탐지기 수준
+    모델별 점수는 학습 데이터 안의 순위(0~1, 클수록 이상)로 바꿔 Score_<모델> 컬럼에 남기고,
+    그 평균이 Anomaly_Score. 학습 데이터에서 상위 contamination 비율에 드는 평균 점수를 넘으면 Anomaly=1
+    n_jobs 를 지정하지 않으면 탐지기마다 프로세스 하나 (코어 수까지)
+    """
+    name = 'ensemble'
+    parallel_fit = True
+
+    def __init__(self, detectors=DEFAULT_ENSEMBLE, contamination=0.05, session_id=42, n_jobs=None):
+        detectors = list(dict.fromkeys(detectors or ()))
+        unknown = [d for d in detectors if d not in ENSEMBLE_DETECTORS]
+        if not detectors or unknown:
+            raise ValueError(
+                f"알 수 없는 앙상블 탐지기입니다: {', '.join(unknown) or '(없음)'} "
+                f"(사용 가능: {', '.join(ENSEMBLE_DETECTORS)})"
+            )
+        self.detectors = detectors
+        self.contamination = contamination
+        self.session_id = session_id
+        self.n_jobs = n_jobs
+
+    def fit(self, data_scaled):
+        self._fit_members(data_scaled)
+        return self
+
+    def fit_score(self, data_scaled):
+        # 학습 데이터 점수는 각 탐지기가 학습하면서 계산한 값 (decision_scores_) 을 그대로 쓴다
+        ranks = self._fit_members(data_scaled)
+        return self._combine(ranks)
+
+    def score(self, data_scaled):
+        import numpy as np
+        X = data_scaled.to_numpy(dtype=np.float32)
+        return self._combine({
+            name: _rank(self.references_[name], model.decision_function(X))
+            for name, model in self.models_.items()
+        })
+
+    def _fit_members(self, data_scaled):
+        """탐지기를 병렬로 학습하고 학습 데이터의 모델별 순위 점수 반환"""
+        import numpy as np
+        matrix = np.ascontiguousarray(data_scaled.to_numpy(dtype=np.float32))
+        workers = (os.cpu_count() or 1) if self.n_jobs is None else resolve_n_jobs(self.n_jobs)
+        workers = min(len(self.detectors), workers)
+        started = time.perf_counter()
+        if workers > 1:
+            with tempfile.TemporaryDirectory(prefix='ensemble-') as tmp_dir:
+                matrix_path = os.path.join(tmp_dir, 'features.npy')
+                np.save(matrix_path, matrix)
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = {
+                        name: pool.submit(_fit_member, name, matrix_path, self.contamination, self.session_id)
+                        for name in self.detectors
+                    }
+                    fitted = {name: future.result() for name, future in futures.items()}
+        else:
+            fitted = {
+                name: _fit_member(name, matrix, self.contamination, self.session_id)
+                for name in self.detectors
+            }
+        self.timings_ = {f'fit_{name}': seconds for name, (_, _, seconds) in fitted.items()}
+        self.timings_['fit_parallel'] = _elapsed(started)
+
+        self.models_ = {name: model for name, (model, _, _) in fitted.items()}
+        self.references_, ranks = {}, {}
+        for name, (_, train_scores, _) in fitted.items():
+            ordered = np.sort(train_scores)
+            ranks[name] = _rank(ordered, train_scores)
+            if len(ordered) > RANK_REFERENCE_SIZE:
+                # 이미 정렬돼 있으므로 분위수는 위치로 바로 고른다
+                ordered = ordered[np.linspace(0, len(ordered) - 1, RANK_REFERENCE_SIZE).round().astype(np.int64)]
+            self.references_[name] = ordered
+        combined = np.mean(list(ranks.values()), axis=0)
+        self.threshold_ = float(np.quantile(combined, 1 - self.contamination))
+        self.ensemble_ = {
+            'detectors': list(self.detectors),
+            'fit_rows': len(matrix),
+            'workers': workers,
+            # 탐지기 각자의 기준(contamination)으로 학습 데이터에서 찾은 이상치 수
+            'anomaly_counts': {name: int(model.labels_.sum()) for name, model in self.models_.items()},
+            # 학습 데이터에서 모델별 순위 점수와 앙상블 점수의 상관계수 (순위 상관)
+            'rank_correlation': {
+                name: round(float(np.corrcoef(rank, combined)[0, 1]), 4) for name, rank in ranks.items()
+            },
+        }
+        return ranks
+
+    def _combine(self, ranks):
+        import numpy as np
+        combined = np.mean(list(ranks.values()), axis=0)
+        return (combined > self.threshold_).astype(np.int64), combined, ranks
+
+
+def _fit_member(name, matrix, contamination, session_id):
+    """탐지기 하나 학습 (matrix 가 경로면 읽기 전용 memmap 으로 연다). 반환값: (모델, 학습 데이터 점수, 소요 시간)"""
+    import numpy as np
+    started = time.perf_counter()
+    if isinstance(matrix, str):
+        matrix = np.load(matrix, mmap_mode='r')
+    module, class_name = ENSEMBLE_DETECTORS[name]
+    detector_class = getattr(importlib.import_module(module), class_name)
+    options = {'contamination': contamination}
+    if 'random_state' in inspect.signature(detector_class).parameters:
+        options['random_state'] = session_id
+    model = detector_class(**options).fit(matrix)
+    return model, np.asarray(model.decision_scores_, dtype=np.float64), _elapsed(started)
+
+
+def _rank(reference, scores):
+    """정렬된 기준 점수 중 scores 이하인 비율 (0~1) - 기준이 학습 데이터 전체면 순위 / 행 수와 같다"""
+    import numpy as np
+    return np.searchsorted(reference, scores, side='right') / len(reference)
+
+
+def _elapsed(started):
+    return round(time.perf_counter() - started, 4)
+
+
+BACKENDS = {
+    PyCaretBackend.name: PyCaretBackend,
+    SklearnIForestBackend.name: SklearnIForestBackend,
+    EnsembleBackend.name: EnsembleBackend,
+}
+
+
+def get_backend(name=None, **kwargs):
+    """이름으로 백엔드 인스턴스 생성"""
+    name = name or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 탐지 백엔드입니다: {name} (사용 가능: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**kwargs)
+
+
+def resolve_n_jobs(n_jobs):
+    """joblib 규칙(-1 = 전체 코어)에 맞춰 실제 워커 수 계산"""
+    if not n_jobs:
+        return 1
+    if n_jobs < 0:
+        return max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+    return n_jobs
+
+
+# 워커 프로세스마다 한 번만 받아두는 학습된 백엔드
+_worker_detector = None
+
+
+def _init_score_worker(detector):
+    global _worker_detector
+    _worker_detector = detector
+
+
+def _score_block(block):
+    return _worker_detector.score(block)
+
+
+class ShardedScorer:
+    """
+    행 블록 단위로 점수를 계산하고 행 순서대로 합친다 (n_jobs > 1 이면 프로세스 풀 사용)
+    행마다 독립적으로 계산하므로 결과는 단일 프로세스 실행과 비트 단위로 같다
+    """
+
+    def __init__(self, detector, n_jobs, block_size=SCORE_BLOCK_SIZE):
+        self.detector = detector
+        self.n_jobs = resolve_n_jobs(n_jobs)
+        self.block_size = block_size
+        self._pool = None
+
+    def __enter__(self):
+        if self.n_jobs > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_init_score_worker,
+                initargs=(self.detector,),
+            )
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def score(self, data_scaled):
+        if len(data_scaled) <= self.block_size:
+            return self.detector.score(data_scaled)
+        blocks = (
+            data_scaled.iloc[start:start + self.block_size]
+            for start in range(0, len(data_scaled), self.block_size)
+        )
+        if self._pool is None:
+            # 단일 프로세스도 블록 단위로 계산해 중간 배열 크기를 제한
+            parts = [self.detector.score(block) for block in blocks]
+        else:
+            # map은 제출 순서대로 결과를 돌려주므로 행 순서가 유지된다
+            parts = list(self._pool.map(_score_block, blocks))
+        import numpy as np
+        labels = np.concatenate([part[0] for part in parts])
+        scores = np.concatenate([part[1] for part in parts])
+        if len(parts[0]) > 2:
+            # 앙상블의 모델별 점수도 같은 순서로 합친다
+            components = {name: np.concatenate([part[2][name] for part in parts]) for name in parts[0][2]}
+            return labels, scores, components
+        return labels, scores
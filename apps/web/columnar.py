@@ -0,0 +1,168 @@
+# apps/web/columnar.py
+
+import hashlib
+import io
+import os
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as ipc
+
+COLUMNAR_EXT = '.arrow'
+HASH_BLOCK_SIZE = 1024 * 1024
+# dtype 결정을 위해 pandas로 미리 읽어보는 행 수
+PEEK_ROWS = 10_000
+# pyarrow CSV 스트리밍 리더의 블록 크기 (byte)
+READ_BLOCK_SIZE = 16 * 1024 * 1024
+
+_PANDAS_TO_ARROW = {
+    'int64': pa.int64(),
+    'float64': pa.float64(),
+    'bool': pa.bool_(),
+    'object': pa.string(),
+}
+
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 (캐시 키)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_columnar(path):
+    return str(path).endswith(COLUMNAR_EXT)
+
+
+def ensure_columnar(csv_path, cache_dir, content_hash=None):
+    """
+    업로드 CSV를 내용 해시 기준으로 한 번만 Arrow IPC 파일로 변환하고 경로를 반환
+    같은 내용이 이미 변환돼 있으면 CSV 파싱 없이 바로 재사용
+    """
+    content_hash = content_hash or file_sha256(csv_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = os.path.join(cache_dir, content_hash + COLUMNAR_EXT)
+    if not os.path.exists(cache_path):
+        convert_csv_to_columnar(csv_path, cache_path)
+    else:
+        # 저장 공간 정리는 mtime 이 오래된 캐시부터 지운다 (LRU)
+        os.utime(cache_path)
+    return cache_path
+
+
+def convert_csv_to_columnar(csv_path, dest_path):
+    """
+    CSV → Arrow IPC 파일 변환 (블록 단위 스트리밍, 메모리 사용량은 블록 크기 수준)
+    컬럼 타입은 pandas.read_csv 결과와 같게 맞춘다
+    (문자열 날짜 등을 Arrow가 임의로 timestamp로 바꾸지 않도록)
+    """
+    tmp_path = dest_path + '.tmp'
+    try:
+        reader = pa_csv.open_csv(
+            csv_path,
+            read_options=pa_csv.ReadOptions(block_size=READ_BLOCK_SIZE),
+            convert_options=_convert_options(_peek_column_types(csv_path)),
+        )
+        with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+    except pa.ArrowInvalid:
+        # 뒤쪽 블록에서 타입이 바뀌는 등 스트리밍 변환이 안 되면 pandas로 한 번에 변환
+        table = pa.Table.from_pandas(pd.read_csv(csv_path), preserve_index=False)
+        with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, dest_path)
+
+
+def parse_csv_block(header, body, schema=None):
+    """
+    헤더 줄 + 완전한 줄들로 된 CSV 조각을 Arrow 테이블로 변환 (청크 업로드 수신 중 조각별 변환)
+    schema : 첫 조각의 스키마 - 이후 조각도 같은 타입으로 맞춘다 (맞지 않으면 ArrowInvalid)
+    """
+    data = header + body
+    if schema is None:
+        column_types = _peek_column_types(io.BytesIO(data))
+    else:
+        column_types = {field.name: field.type for field in schema}
+    table = pa_csv.read_csv(io.BytesIO(data), convert_options=_convert_options(column_types))
+    if schema is not None and table.schema != schema:
+        raise pa.ArrowInvalid(f"앞 조각과 컬럼 구성이 다릅니다: {table.schema.names}")
+    return table
+
+
+def write_columnar(table, path):
+    with pa.OSFile(path, 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_columnar_schema(path):
+    with pa.memory_map(path, 'r') as source:
+        return ipc.open_file(source).schema
+
+
+def merge_columnar(paths, dest_path):
+    """조각별 Arrow 파일을 하나로 합침 (CSV 를 다시 파싱하지 않고 배치만 복사)"""
+    tmp_path = dest_path + '.tmp'
+    schema = read_columnar_schema(paths[0])
+    with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, schema) as writer:
+        for path in paths:
+            with pa.memory_map(path, 'r') as source:
+                reader = ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    writer.write_batch(reader.get_batch(i))
+    os.replace(tmp_path, dest_path)
+
+
+def _convert_options(column_types):
+    return pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+
+
+def _peek_column_types(source):
+    # 첫 컬럼은 인덱스(index_col=0)이므로 제외하고 Arrow가 추론하게 둔다
+    sample = pd.read_csv(source, index_col=0, nrows=PEEK_ROWS)
+    return {
+        col: _PANDAS_TO_ARROW[str(dtype)]
+        for col, dtype in sample.dtypes.items()
+        if str(dtype) in _PANDAS_TO_ARROW
+    }
+
+
+def open_columnar(path):
+    """메모리 매핑으로 Arrow 테이블 열기 (실제 읽기는 접근한 컬럼/페이지만)"""
+    return ipc.open_file(pa.memory_map(path, 'r')).read_all()
+
+
+def count_rows(path):
+    """전체 행 수 (파일 메타데이터만 읽음)"""
+    with pa.memory_map(path, 'r') as source:
+        reader = ipc.open_file(source)
+        return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+def feature_columns(table):
+    # 첫 컬럼은 CSV의 인덱스 컬럼 (pd.read_csv(index_col=0) 과 동일하게 제외)
+    return table.column_names[1:]
+
+
+def read_columnar(path, columns=None):
+    """필요한 컬럼만 DataFrame으로 변환"""
+    table = open_columnar(path)
+    return table.select(_existing_columns(table, columns)).to_pandas()
+
+
+def iter_columnar_chunks(path, chunksize, columns=None):
+    """chunksize 행씩 잘라서 DataFrame으로 변환 (슬라이스는 복사 없이 매핑된 영역을 참조)"""
+    table = open_columnar(path)
+    table = table.select(_existing_columns(table, columns))
+    for offset in range(0, table.num_rows, chunksize):
+        yield table.slice(offset, chunksize).to_pandas()
+
+
+def _existing_columns(table, columns):
+    # 없는 컬럼은 건너뛰고 호출한 쪽에서 누락 컬럼 오류를 내도록 한다
+    if not columns:
+        return feature_columns(table)
+    return [c for c in columns if c in table.column_names]
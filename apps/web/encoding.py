@@ -0,0 +1,143 @@
+# apps/web/encoding.py
+
+import numpy as np
+import pandas as pd
+
+# Count-Min Sketch 기본 크기 (depth x width 개의 int64 카운터, 컬럼당 약 8MB)
+SKETCH_WIDTH = 2 ** 18
+SKETCH_DEPTH = 4
+
+
+class CountMinSketch:
+    """
+    고정 메모리로 값별 빈도를 근사하는 Count-Min Sketch
+    추정값은 실제 빈도 이상이며, 오차는 전체 건수 / width 수준
+    """
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH, seed=42):
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.table = np.zeros((depth, width), dtype=np.int64)
+
+    def _buckets(self, values):
+        # 해시 두 개로 depth 개의 해시를 만든다 (Kirsch-Mitzenmacher)
+        values = np.asarray(values, dtype=object)
+        h1 = pd.util.hash_array(values, hash_key=f"{self.seed:016d}")
+        h2 = pd.util.hash_array(values, hash_key=f"{self.seed + 1:016d}") | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def add(self, values, counts):
+        buckets = self._buckets(values)
+        for row in range(self.depth):
+            np.add.at(self.table[row], buckets[row], counts)
+
+    def query(self, values):
+        buckets = self._buckets(values)
+        return self.table[np.arange(self.depth)[:, None], buckets].min(axis=0)
+
+
+class FrequencyEncoder:
+    """
+    factorize + bincount 기반 Frequency Encoder (ce.CountEncoder 대체)
+    - 모든 범주형 컬럼을 한 번에 factorize 해서 bincount 한 번으로 빈도 계산
+    - partial_fit 으로 여러 청크의 빈도를 합산 (스트리밍 모드)
+    - 정확 모드의 transform 결과는 ce.CountEncoder 와 같음 (처음 보는 값은 0)
+    - sketch_threshold 를 지정하면 고유값 수가 그보다 많은 컬럼은
+      Count-Min Sketch 로 전환해 메모리를 고정 (빈도는 근사값)
+    """
+
+    def __init__(self, cols, sketch_threshold=None,
+                 sketch_width=SKETCH_WIDTH, sketch_depth=SKETCH_DEPTH):
+        self.cols = list(cols)
+        self.sketch_threshold = sketch_threshold
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.counts_ = {}
+        self.sketches_ = {}
+        self.n_rows_ = 0
+
+    def partial_fit(self, X):
+        if not self.cols:
+            self.n_rows_ += len(X)
+            return self
+
+        # 컬럼별 코드에 오프셋을 더해 bincount 한 번으로 전체 컬럼 빈도 계산
+        codes, uniques, offsets = [], [], [0]
+        for col in self.cols:
+            col_codes, col_uniques = pd.factorize(X[col], use_na_sentinel=False)
+            codes.append(col_codes + offsets[-1])
+            uniques.append(np.asarray(col_uniques))
+            offsets.append(offsets[-1] + len(col_uniques))
+        counts = np.bincount(np.concatenate(codes), minlength=offsets[-1])
+
+        for i, col in enumerate(self.cols):
+            col_counts = counts[offsets[i]:offsets[i + 1]]
+            if col in self.sketches_:
+                self.sketches_[col].add(uniques[i], col_counts)
+                continue
+            chunk_counts = pd.Series(col_counts, index=pd.Index(uniques[i]))
+            if col in self.counts_:
+                chunk_counts = self.counts_[col].add(chunk_counts, fill_value=0).astype(np.int64)
+            if self.sketch_threshold is not None and len(chunk_counts) > self.sketch_threshold:
+                self._to_sketch(col, chunk_counts)
+            else:
+                self.counts_[col] = chunk_counts
+        self.n_rows_ += len(X)
+        return self
+
+    def _to_sketch(self, col, exact_counts):
+        sketch = CountMinSketch(self.sketch_width, self.sketch_depth)
+        sketch.add(exact_counts.index.to_numpy(), exact_counts.to_numpy())
+        self.sketches_[col] = sketch
+        self.counts_.pop(col, None)
+
+    def fit(self, X):
+        self.counts_ = {}
+        self.sketches_ = {}
+        self.n_rows_ = 0
+        return self.partial_fit(X)
+
+    def transform(self, X):
+        encoded = {}
+        for col in self.cols:
+            # 고유값에 대해서만 빈도를 찾고 코드로 펼친다
+            codes, uniques = pd.factorize(X[col], use_na_sentinel=False)
+            uniques = np.asarray(uniques)
+            if col in self.sketches_:
+                unique_counts = self.sketches_[col].query(uniques)
+            else:
+                unique_counts = (
+                    self.counts_[col].reindex(uniques).fillna(0).to_numpy(dtype=np.int64)
+                    if col in self.counts_ else np.zeros(len(uniques), dtype=np.int64)
+                )
+            encoded[col] = unique_counts[codes]
+        return pd.DataFrame(encoded, index=X.index, columns=self.cols)
+
+    def fit_transform(self, X):
+        return self.fit(X).transform(X)
+
+    @property
+    def sketched_cols(self):
+        return [col for col in self.cols if col in self.sketches_]
+
+    def encoded_moments(self):
+        """
+        인코딩된 컬럼의 평균/분산을 빈도표만으로 계산 (데이터 재스캔 불필요)
+        값 v 가 c 번 나오면 인코딩 값 c 가 c 번 나오므로
+        mean = Σc² / N,  var = Σc³ / N - mean²
+        Sketch 컬럼은 값 목록이 없으므로 NaN (호출한 쪽에서 표본으로 추정)
+        """
+        n = max(self.n_rows_, 1)
+        means, variances = [], []
+        for col in self.cols:
+            if col in self.sketches_:
+                means.append(np.nan)
+                variances.append(np.nan)
+                continue
+            c = self.counts_[col].to_numpy(dtype='float64') if col in self.counts_ else np.zeros(0)
+            mean = (c ** 2).sum() / n
+            means.append(mean)
+            variances.append(max((c ** 3).sum() / n - mean ** 2, 0.0))
+        return np.array(means), np.array(variances)
@@ -0,0 +1,180 @@
+# apps/web/executor.py
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .jobs import claim_job, claim_next_job, execute_job, release_job, requeue_stale_jobs, touch_jobs
+from .warmup import init_job_worker
+
+logger = logging.getLogger(__name__)
+
+# 실행 중 작업의 heartbeat 간격 (초) - ANOMALY_JOB_STALE_SECONDS 보다 충분히 짧게
+HEARTBEAT_INTERVAL = 10
+# 대기열 확인 간격 (초) - 서버 재시작 / 작업 프로세스 오류로 남은 대기 작업을 가져간다
+SWEEP_INTERVAL = 5
+
+_pool = None
+_slots = None
+_sweeper = None
+# 이 프로세스가 실행 중인 작업 ID (종료 시 대기열로 돌려놓는다)
+_running = set()
+# 실행 중인 백그라운드 task (참조가 없으면 가비지 컬렉션으로 중간에 사라질 수 있다)
+_tasks = set()
+
+
+def get_pool():
+    """
+    ASGI 서버 프로세스 안의 분석 프로세스 풀 (처음 쓸 때 생성, 프로세스 종료 시 정리)
+    탐지는 CPU 를 오래 쓰므로 이벤트 루프 스레드가 아니라 별도 프로세스에서 실행한다
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=max(settings.ANOMALY_WORKER_CONCURRENCY, 1),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_job_worker,
+        )
+        atexit.register(shutdown_pool)
+    return _pool
+
+
+def shutdown_pool():
+    """
+    풀 종료 (atexit) - 시작 전인 작업은 취소하고, 끝나지 못한 작업은 대기열로 돌려놓아
+    다음 서버 시작 / run_analysis_worker 가 다시 실행한다
+    """
+    global _pool
+    if _pool is None:
+        return
+    pool, _pool = _pool, None
+    pool.shutdown(wait=False, cancel_futures=True)
+    for job_id in list(_running):
+        release_job(job_id, '서버가 종료되어 다시 대기열에 넣었습니다.')
+    _running.clear()
+
+
+def with_job_sweeper(application):
+    """
+    ASGI 앱 래퍼 - 첫 연결(서버 시작 시의 lifespan 포함)에서 대기열 확인 task 를 시작한다
+    (asgi.py 에서 ANOMALY_ASYNC_EXECUTOR 일 때 감싼다)
+    """
+    async def app(scope, receive, send):
+        start_sweeper()
+        return await application(scope, receive, send)
+    return app
+
+
+def start_sweeper():
+    """대기열 확인 task 를 현재 이벤트 루프에서 한 번만 시작"""
+    global _sweeper
+    if _sweeper is None or _sweeper.done():
+        _sweeper = _spawn(sweep_jobs())
+
+
+async def sweep_jobs():
+    """
+    주기적으로 heartbeat 가 끊긴 작업을 대기열로 돌려놓고, 빈 자리만큼 대기 작업을 가져와 실행
+    (서버가 재시작되면 등록만 되고 실행되지 않은 작업 / 중단된 작업이 여기서 다시 실행된다)
+    """
+    last_stale_check = None
+    while True:
+        try:
+            if last_stale_check is None or time.monotonic() - last_stale_check > settings.ANOMALY_JOB_STALE_SECONDS:
+                await sync_to_async(requeue_stale_jobs)()
+                last_stale_check = time.monotonic()
+            slots = _get_slots()
+            while not slots.locked():
+                # 자리를 먼저 잡고 가져온다 (가져온 작업이 heartbeat 없이 기다리지 않도록)
+                await slots.acquire()
+                job = await sync_to_async(claim_next_job)(_worker_name())
+                if job is None:
+                    slots.release()
+                    break
+                _spawn(_run_in_slot(job.pk, job.job_id))
+        except Exception:
+            logger.exception("대기열 확인 오류")
+        await asyncio.sleep(SWEEP_INTERVAL)
+
+
+def submit_job(job):
+    """대기열 작업을 이 프로세스의 풀에서 실행하도록 예약 (완료를 기다리지 않는다)"""
+    start_sweeper()
+    return _spawn(run_job(job.pk, job.job_id))
+
+
+async def run_job(pk, job_id):
+    """
+    작업 하나를 풀에서 실행하고 끝날 때까지 heartbeat 갱신
+    동시 실행은 ANOMALY_WORKER_CONCURRENCY 로 제한 - 자리가 날 때까지 작업은 대기열 상태로 남아
+    run_analysis_worker 가 함께 떠 있으면 그쪽이 먼저 가져갈 수도 있다
+    """
+    async with _get_slots():
+        if not await sync_to_async(claim_job)(pk, _worker_name()):
+            return
+        retry = await _execute(job_id)
+    # 다시 대기열로 돌아갔으면 재시도 (재시도 횟수를 넘겨 실패 처리됐으면 claim 되지 않는다)
+    if retry:
+        await run_job(pk, job_id)
+
+
+async def _run_in_slot(pk, job_id):
+    """sweep_jobs 가 자리를 잡고 가져온 작업 실행"""
+    try:
+        retry = await _execute(job_id)
+    finally:
+        _get_slots().release()
+    if retry:
+        await run_job(pk, job_id)
+
+
+async def _execute(job_id):
+    """가져온(실행 중) 작업을 풀에서 실행. 반환값: 프로세스 문제로 대기열에 돌려놓았으면 True"""
+    global _pool
+    _running.add(job_id)
+    try:
+        pool = get_pool()
+        future = asyncio.wrap_future(pool.submit(execute_job, job_id))
+        while not future.done():
+            await asyncio.wait({future}, timeout=HEARTBEAT_INTERVAL)
+            await sync_to_async(touch_jobs)([job_id])
+        error = future.exception()
+    finally:
+        _running.discard(job_id)
+
+    if error is None:
+        return False
+    # execute_job 은 분석 오류를 직접 기록하므로 여기로 오는 건 프로세스 문제 (OOM 등)
+    logger.error("작업 프로세스 오류: %s - %r", job_id, error)
+    await sync_to_async(release_job)(job_id, repr(error))
+    if isinstance(error, BrokenProcessPool) and _pool is pool:
+        pool.shutdown(wait=False)
+        _pool = None
+    return True
+
+
+def _get_slots():
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(max(settings.ANOMALY_WORKER_CONCURRENCY, 1))
+    return _slots
+
+
+def _worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:asgi"
+
+
+def _spawn(coro):
+    task = asyncio.get_running_loop().create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
@@ -0,0 +1,114 @@
+# apps/web/exports.py
+"""
+분석 결과 내보내기 (CSV / gzip CSV / Parquet)
+행은 레코드 배치 단위로 만들어 바로 바이트로 변환해 내보낸다 - 전체 결과를 메모리의 한 문자열로 만들지 않으므로
+100만 행 내보내기도 서버 메모리는 배치 크기 수준 (StreamingHttpResponse 로 전송)
+"""
+
+import io
+import zlib
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+# 형식 → (Content-Type, 파일 확장자)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'csv.gz': ('application/gzip', '.csv.gz'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+}
+# 내보낼 행: 이상치만(결과 파일) / 전체 행(아티팩트로 다시 점수 계산)
+EXPORT_ROWS = ('anomalies', 'all')
+# 전체 행 내보내기에서 한 번에 점수 계산하는 행 수
+SCORE_CHUNK_ROWS = 50_000
+GZIP_LEVEL = 6
+
+
+def export_stream(batches, export_format):
+    """레코드 배치 iterator → 지정한 형식의 바이트 조각 iterator"""
+    if export_format == 'csv':
+        return _csv_stream(batches)
+    if export_format == 'csv.gz':
+        return _gzip_stream(_csv_stream(batches))
+    if export_format == 'parquet':
+        return _parquet_stream(batches)
+    raise ValueError(f"지원하지 않는 내보내기 형식입니다: {export_format} ({', '.join(EXPORT_FORMATS)})")
+
+
+def result_batches(path):
+    """결과 파일(Arrow)의 이상치 행을 저장된 배치 단위로 (배치마다 그 배치만 읽어 압축 해제)"""
+    # 메모리 매핑 대신 파일로 읽는다 - 끝까지 훑는 동안 매핑된 페이지가 프로세스 메모리에 쌓이지 않도록
+    reader = ipc.open_file(pa.OSFile(path, 'r'))
+    for i in range(reader.num_record_batches):
+        yield _drop_metadata(reader.get_batch(i))
+
+
+def scored_batches(file_path, artifact_path, chunksize=SCORE_CHUNK_ROWS):
+    """원본(또는 컬럼형 캐시) 전체 행을 아티팩트로 청크 단위 점수 계산"""
+    from .ai_script import score_chunks
+    for chunk in score_chunks(file_path, artifact_path, chunksize):
+        yield pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+
+
+def _csv_stream(batches):
+    header = True
+    for batch in batches:
+        buffer = io.BytesIO()
+        pa_csv.write_csv(batch, buffer, write_options=pa_csv.WriteOptions(include_header=header))
+        header = False
+        yield buffer.getvalue()
+
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _parquet_stream(batches):
+    """배치마다 row group 하나씩 쓰고 그때까지 쓰인 바이트를 내보낸다"""
+    sink = _DrainableSink()
+    writer = None
+    for batch in batches:
+        if writer is None:
+            writer = pq.ParquetWriter(sink, batch.schema, compression='zstd')
+        writer.write_batch(batch)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+class _DrainableSink(io.RawIOBase):
+    """ParquetWriter 출력을 모아 두었다가 drain() 으로 꺼내는 쓰기 전용 파일 객체 (위치만 기억)"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _drop_metadata(batch):
+    # 결과 파일의 행 수 / 배치 크기 메타데이터는 내보낸 파일에 남기지 않는다
+    return pa.RecordBatch.from_arrays(batch.columns, schema=batch.schema.remove_metadata())
@@ -0,0 +1,130 @@
+# apps/web/features.py
+"""
+전처리 결과 캐시 - 스케일링이 끝난 float32 feature 행렬 + 컬럼 / 인코더 / 스케일러
+같은 파일을 다른 모델 / 설정으로 다시 분석할 때 CSV 읽기 → 인코딩 → 스케일링 없이 바로 학습한다
+키는 입력 내용 해시 + 전처리 설정(인코더 / 스케일러 설정, 캐시 형식 버전)
+행렬은 .npy 로 저장해 읽기 전용 memmap 으로 연다 (같은 파일을 여러 분석이 페이지 캐시로 공유)
+캐시 폴더가 크기 상한을 넘으면 오래 안 쓴(mtime) 항목부터 삭제
+"""
+
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .encoding import SKETCH_DEPTH, SKETCH_WIDTH
+
+# 캐시 형식 / 전처리 방식이 바뀌면 올린다 (이전 항목은 키가 달라져 자연히 정리된다)
+FEATURE_CACHE_VERSION = 1
+MATRIX_EXT = '.npy'
+META_EXT = '.meta'
+
+
+def feature_cache_key(content_hash, sketch_threshold=None):
+    """입력 내용 해시 + 전처리 설정 → 캐시 키 (<내용 해시>-<설정 해시>)"""
+    config = {
+        'version': FEATURE_CACHE_VERSION,
+        'encoder': {
+            'type': 'frequency',
+            'sketch_threshold': sketch_threshold,
+            'sketch_width': SKETCH_WIDTH,
+            'sketch_depth': SKETCH_DEPTH,
+        },
+        'scaler': 'standard',
+        'dtype': 'float32',
+    }
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+    return f"{content_hash}-{digest}"
+
+
+def load_features(cache_dir, key):
+    """
+    캐시 항목 (data_scaled, meta) 또는 None
+    data_scaled 는 읽기 전용 memmap 위의 DataFrame, meta 는 store_features 에 넘긴 dict
+    """
+    matrix_path, meta_path = _paths(cache_dir, key)
+    try:
+        meta = joblib.load(meta_path)
+        matrix = np.load(matrix_path, mmap_mode='r')
+    except (FileNotFoundError, EOFError, ValueError):
+        return None
+    if meta.get('version') != FEATURE_CACHE_VERSION or matrix.shape != (meta['rows'], len(meta['columns'])):
+        return None
+    # LRU 정리는 mtime 기준 - 읽을 때마다 갱신
+    for path in (matrix_path, meta_path):
+        _touch(path)
+    return pd.DataFrame(matrix, columns=meta['columns'], copy=False), meta
+
+
+def store_features(cache_dir, key, data_scaled, meta, max_bytes=None):
+    """
+    행렬(.npy)과 메타데이터를 저장하고 캐시 크기를 max_bytes 이하로 정리
+    메타데이터를 나중에 쓰므로 메타데이터가 보이면 행렬은 이미 완성돼 있다
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    matrix_path, meta_path = _paths(cache_dir, key)
+    matrix = np.ascontiguousarray(data_scaled.to_numpy(dtype=np.float32))
+    _write(matrix_path, lambda f: np.save(f, matrix))
+    meta = {**meta, 'version': FEATURE_CACHE_VERSION, 'rows': len(matrix), 'columns': list(data_scaled.columns)}
+    _write(meta_path, lambda f: joblib.dump(meta, f))
+    if max_bytes:
+        evict_features(cache_dir, max_bytes, keep=key)
+
+
+def evict_features(cache_dir, max_bytes, keep=None):
+    """캐시 폴더가 max_bytes 를 넘으면 오래 안 쓴 항목부터 삭제 (keep 은 남긴다). 반환값: 삭제한 키 목록"""
+    entries = {}
+    with os.scandir(cache_dir) as scan:
+        for entry in scan:
+            if not entry.is_file() or entry.name.endswith('.tmp'):
+                continue
+            key = os.path.splitext(entry.name)[0]
+            stat = entry.stat()
+            size, mtime = entries.get(key, (0, 0))
+            entries[key] = (size + stat.st_size, max(mtime, stat.st_mtime))
+
+    total = sum(size for size, _ in entries.values())
+    removed = []
+    for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+        if total <= max_bytes:
+            break
+        if key == keep:
+            continue
+        for path in _paths(cache_dir, key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        total -= size
+        removed.append(key)
+    return removed
+
+
+def feature_cache_paths(cache_dir, content_hash):
+    """내용 해시 하나의 캐시 파일 전체 (전처리 설정별 항목 포함)"""
+    if not os.path.isdir(cache_dir):
+        return []
+    prefix = content_hash + '-'
+    return [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.startswith(prefix)]
+
+
+def _paths(cache_dir, key):
+    return os.path.join(cache_dir, key + MATRIX_EXT), os.path.join(cache_dir, key + META_EXT)
+
+
+def _write(path, dump):
+    # 임시 파일에 쓴 뒤 교체 - 다른 워커가 쓰는 도중의 파일을 읽지 않도록 (같은 키를 동시에 써도 안전)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        dump(f)
+    os.replace(tmp_path, path)
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
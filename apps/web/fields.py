@@ -0,0 +1,38 @@
+# apps/web/fields.py
+
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+# zlib 압축 수준 (이상치 HTML 표 / 요약 JSON 은 이 수준에서도 보통 1/5 ~ 1/10 크기)
+COMPRESSION_LEVEL = 6
+
+
+class CompressedJSONField(models.BinaryField):
+    """
+    JSON 값을 zlib 으로 압축해 저장하는 필드 - 모델에서는 JSONField 처럼 dict / list 로 쓴다
+    (DB 안에서 JSON 조회(lookup)는 할 수 없다)
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return json.loads(zlib.decompress(bytes(value)))
+
+    def to_python(self, value):
+        if isinstance(value, (bytes, memoryview)):
+            return json.loads(zlib.decompress(bytes(value)))
+        if isinstance(value, str):
+            return json.loads(value)
+        return value
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        data = json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False).encode()
+        return zlib.compress(data, COMPRESSION_LEVEL)
+
+    def value_to_string(self, obj):
+        return json.dumps(self.value_from_object(obj), cls=DjangoJSONEncoder, ensure_ascii=False)
@@ -1,9 +1,61 @@
+import os
+
 from django import forms
+from django.conf import settings
+from .backends import BACKENDS, ENSEMBLE_DETECTORS
+from .models import AnalysisSession
+
+class AnalysisOptionsForm(forms.Form):
+    # 선택 시 저장된 아티팩트로 점수만 계산 (재학습 없음)
+    artifact_session = forms.ModelChoiceField(
+        queryset=AnalysisSession.objects.exclude(artifact_path=''),
+        required=False,
+        to_field_name='session_id',
+        empty_label="새로 학습",
+        label="저장된 모델 사용",
+    )
+    # 탐지 백엔드 (저장된 모델 사용 시에는 그 모델의 백엔드를 따름)
+    backend = forms.ChoiceField(
+        choices=[(name, name) for name in BACKENDS],
+        required=False,
+        label="탐지 백엔드",
+    )
+    # ensemble 백엔드에서 함께 학습할 탐지기 (선택하지 않으면 ANOMALY_ENSEMBLE_DETECTORS)
+    detectors = forms.MultipleChoiceField(
+        choices=[(name, name) for name in ENSEMBLE_DETECTORS],
+        required=False,
+        label="앙상블 탐지기",
+    )
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['backend'].initial = settings.ANOMALY_BACKEND
+    def clean_artifact_session(self):
+        session = self.cleaned_data.get('artifact_session')
+        if session is not None and not session.has_artifact():
+            raise forms.ValidationError("선택한 분석의 모델 파일이 없습니다.")
+        return session
+
 
-class UploadFileForm(forms.Form):
+class UploadFileForm(AnalysisOptionsForm):
     datafile = forms.FileField(label="로그 CSV 파일 업로드")
+    field_order = ['datafile', 'artifact_session', 'backend', 'detectors']
     def clean_datafile(self):
         file = self.cleaned_data.get('datafile')
         if not file.name.endswith('.csv'):
             raise forms.ValidationError("CSV 파일만 업로드할 수 있습니다.")
-        return file
\ No newline at end of file
+        return file
+
+
+class ChunkedUploadForm(AnalysisOptionsForm):
+    """청크 업로드 시작 요청 (파일 내용은 이후 청크로 나눠 받는다)"""
+    filename = forms.CharField(max_length=255)
+    size = forms.IntegerField(min_value=1)
+    # 전체 파일 SHA-256 (hex) - 조립 후 다시 계산해 비교
+    sha256 = forms.RegexField(regex=r'^[0-9a-fA-F]{64}$')
+    def clean_filename(self):
+        filename = os.path.basename(self.cleaned_data.get('filename', ''))
+        if not filename.endswith('.csv'):
+            raise forms.ValidationError("CSV 파일만 업로드할 수 있습니다.")
+        return filename
+    def clean_sha256(self):
+        return self.cleaned_data['sha256'].lower()
@@ -0,0 +1,259 @@
+# apps/web/jobs.py
+
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AnalysisJob, AnalysisSession
+from .profiling import StageProfiler
+from .progress import ProgressTracker
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 가져가기를 시도하는 대기 작업 수 (다른 워커와 경합할 때 다음 작업으로 넘어가도록)
+CLAIM_BATCH = 10
+
+
+def enqueue_analysis(session_id, file_name, save_path, content_hash, analysis_params, profile=None):
+    """업로드 분석 작업을 대기열에 등록 (실행은 run_analysis_worker)"""
+    return AnalysisJob.objects.create(
+        job_id=str(uuid.uuid4()),
+        session_id=session_id,
+        original_filename=file_name,
+        file_path=save_path,
+        content_hash=content_hash,
+        analysis_params=analysis_params,
+        profile=profile or [],
+    )
+
+
+def claim_next_job(worker):
+    """
+    가장 오래된 대기 작업 하나를 이 워커가 실행 중으로 가져간다 (없으면 None)
+    status 조건부 update 라 여러 워커가 동시에 가져가도 한 작업은 한 워커만 실행
+    """
+    for pk in AnalysisJob.objects.filter(status=AnalysisJob.STATUS_QUEUED).values_list('pk', flat=True)[:CLAIM_BATCH]:
+        if claim_job(pk, worker):
+            return AnalysisJob.objects.get(pk=pk)
+    return None
+
+
+def claim_job(pk, worker):
+    """대기 중인 작업 하나를 실행 중으로 (이미 다른 워커가 가져갔으면 False)"""
+    now = timezone.now()
+    return bool(AnalysisJob.objects.filter(pk=pk, status=AnalysisJob.STATUS_QUEUED).update(
+        status=AnalysisJob.STATUS_RUNNING,
+        worker=worker,
+        attempts=F('attempts') + 1,
+        started_at=now,
+        heartbeat_at=now,
+    ))
+
+
+def touch_jobs(job_ids):
+    """실행 중인 작업의 heartbeat 갱신"""
+    if job_ids:
+        AnalysisJob.objects.filter(job_id__in=list(job_ids), status=AnalysisJob.STATUS_RUNNING).update(
+            heartbeat_at=timezone.now()
+        )
+
+
+def release_job(job_id, error):
+    """워커 쪽 문제로 끝나지 못한 작업을 다시 대기열로 (재시도 횟수를 넘으면 실패 처리)"""
+    job = AnalysisJob.objects.filter(job_id=job_id, status=AnalysisJob.STATUS_RUNNING).first()
+    if job is None:
+        return
+    if job.attempts < settings.ANOMALY_JOB_MAX_ATTEMPTS:
+        job.status = AnalysisJob.STATUS_QUEUED
+        job.worker = ''
+    else:
+        job.status = AnalysisJob.STATUS_FAILED
+        job.finished_at = timezone.now()
+    job.error = str(error)
+    job.save(update_fields=['status', 'worker', 'error', 'finished_at'])
+
+
+def requeue_stale_jobs():
+    """
+    heartbeat 가 ANOMALY_JOB_STALE_SECONDS 이상 끊긴 실행 중 작업을 다시 대기열로
+    (워커 프로세스가 재시작/강제 종료돼도 작업이 사라지지 않도록). 재시도 횟수를 넘으면 실패 처리
+    반환값: (다시 대기열에 넣은 수, 실패 처리한 수)
+    """
+    now = timezone.now()
+    stale = AnalysisJob.objects.filter(
+        status=AnalysisJob.STATUS_RUNNING,
+        heartbeat_at__lt=now - timedelta(seconds=settings.ANOMALY_JOB_STALE_SECONDS),
+    )
+    failed = stale.filter(attempts__gte=settings.ANOMALY_JOB_MAX_ATTEMPTS).update(
+        status=AnalysisJob.STATUS_FAILED,
+        error='워커가 응답하지 않아 작업이 중단되었습니다.',
+        finished_at=now,
+    )
+    requeued = stale.update(status=AnalysisJob.STATUS_QUEUED, worker='')
+    return requeued, failed
+
+
+def execute_job(job_id):
+    """작업 하나를 실행하고 결과 상태를 저장 (워커 풀의 자식 프로세스에서 호출)"""
+    job = AnalysisJob.objects.get(job_id=job_id)
+    try:
+        session = run_analysis_job(job)
+    except Exception as e:
+        logger.exception("분석 작업 실패: %s", job_id)
+        job.status = AnalysisJob.STATUS_FAILED
+        job.error = str(e)
+    else:
+        job.status = AnalysisJob.STATUS_DONE
+        job.result_session = session
+        job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result_session', 'error', 'finished_at'])
+    return job.status
+
+
+def run_analysis_job(job):
+    """
+    대기열 작업의 분석 실행 (기존 upload_view 에서 요청 안에서 하던 일)
+    컬럼형 캐시 변환 → 이상 탐지 → AnalysisSession 저장
+    """
+    params = job.analysis_params
+    progress = ProgressTracker(lambda snapshot: AnalysisJob.objects.filter(pk=job.pk).update(progress=snapshot))
+    profiler = StageProfiler(job.profile, progress=progress)
+    if job.started_at:
+        profiler.record('queue_wait', (job.started_at - job.created_at).total_seconds())
+
+    # 이전 시도가 세션 저장 직후 중단된 경우 (재시도)
+    existing = AnalysisSession.objects.filter(session_id=job.session_id).first()
+    if existing is not None:
+        return existing
+
+    # 같은 내용이 대기 중에 먼저 분석됐으면 결과 재사용
+    reused = find_reusable_session(job.content_hash, params)
+    if reused is not None:
+        return create_reused_session(job.session_id, job.original_filename, job.content_hash, params, reused)
+
+    source = source_artifact = None
+    revision = 1
+    if params.get('artifact_session'):
+        source = AnalysisSession.objects.get(session_id=params['artifact_session'])
+        # 업로드할 때 고정한 리비전으로 점수 계산 (그 사이 배치가 추가돼도 같은 모델)
+        revision = params.get('artifact_revision', source.artifact_revision)
+        source_artifact = source.artifact_path_for(revision)
+        if not os.path.exists(source_artifact):
+            raise ValueError(f"선택한 분석의 모델 파일(리비전 {revision})이 없습니다.")
+
+    from .ai_script import detect_anomalies, pipeline_stages
+    fit_sample = params.get('fit_sample') or {}
+    artifact_path = '' if source is not None else get_artifact_path(job.session_id)
+    results_path = get_results_path(job.session_id)
+    profiler.expect(
+        ['columnar_cache']
+        + pipeline_stages(
+            params.get('chunksize'),
+            artifact_path=source_artifact,
+            save_artifact_to=artifact_path or None,
+            fit_sample_size=fit_sample.get('size'),
+            n_jobs=settings.ANOMALY_N_JOBS,
+            backend=params.get('backend'),
+            feature_cache=bool(settings.ANOMALY_FEATURE_CACHE_SIZE),
+        )
+        + ['db_write']
+    )
+
+    # 컬럼형(Arrow) 캐시로 변환 - 같은 내용은 한 번만 파싱
+    from .columnar import ensure_columnar
+    with profiler.stage('columnar_cache'):
+        input_path = ensure_columnar(job.file_path, settings.ANOMALY_COLUMNAR_CACHE_DIR, job.content_hash)
+
+    # 이상 탐지 (저장된 모델 선택 시 점수만 계산, 아니면 학습 후 아티팩트 저장)
+    if source is not None:
+        analysis_result = detect_anomalies(
+            input_path, artifact_path=source_artifact,
+            chunksize=params.get('chunksize'), n_jobs=settings.ANOMALY_N_JOBS, profiler=profiler,
+            save_results_to=results_path,
+        )
+    else:
+        analysis_result = detect_anomalies(
+            input_path, save_artifact_to=artifact_path,
+            chunksize=params.get('chunksize'), backend=params.get('backend'),
+            detectors=params.get('detectors'), n_jobs=settings.ANOMALY_N_JOBS,
+            sketch_threshold=params.get('sketch_threshold'),
+            window_size=settings.ANOMALY_WINDOW_SIZE,
+            fit_sample_size=fit_sample.get('size'),
+            sample_strategy=fit_sample.get('strategy', 'random'),
+            stratify_col=fit_sample.get('stratify_col'),
+            sample_seed=fit_sample.get('seed', 42),
+            profiler=profiler,
+            save_results_to=results_path,
+            feature_cache_dir=settings.ANOMALY_FEATURE_CACHE_DIR if settings.ANOMALY_FEATURE_CACHE_SIZE else None,
+            feature_cache_size=settings.ANOMALY_FEATURE_CACHE_SIZE,
+            content_hash=job.content_hash,
+        )
+
+    # DB 저장 (저장 시간까지 profile 에 남기도록 저장 후 profile 만 갱신)
+    with profiler.stage('db_write'):
+        session = AnalysisSession.objects.create(
+            session_id=job.session_id,
+            original_filename=job.original_filename,
+            file_path=job.file_path,
+            file_type=os.path.splitext(job.original_filename)[-1][1:].upper(),
+            content_hash=job.content_hash,
+            analysis_result=analysis_result,
+            analysis_params=params,
+            artifact_path=artifact_path,
+            artifact_source=source,
+            artifact_revision=revision,
+            results_path=results_path,
+        )
+    session.analysis_result["profile"] = profiler.report()
+    session.save(update_fields=['analysis_result'])
+    return session
+
+
+def find_reusable_session(content_hash, analysis_params):
+    """같은 내용 해시 + 같은 분석 설정으로 직접 분석한 가장 최근 세션"""
+    candidates = AnalysisSession.objects.filter(
+        content_hash=content_hash,
+        source_session__isnull=True,
+    ).order_by('-created_at')
+    for session in candidates:
+        if session.analysis_params == analysis_params:
+            return session
+    return None
+
+
+def create_reused_session(session_id, file_name, content_hash, analysis_params, reused):
+    """기존 세션의 결과를 그대로 쓰는 새 세션 생성"""
+    logger.info("기존 분석 결과 재사용: %s", reused.session_id)
+    return AnalysisSession.objects.create(
+        session_id=session_id,
+        original_filename=file_name,
+        file_path=reused.file_path,
+        file_type=os.path.splitext(file_name)[-1][1:].upper(),
+        content_hash=content_hash,
+        analysis_result=reused.analysis_result,
+        analysis_params=analysis_params,
+        results_path=reused.results_path,
+        source_session=reused,
+        artifact_revision=reused.artifact_revision,
+    )
+
+
+def get_artifact_path(session_id):
+    """세션별 학습 파이프라인 아티팩트 저장 경로"""
+    artifact_dir = os.path.join(settings.MEDIA_ROOT, "artifacts")
+    os.makedirs(artifact_dir, exist_ok=True)
+    return os.path.join(artifact_dir, f"{session_id}.joblib")
+
+
+def get_results_path(session_id):
+    """세션별 이상치 결과 파일(Arrow) 경로"""
+    from .results import RESULTS_EXT
+    results_dir = os.path.join(settings.MEDIA_ROOT, "results")
+    os.makedirs(results_dir, exist_ok=True)
+    return os.path.join(results_dir, f"{session_id}{RESULTS_EXT}")
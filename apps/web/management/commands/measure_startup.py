@@ -0,0 +1,62 @@
+# apps/web/management/commands/measure_startup.py
+
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# 새 인터프리터에서 Django 시작 + URLConf 로드 (워커가 요청을 받기 전까지 하는 일)
+BOOT_SCRIPT = """
+import time
+started = time.perf_counter()
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - started
+import sys
+heavy = [m for m in ('pandas', 'sklearn', 'pyarrow', 'pycaret', 'flask') if m in sys.modules]
+{warmup}
+print(elapsed, ','.join(heavy))
+"""
+WARMUP_SCRIPT = """
+from apps.web.warmup import warm_up
+elapsed += warm_up({backend!r})
+"""
+
+
+class Command(BaseCommand):
+    help = "Django 시작 시간과 탐지 엔진 로드(warm-up) 시간을 새 프로세스에서 측정"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--backend', default=settings.ANOMALY_BACKEND)
+
+    def handle(self, *args, **options):
+        boot = self._measure(options['repeat'], '')
+        warm = self._measure(options['repeat'], WARMUP_SCRIPT.format(backend=options['backend']))
+
+        self.stdout.write(f"Django 시작 (엔진 지연 로드)   : {boot['seconds']:.3f}s")
+        self.stdout.write(f"  시작 시 로드된 무거운 모듈  : {boot['heavy'] or '없음'}")
+        self.stdout.write(f"Django 시작 + warm-up ({options['backend']}) : {warm['seconds']:.3f}s")
+        self.stdout.write(self.style.SUCCESS(
+            f"탐지를 쓰지 않는 프로세스(manage.py 명령, 워커 부팅)마다 절약되는 시간: "
+            f"{warm['seconds'] - boot['seconds']:.3f}s"
+        ))
+
+    def _measure(self, repeat, warmup):
+        script = BOOT_SCRIPT.format(warmup=warmup)
+        runs = []
+        for _ in range(repeat):
+            output = subprocess.run(
+                [sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                env={**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE},
+            ).stdout.split()
+            runs.append(output)
+        return {
+            'seconds': statistics.median(float(run[0]) for run in runs),
+            'heavy': runs[-1][1] if len(runs[-1]) > 1 else '',
+        }
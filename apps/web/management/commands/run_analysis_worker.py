@@ -0,0 +1,90 @@
+# apps/web/management/commands/run_analysis_worker.py
+
+import multiprocessing
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.web.jobs import claim_next_job, execute_job, release_job, requeue_stale_jobs, touch_jobs
+from apps.web.warmup import init_job_worker
+
+
+class Command(BaseCommand):
+    help = "대기열의 업로드 분석 작업을 동시 실행 수가 제한된 프로세스 풀로 실행"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.ANOMALY_WORKER_CONCURRENCY,
+                            help="동시에 실행할 분석 프로세스 수")
+        parser.add_argument('--poll-interval', type=float, default=settings.ANOMALY_WORKER_POLL_INTERVAL)
+        parser.add_argument('--once', action='store_true', help="대기 작업을 모두 처리하면 종료")
+
+    def handle(self, *args, **options):
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = max(options['concurrency'], 1)
+        self.poll_interval = options['poll_interval']
+        self.stdout.write(f"분석 워커 시작: {self.worker} (동시 실행 {self.concurrency})")
+
+        self._requeue_stale()
+        self.running = {}
+        try:
+            # 자식 프로세스가 비정상 종료(OOM 등)해 풀이 깨지면 작업을 돌려놓고 풀을 새로 만든다
+            while not self._run_pool(options['once']):
+                pass
+        except KeyboardInterrupt:
+            for job_id in self.running.values():
+                release_job(job_id, '워커가 종료되어 다시 대기열에 넣었습니다.')
+            self.stdout.write("분석 워커 종료")
+
+    def _run_pool(self, once):
+        """풀이 정상 종료되면 True, 깨지면 False"""
+        # 부모의 DB 연결은 자식에게 넘기지 않는다
+        connections.close_all()
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.concurrency, mp_context=context,
+                                 initializer=init_job_worker) as pool:
+            last_stale_check = time.monotonic()
+            while True:
+                if not self._collect_finished():
+                    return False
+
+                touch_jobs(self.running.values())
+                if time.monotonic() - last_stale_check > settings.ANOMALY_JOB_STALE_SECONDS:
+                    self._requeue_stale()
+                    last_stale_check = time.monotonic()
+
+                # 빈 자리만큼만 작업을 가져간다 (나머지는 다른 워커가 가져갈 수 있도록 대기열에 둔다)
+                while len(self.running) < self.concurrency:
+                    job = claim_next_job(self.worker)
+                    if job is None:
+                        break
+                    self.stdout.write(f"작업 시작: {job.job_id} ({job.original_filename})")
+                    self.running[pool.submit(execute_job, job.job_id)] = job.job_id
+
+                if once and not self.running:
+                    return True
+                time.sleep(self.poll_interval)
+
+    def _collect_finished(self):
+        broken = False
+        for future in [f for f in self.running if f.done()]:
+            job_id = self.running.pop(future)
+            error = future.exception()
+            if error is None:
+                self.stdout.write(f"작업 종료: {job_id} ({future.result()})")
+                continue
+            # execute_job 은 분석 오류를 직접 기록하므로 여기로 오는 건 프로세스 문제
+            self.stderr.write(f"작업 프로세스 오류: {job_id} - {error!r}")
+            release_job(job_id, repr(error))
+            broken = broken or isinstance(error, BrokenProcessPool)
+        return not broken
+
+    def _requeue_stale(self):
+        requeued, failed = requeue_stale_jobs()
+        if requeued or failed:
+            self.stdout.write(f"중단된 작업 정리: 재대기 {requeued}건, 실패 {failed}건")
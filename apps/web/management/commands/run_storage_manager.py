@@ -0,0 +1,53 @@
+# apps/web/management/commands/run_storage_manager.py
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.web.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = "원본 업로드 / 컬럼형 캐시를 보관 기간과 디스크 쿼터에 맞춰 주기적으로 정리 (결과 / 아티팩트는 유지)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=settings.ANOMALY_STORAGE_INTERVAL,
+                            help="정리 주기 (초)")
+        parser.add_argument('--once', action='store_true', help="한 번 정리하고 종료")
+        parser.add_argument('--dry-run', action='store_true', help="삭제할 파일만 출력")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"저장 공간 관리 시작 (쿼터 {_format_size(settings.ANOMALY_STORAGE_QUOTA)}, "
+            f"보관 기간 {settings.ANOMALY_UPLOAD_RETENTION_DAYS or '-'}일)"
+        )
+        try:
+            while True:
+                self._run(options['dry_run'])
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("저장 공간 관리 종료")
+
+    def _run(self, dry_run):
+        report = collect_garbage(dry_run=dry_run)
+        for path, size, reason in report['removed']:
+            self.stdout.write(f"{'삭제 예정' if dry_run else '삭제'}: {path} ({_format_size(size)}, {reason})")
+        self.stdout.write(
+            f"정리 {len(report['removed'])}건, {_format_size(report['freed'])} 확보 / "
+            f"사용량 {_format_size(report['usage'])}"
+        )
+        if report['over_quota']:
+            self.stderr.write("정리할 수 있는 원본을 모두 지워도 쿼터를 넘습니다. 오래된 분석을 삭제하거나 쿼터를 늘려주세요.")
+
+
+def _format_size(size):
+    if not size:
+        return '-' if size is None else '0B'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
@@ -0,0 +1,24 @@
+# Generated by Django 5.1 on 2026-10-18 08:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0004_remove_analysissession_analysis_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='artifact_path',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+        migrations.AddField(
+            model_name='analysissession',
+            name='artifact_source',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='scored_sessions', to='web.analysissession'),
+        ),
+    ]
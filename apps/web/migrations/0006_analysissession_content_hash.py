@@ -0,0 +1,29 @@
+# Generated by Django 5.1 on 2026-10-18 08:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0005_analysissession_artifact'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='analysis_params',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='analysissession',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='analysissession',
+            name='source_session',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reused_sessions', to='web.analysissession'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1 on 2026-10-18 08:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0006_analysissession_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.CharField(max_length=100, unique=True)),
+                ('session_id', models.CharField(max_length=100)),
+                ('original_filename', models.CharField(max_length=255)),
+                ('file_path', models.CharField(max_length=500)),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('analysis_params', models.JSONField(blank=True, default=dict)),
+                ('profile', models.JSONField(blank=True, default=list)),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '실행 중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('worker', models.CharField(blank=True, default='', max_length=100)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('result_session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='web.analysissession')),
+            ],
+            options={
+                'verbose_name': '분석 작업',
+                'verbose_name_plural': '분석 작업들',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='web_analysi_status_1c6e45_idx')],
+            },
+        ),
+    ]
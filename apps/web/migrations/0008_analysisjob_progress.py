@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0007_analysisjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisjob',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-18 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0008_analysisjob_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkedUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.CharField(max_length=100, unique=True)),
+                ('original_filename', models.CharField(max_length=255)),
+                ('total_size', models.BigIntegerField()),
+                ('chunk_size', models.PositiveIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('analysis_options', models.JSONField(blank=True, default=dict)),
+                ('received', models.JSONField(blank=True, default=list)),
+                ('assembled_bytes', models.BigIntegerField(default=0)),
+                ('parsed_bytes', models.BigIntegerField(default=0)),
+                ('parsed_rows', models.BigIntegerField(default=0)),
+                ('parsed_segments', models.PositiveIntegerField(default=0)),
+                ('parse_error', models.TextField(blank=True, default='')),
+                ('status', models.CharField(choices=[('uploading', '업로드 중'), ('complete', '완료'), ('failed', '실패')], default='uploading', max_length=20)),
+                ('error', models.TextField(blank=True, default='')),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('session_id', models.CharField(blank=True, default='', max_length=100)),
+                ('job_id', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '청크 업로드',
+                'verbose_name_plural': '청크 업로드들',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
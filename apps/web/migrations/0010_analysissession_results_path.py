@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 09:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0009_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='results_path',
+            field=models.CharField(blank=True, default='', max_length=500),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-18 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0010_analysissession_results_path'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='analysissession',
+            index=models.Index(fields=['-created_at', '-id'], name='web_session_history_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analysissession',
+            index=models.Index(fields=['updated_at'], name='web_session_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1 on 2026-10-18 09:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0011_analysissession_history_indexes'),
+    ]
+
+    operations = [
+        # (content_hash, -created_at) 인덱스가 content_hash 단독 조회도 처리하므로 단일 컬럼 인덱스는 제거
+        migrations.AlterField(
+            model_name='analysissession',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='analysisjob',
+            index=models.Index(fields=['status', 'heartbeat_at'], name='web_job_heartbeat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analysissession',
+            index=models.Index(fields=['content_hash', '-created_at'], name='web_session_hash_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='analysissession',
+            index=models.Index(fields=['results_path'], name='web_session_results_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# analysis_result 를 압축 저장 필드로 옮긴다 (새 컬럼에 복사 → 이전 컬럼 삭제 → 이름 변경)
+# 컬럼 타입을 직접 바꾸지 않는 건 JSON → binary 형 변환을 지원하지 않는 DB 가 있어서
+
+from django.db import migrations, models
+
+import apps.web.fields
+
+# 한 번에 옮기는 세션 수 (분석 결과가 커서 전체를 메모리에 올리지 않는다)
+BATCH_SIZE = 200
+
+
+def compress_results(apps, schema_editor):
+    AnalysisSession = apps.get_model('web', 'AnalysisSession')
+    _copy(AnalysisSession, 'analysis_result', 'compressed_result')
+
+
+def decompress_results(apps, schema_editor):
+    AnalysisSession = apps.get_model('web', 'AnalysisSession')
+    _copy(AnalysisSession, 'compressed_result', 'analysis_result')
+
+
+def _copy(model, source, dest):
+    pks = list(model.objects.values_list('pk', flat=True))
+    for start in range(0, len(pks), BATCH_SIZE):
+        sessions = list(model.objects.filter(pk__in=pks[start:start + BATCH_SIZE]).only('pk', source))
+        for session in sessions:
+            setattr(session, dest, getattr(session, source))
+        model.objects.bulk_update(sessions, [dest])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0012_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='compressed_result',
+            field=apps.web.fields.CompressedJSONField(blank=True, default=dict),
+        ),
+        migrations.RunPython(compress_results, decompress_results),
+        migrations.RemoveField(
+            model_name='analysissession',
+            name='analysis_result',
+        ),
+        migrations.RenameField(
+            model_name='analysissession',
+            old_name='compressed_result',
+            new_name='analysis_result',
+        ),
+    ]
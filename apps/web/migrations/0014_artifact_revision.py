@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-18 09:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0013_compress_analysis_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysissession',
+            name='append_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='analysissession',
+            name='artifact_revision',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
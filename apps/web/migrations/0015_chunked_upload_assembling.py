@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('web', '0014_artifact_revision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chunkedupload',
+            name='assembling_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='chunkedupload',
+            name='status',
+            field=models.CharField(choices=[('uploading', '업로드 중'), ('assembling', '마무리 중'), ('complete', '완료'), ('failed', '실패')], default='uploading', max_length=20),
+        ),
+    ]
@@ -1,8 +1,12 @@
 # apps/web/models.py
 
+import os
 from django.db import models
 from django.utils import timezone
 
+from .artifacts import artifact_revision_path
+from .fields import CompressedJSONField
+
 class AnalysisSession(models.Model):
     """분석 세션 모델 - 완료된 분석만 저장"""
     
@@ -13,9 +17,35 @@ class AnalysisSession(models.Model):
     original_filename = models.CharField(max_length=255)
     file_path = models.CharField(max_length=500)
     file_type = models.CharField(max_length=50)
+    # 업로드 내용의 SHA-256 (같은 파일 재업로드 감지용)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
     
-    # 결과 데이터 (JSON 형태로 저장)
-    analysis_result = models.JSONField(default=dict, blank=True)
+    # 결과 데이터 (JSON 을 zlib 으로 압축해 저장)
+    analysis_result = CompressedJSONField(default=dict, blank=True)
+    # 결과에 영향을 주는 분석 설정 (백엔드, 사용한 아티팩트 등)
+    analysis_params = models.JSONField(default=dict, blank=True)
+    # 같은 내용 + 같은 설정으로 이미 분석된 세션의 결과를 재사용한 경우 그 원본 세션
+    source_session = models.ForeignKey(
+        'self', null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='reused_sessions',
+    )
+
+    # 학습된 파이프라인(인코더/스케일러/모델) 아티팩트
+    artifact_path = models.CharField(max_length=500, blank=True, default='')
+    # 재학습 없이 점수만 계산한 경우, 사용한 아티팩트의 세션
+    artifact_source = models.ForeignKey(
+        'self', null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='scored_sessions',
+    )
+    # 결과를 만든 아티팩트 리비전 - 직접 학습한 세션은 현재 리비전(배치 추가마다 1 증가),
+    # 점수만 계산 / 결과 재사용 세션은 그때 쓴 원본 모델의 리비전
+    artifact_revision = models.PositiveIntegerField(default=1)
+    # 배치 추가 중이면 시작 시각 (세션별 잠금 - 재학습 동안 DB 트랜잭션을 열어두지 않는다)
+    append_started_at = models.DateTimeField(null=True, blank=True)
+    # 이상치 행 결과 파일 (Arrow, Anomaly_Score 내림차순) - 비어 있으면 이전 형식(analysis_result 의 table_html)
+    results_path = models.CharField(max_length=500, blank=True, default='')
     
     # 메타데이터
     created_at = models.DateTimeField(auto_now_add=True)
@@ -24,6 +54,15 @@ class AnalysisSession(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # 히스토리 목록 (created_at, id 커서) / 히스토리 ETag 의 마지막 변경 시각
+            models.Index(fields=['-created_at', '-id'], name='web_session_history_idx'),
+            models.Index(fields=['updated_at'], name='web_session_updated_idx'),
+            # 결과 재사용 판정 (같은 내용 해시의 최근 세션)
+            models.Index(fields=['content_hash', '-created_at'], name='web_session_hash_idx'),
+            # 결과 파일을 함께 쓰는 세션 확인
+            models.Index(fields=['results_path'], name='web_session_results_idx'),
+        ]
         verbose_name = '분석 세션'
         verbose_name_plural = '분석 세션들'
     
@@ -33,4 +72,143 @@ class AnalysisSession(models.Model):
     def get_short_filename(self, max_length=20):
         if len(self.original_filename) <= max_length:
             return self.original_filename
-        return self.original_filename[:max_length-3] + "..."
\ No newline at end of file
+        return self.original_filename[:max_length-3] + "..."
+
+    def has_artifact(self):
+        return bool(self.artifact_path) and os.path.exists(self.artifact_path)
+
+    def artifact_path_for(self, revision):
+        return artifact_revision_path(self.artifact_path, revision)
+
+    def has_results(self):
+        return bool(self.results_path)
+
+
+class AnalysisJob(models.Model):
+    """업로드 분석 작업 대기열 - 업로드 요청은 작업만 등록하고 run_analysis_worker 가 실행"""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, '대기'),
+        (STATUS_RUNNING, '실행 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    job_id = models.CharField(max_length=100, unique=True)
+    # 완료되면 이 ID 로 AnalysisSession 이 만들어진다
+    session_id = models.CharField(max_length=100)
+
+    # 업로드 파일 정보
+    original_filename = models.CharField(max_length=255)
+    file_path = models.CharField(max_length=500)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    # 분석 설정 (AnalysisSession.analysis_params 와 같은 형식)
+    analysis_params = models.JSONField(default=dict, blank=True)
+    # 업로드 요청에서 기록한 단계별 시간 (워커가 이어서 기록)
+    profile = models.JSONField(default=list, blank=True)
+    # 실행 중 진행 상황 (현재 단계, 처리 행 수, 진행률, ETA) - ProgressTracker.snapshot()
+    progress = models.JSONField(default=dict, blank=True)
+
+    # 실행 상태
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    worker = models.CharField(max_length=100, blank=True, default='')
+    error = models.TextField(blank=True, default='')
+    # 완료 후 만들어진 분석 세션
+    result_session = models.ForeignKey(
+        AnalysisSession, null=True, blank=True,
+        on_delete=models.SET_NULL,
+        related_name='jobs',
+    )
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # 실행 중인 워커가 주기적으로 갱신 - 오래 갱신되지 않으면 워커가 죽은 것으로 보고 다시 대기열로
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            # 멈춘 작업 확인 (requeue_stale_jobs)
+            models.Index(fields=['status', 'heartbeat_at'], name='web_job_heartbeat_idx'),
+        ]
+        verbose_name = '분석 작업'
+        verbose_name_plural = '분석 작업들'
+
+    def __str__(self):
+        return f"{self.original_filename} ({self.status})"
+
+
+class ChunkedUpload(models.Model):
+    """
+    청크 단위로 나눠 받는 재개 가능 업로드 (큰 파일이 중간에 끊겨도 받지 못한 청크만 다시 보낸다)
+    앞에서부터 이어지는 청크는 받는 대로 파일에 붙이고, 완성된 줄은 바로 컬럼형(Arrow) 조각으로 변환
+    """
+
+    STATUS_UPLOADING = 'uploading'
+    STATUS_ASSEMBLING = 'assembling'
+    STATUS_COMPLETE = 'complete'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_UPLOADING, '업로드 중'),
+        (STATUS_ASSEMBLING, '마무리 중'),
+        (STATUS_COMPLETE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    upload_id = models.CharField(max_length=100, unique=True)
+    original_filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    # 클라이언트가 알려준 전체 파일 SHA-256 (조립 후 비교)
+    sha256 = models.CharField(max_length=64)
+    # 업로드 폼의 분석 옵션 (artifact_session / backend)
+    analysis_options = models.JSONField(default=dict, blank=True)
+
+    # 받은 청크 번호 / 앞에서부터 이어 붙인 바이트 수
+    received = models.JSONField(default=list, blank=True)
+    assembled_bytes = models.BigIntegerField(default=0)
+    # 받는 중 컬럼형으로 변환한 범위 (parse_error 가 있으면 완료 후 한 번에 변환)
+    parsed_bytes = models.BigIntegerField(default=0)
+    parsed_rows = models.BigIntegerField(default=0)
+    parsed_segments = models.PositiveIntegerField(default=0)
+    parse_error = models.TextField(blank=True, default='')
+    # 이어 붙이기 / 마무리 중이면 시작 시각 (업로드별 잠금 - 파일 작업 동안 DB 트랜잭션을 열어두지 않는다)
+    assembling_at = models.DateTimeField(null=True, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_UPLOADING)
+    error = models.TextField(blank=True, default='')
+    # 완료 후 등록된 분석 (결과를 재사용했으면 job_id 는 비어 있다)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    session_id = models.CharField(max_length=100, blank=True, default='')
+    job_id = models.CharField(max_length=100, blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = '청크 업로드'
+        verbose_name_plural = '청크 업로드들'
+
+    def __str__(self):
+        return f"{self.original_filename} ({self.status})"
+
+    def total_chunks(self):
+        return -(-self.total_size // self.chunk_size)
+
+    def chunk_length(self, index):
+        """index 번 청크의 바이트 수 (마지막 청크만 짧을 수 있다)"""
+        if not 0 <= index < self.total_chunks():
+            raise ValueError(f"청크 번호가 범위를 벗어났습니다: {index} (0 ~ {self.total_chunks() - 1})")
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
+
+    def missing_chunks(self):
+        received = set(self.received)
+        return [i for i in range(self.total_chunks()) if i not in received]
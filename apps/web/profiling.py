@@ -0,0 +1,79 @@
+# apps/web/profiling.py
+
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+
+
+def current_rss():
+    """현재 RSS (byte). /proc 이 없는 OS 에서는 프로세스 최대 RSS 로 대신한다"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 는 byte, Linux 는 KB 단위
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageProfiler:
+    """
+    분석 단계별 소요 시간 / 처리 행 수 / 메모리(RSS) 변화 기록
+    결과(report)는 AnalysisSession.analysis_result["profile"] 에 저장돼 느린 분석을 나중에 진단할 수 있다
+
+        with profiler.stage('load') as stage:
+            data = load_data(path)
+            stage['rows'] = len(data)
+
+    progress 로 ProgressTracker 를 넘기면 단계 시작/종료와 advance() 한 행 수가 진행률로 전달된다
+    """
+
+    def __init__(self, stages=None, progress=None):
+        # stages : 다른 프로세스(업로드 요청 → 워커)에서 이어서 기록할 때 이전 기록
+        self.stages = list(stages or [])
+        self.progress = progress
+
+    def expect(self, names):
+        """앞으로 실행할 단계 목록 (진행률 계산용)"""
+        if self.progress is not None:
+            self.progress.expect(names)
+
+    def skip(self, names):
+        """예정했지만 실행하지 않게 된 단계 (진행률 계산에서 제외)"""
+        if self.progress is not None:
+            self.progress.skip(names)
+
+    @contextmanager
+    def stage(self, name, rows=None, expected_rows=None):
+        """expected_rows : 청크 단위로 advance() 하는 단계의 전체 행 수 (알 때만)"""
+        record = {"name": name, "rows": rows}
+        if self.progress is not None:
+            self.progress.start(name, expected_rows)
+        start_rss = current_rss()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = round(time.perf_counter() - started, 4)
+            record["memory_delta_mb"] = round((current_rss() - start_rss) / 1024 ** 2, 1)
+            self.stages.append(record)
+            if self.progress is not None:
+                self.progress.finish(name)
+
+    def advance(self, rows):
+        """현재 단계에서 rows 행을 더 처리함"""
+        if self.progress is not None:
+            self.progress.advance(rows)
+
+    def record(self, name, seconds, rows=None):
+        """직접 잰 구간 추가 (대기열 대기 시간 등)"""
+        self.stages.append({"name": name, "rows": rows, "seconds": round(seconds, 4), "memory_delta_mb": 0.0})
+
+    def report(self):
+        return {
+            "stages": list(self.stages),
+            "total_seconds": round(sum(s["seconds"] for s in self.stages), 4),
+            "rss_mb": round(current_rss() / 1024 ** 2, 1),
+        }
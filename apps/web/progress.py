@@ -0,0 +1,119 @@
+# apps/web/progress.py
+
+import json
+import time
+
+# 단계별 상대 소요 비중 (진행률 계산용, 대략적인 실측 비율)
+STAGE_WEIGHTS = {
+    'columnar_cache': 10,
+    'load_artifact': 1,
+    'load': 5,
+    'optimize_dtypes': 5,
+    'encode': 5,
+    'scale': 3,
+    'transform': 8,
+    'fit': 40,
+    'fit_score': 60,
+    'score': 20,
+    'save_artifact': 2,
+    'load_features': 2,
+    'store_features': 3,
+    'summarize': 5,
+    'pass1_statistics': 35,
+    'pass2_score': 45,
+    'db_write': 1,
+}
+DEFAULT_STAGE_WEIGHT = 5
+# 진행 상황을 저장/전송하는 최소 간격 (초) - 청크마다 DB 를 쓰지 않도록
+PUBLISH_INTERVAL = 0.5
+
+
+class ProgressTracker:
+    """
+    예정된 단계 목록(가중치)과 현재 단계의 처리 행 수로 진행률 / ETA 계산
+    StageProfiler 에 연결하면 단계 시작·종료·행 진행 때마다 갱신되고
+    publish(snapshot) 을 PUBLISH_INTERVAL 간격으로 호출한다 (단계 전환은 항상 호출)
+    """
+
+    def __init__(self, publish, interval=PUBLISH_INTERVAL):
+        self.publish = publish
+        self.interval = interval
+        self.expected = []
+        self.finished = []
+        self.stage = None
+        self.rows_done = 0
+        self.rows_total = None
+        self.seq = 0
+        self.started = time.perf_counter()
+        self.stage_started = self.started
+        self._last_publish = 0.0
+
+    def expect(self, names):
+        """앞으로 실행할 단계 추가 (이미 예정된 단계는 무시)"""
+        self.expected += [name for name in names if name not in self.expected]
+
+    def skip(self, names):
+        """실행하지 않게 된 단계를 예정 목록에서 제외 (캐시 적중 등)"""
+        self.expected = [name for name in self.expected if name not in names]
+
+    def start(self, name, rows_total=None):
+        if name not in self.expected:
+            self.expected.append(name)
+        self.stage, self.rows_done, self.rows_total = name, 0, rows_total
+        self.stage_started = time.perf_counter()
+        self._publish(force=True)
+
+    def advance(self, rows):
+        self.rows_done += rows
+        self._publish()
+
+    def finish(self, name):
+        self.finished.append(name)
+        self.stage = None
+        self._publish(force=True)
+
+    def percent(self):
+        total = sum(_weight(name) for name in self.expected) or 1
+        done = sum(_weight(name) for name in self.finished if name in self.expected)
+        if self.stage and self.rows_total:
+            done += _weight(self.stage) * min(self.rows_done / self.rows_total, 1.0)
+        return min(done / total * 100, 100.0)
+
+    def snapshot(self):
+        now = time.perf_counter()
+        elapsed = now - self.started
+        stage_elapsed = now - self.stage_started
+        percent = self.percent()
+        # 지금까지의 처리 속도(진행률 / 경과 시간)가 유지된다고 보고 남은 시간 추정
+        eta = elapsed * (100 - percent) / percent if percent >= 1 else None
+        return {
+            "seq": self.seq,
+            "stage": self.stage,
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "rows_per_second": round(self.rows_done / stage_elapsed) if self.stage and stage_elapsed else None,
+            "percent": round(percent, 1),
+            "elapsed_seconds": round(elapsed, 1),
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+    def _publish(self, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last_publish < self.interval:
+            return
+        self._last_publish = now
+        self.seq += 1
+        self.publish(self.snapshot())
+
+
+def _weight(name):
+    return STAGE_WEIGHTS.get(name, DEFAULT_STAGE_WEIGHT)
+
+
+def format_sse(event, data, event_id=None):
+    """Server-Sent Events 메시지 한 건 (data 는 JSON)"""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,277 @@
+# apps/web/results.py
+
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+RESULTS_EXT = '.arrow'
+# 저장된 결과 파일의 버퍼 압축 (배치 단위로 압축 - 읽는 배치만 풀린다)
+RESULTS_COMPRESSION = 'zstd'
+# 결과 파일의 레코드 배치 크기 - 기본 조회는 페이지가 걸친 배치만 읽어 압축을 푼다
+RESULTS_BATCH_ROWS = 16_384
+SCORE_COLUMN = 'Anomaly_Score'
+# 결과 파일은 이 순서로 저장 - 기본 조회는 정렬 없이 앞에서부터 잘라 읽는다
+DEFAULT_SORT = '-' + SCORE_COLUMN
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# 필터 쿼리 파라미터: <컬럼>=값, <컬럼>__gte=값, <컬럼>__lt=값 ... (결과 컬럼 이름과 맞는 키만)
+# 또는 명시적 접두어 f_<컬럼>__<연산자>=값 (없는 컬럼이면 400)
+FILTER_PREFIX = 'f_'
+FILTER_OPERATORS = {
+    'eq': pc.equal,
+    'gt': pc.greater,
+    'gte': pc.greater_equal,
+    'lt': pc.less,
+    'lte': pc.less_equal,
+}
+QUERY_PARAMS = ('page', 'page_size', 'sort', 'top')
+
+
+class ResultWriter:
+    """
+    이상치 행을 받는 대로 임시 Arrow 파일에 쓰고, close() 에서 Anomaly_Score 내림차순으로 정렬해 저장
+    (스트리밍 모드는 청크마다 write - 메모리에 전체 이상치 표를 모으지 않는다)
+    한 번도 write 하지 않으면 파일을 만들지 않는다
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._tmp_path = path + '.unsorted'
+        self._sink = None
+        self._writer = None
+
+    def write(self, detected):
+        """이상치 DataFrame 추가 (빈 DataFrame 도 컬럼 구성을 정하는 데 쓰인다)"""
+        table = pa.Table.from_pandas(detected, preserve_index=False)
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            self._sink = pa.OSFile(self._tmp_path, 'wb')
+            self._writer = ipc.new_file(self._sink, table.schema)
+        if table.num_rows:
+            self._writer.write_table(table)
+            self.rows += table.num_rows
+
+    def close(self):
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._sink.close()
+        self._writer = None
+        _write_sorted(_open(self._tmp_path), self.path)
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class TopK:
+    """
+    점수(Anomaly_Score)가 가장 높은 k 행을 청크 단위로 유지
+    청크마다 (지금까지의 k 행 + 새 청크)에서 argpartition 으로 k 행만 남긴다 - 전체 정렬 없음,
+    메모리는 k + 청크 크기 수준이라 스트리밍 점수 계산에도 그대로 쓸 수 있다
+    """
+
+    def __init__(self, k, column=SCORE_COLUMN):
+        self.k = k
+        self.column = column
+        self.rows = None
+        self.seen = 0
+
+    def update(self, frame):
+        self.seen += len(frame)
+        candidates = frame if self.rows is None else pd.concat([self.rows, frame], ignore_index=True)
+        if len(candidates) > self.k:
+            scores = candidates[self.column].to_numpy()
+            candidates = candidates.iloc[np.argpartition(-scores, self.k - 1)[:self.k]]
+        self.rows = candidates.reset_index(drop=True)
+
+    def result(self):
+        """상위 k 행 (점수 내림차순)"""
+        if self.rows is None:
+            return pd.DataFrame()
+        return self.rows.sort_values(self.column, ascending=False, kind='stable', ignore_index=True)
+
+    @property
+    def truncated(self):
+        return self.seen > self.k
+
+
+def top_rows(frame, k, column=SCORE_COLUMN):
+    """frame 에서 점수 상위 k 행 (점수 내림차순)"""
+    top = TopK(k, column)
+    top.update(frame)
+    return top.result()
+
+
+def write_results(detected, path):
+    """이상치 DataFrame 을 결과 파일로 저장"""
+    with ResultWriter(path) as writer:
+        writer.write(detected)
+
+
+def append_results(path, detected):
+    """기존 결과 파일에 배치의 이상치를 합쳐 다시 저장 (append_batch 용 - 이상치 행만 다시 쓴다)"""
+    new = pa.Table.from_pandas(detected, preserve_index=False)
+    if os.path.exists(path):
+        previous = _open(path)
+        new = pa.concat_tables([previous, new.select(previous.column_names).cast(previous.schema)])
+    _write_sorted(new, path)
+
+
+def query_results(path, page=1, page_size=DEFAULT_PAGE_SIZE, sort=DEFAULT_SORT, filters=(), top=None):
+    """
+    결과 파일에서 필터 → 상위 top 행 → 정렬 → 한 페이지만 읽어 반환
+    기본 조회(필터 없음, 점수순)는 페이지가 걸친 배치만 읽어 압축을 풀기 때문에
+    응답 크기 / 시간은 전체 이상치 수가 아니라 페이지 크기에 비례 (필터나 기본 외 정렬이 있으면 파일을 한 번 훑는다)
+    filters : (컬럼, 연산자, 값) 목록 - 연산자는 FILTER_OPERATORS
+    top     : 필터를 통과한 행 중 점수 상위 N 행만 대상으로 (파일이 점수순이라 앞에서 N 행)
+    """
+    page_size = min(max(int(page_size), 1), MAX_PAGE_SIZE)
+    page = max(int(page), 1)
+    top = max(int(top), 0) if top not in (None, '') else None
+    if not os.path.exists(path):
+        return _page([], [], 0, page, page_size, sort or DEFAULT_SORT, top)
+    offset = (page - 1) * page_size
+
+    if not filters and (sort or DEFAULT_SORT) == DEFAULT_SORT:
+        # 파일 순서 그대로 - 페이지가 걸친 배치만 읽는다
+        reader = _reader(path)
+        total = _num_rows(reader)
+        if top is not None:
+            total = min(total, top)
+        rows = _read_slice(reader, offset, max(min(page_size, total - offset), 0))
+        return _page(reader.schema.names, rows, total, page, page_size, DEFAULT_SORT, top)
+
+    table = _open(path)
+
+    for column, operator, value in filters:
+        if column not in table.column_names:
+            raise ValueError(f"없는 컬럼입니다: {column}")
+        if operator not in FILTER_OPERATORS:
+            raise ValueError(f"알 수 없는 필터 연산자입니다: {operator}")
+        value = pc.cast(pa.scalar(value), table.schema.field(column).type)
+        table = table.filter(FILTER_OPERATORS[operator](table[column], value))
+
+    if top is not None:
+        table = table.slice(0, top)
+
+    column = (sort or DEFAULT_SORT).lstrip('-')
+    if column not in table.column_names:
+        raise ValueError(f"정렬할 수 없는 컬럼입니다: {column}")
+    if (sort or DEFAULT_SORT) == DEFAULT_SORT:
+        rows = table.slice(offset, page_size)
+    elif offset >= table.num_rows:
+        rows = table.slice(0, 0)
+    else:
+        # 요청한 페이지까지만 부분 정렬 (전체 정렬 없이 앞쪽 offset + page_size 행 선택)
+        order = 'descending' if sort.startswith('-') else 'ascending'
+        indices = pc.select_k_unstable(
+            table, k=min(offset + page_size, table.num_rows), sort_keys=[(column, order)],
+        )
+        rows = table.take(indices[offset:])
+    return _page(table.column_names, rows.to_pylist(), table.num_rows, page, page_size, sort or DEFAULT_SORT, top)
+
+
+def parse_filters(params, columns):
+    """
+    쿼리 파라미터(dict)에서 필터 목록 추출 (columns: 결과 파일의 컬럼 이름)
+    - <컬럼>[__<연산자>]    : 컬럼 이름이 결과 스키마에 있을 때만 필터
+    - f_<컬럼>[__<연산자>]  : 명시적 필터 - 없는 컬럼이면 query_results 가 ValueError (400)
+    - 그 밖의 키 (page / page_size / sort / top, jQuery 캐시 버스터 _, utm_* 등) 는 무시
+    """
+    filters = []
+    for key, value in params.items():
+        if key in QUERY_PARAMS:
+            continue
+        column, operator = _filter_key(key)
+        if column in columns:
+            filters.append((column, operator, value))
+        elif key.startswith(FILTER_PREFIX):
+            filters.append((*_filter_key(key[len(FILTER_PREFIX):]), value))
+    return filters
+
+
+def result_columns(path):
+    """결과 파일의 컬럼 이름 (스키마만 읽는다)"""
+    return _reader(path).schema.names
+
+
+def _filter_key(key):
+    column, _, operator = key.rpartition('__')
+    if not column or operator not in FILTER_OPERATORS:
+        return key, 'eq'
+    return column, operator
+
+
+def _page(columns, rows, total, page, page_size, sort, top):
+    return {
+        'columns': columns,
+        'rows': rows,
+        'total': total,
+        'page': page,
+        'page_size': page_size,
+        'pages': -(-total // page_size),
+        'sort': sort,
+        'top': top,
+    }
+
+
+def _reader(path):
+    return ipc.open_file(pa.memory_map(path, 'r'))
+
+
+def _open(path):
+    return _reader(path).read_all()
+
+
+def _num_rows(reader):
+    metadata = reader.schema.metadata or {}
+    if b'num_rows' in metadata:
+        return int(metadata[b'num_rows'])
+    # 행 수를 기록하기 전 형식 (압축 없음 - 배치를 읽어도 복사 / 압축 해제가 없다)
+    return sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+
+
+def _read_slice(reader, offset, length):
+    """offset 행부터 length 행 (배치 크기가 기록된 파일이면 해당 배치만 읽는다)"""
+    if length <= 0:
+        return []
+    metadata = reader.schema.metadata or {}
+    batch_rows = int(metadata.get(b'batch_rows', 0))
+    first = offset // batch_rows if batch_rows else 0
+    start = first * batch_rows
+    batches = []
+    for i in range(first, reader.num_record_batches):
+        batch = reader.get_batch(i)
+        if start + batch.num_rows > offset:
+            batches.append(batch)
+        start += batch.num_rows
+        if start >= offset + length:
+            break
+    if not batches:
+        return []
+    table = pa.Table.from_batches(batches)
+    skip = offset - (start - table.num_rows)
+    return table.slice(skip, length).to_pylist()
+
+
+def _write_sorted(table, path):
+    table = table.sort_by([(SCORE_COLUMN, 'descending')])
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'num_rows': str(table.num_rows).encode(),
+        b'batch_rows': str(RESULTS_BATCH_ROWS).encode(),
+    })
+    tmp_path = path + '.tmp'
+    options = ipc.IpcWriteOptions(compression=RESULTS_COMPRESSION)
+    with pa.OSFile(tmp_path, 'wb') as sink, ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table, max_chunksize=RESULTS_BATCH_ROWS)
+    os.replace(tmp_path, path)
@@ -1,9 +1,10 @@
 # app/web/routes.py
-from flask import Blueprint, render_template, request, redirect, url_for, jsonify, current_app
+from flask import Blueprint, Response, render_template, request, redirect, url_for, jsonify, current_app
 from werkzeug.utils import secure_filename
 import os
 
-from .task import start_task, get_progress, get_info
+from .progress import format_sse
+from .task import start_task, get_status, get_info, wait_for_change
 
 bp = Blueprint('web', __name__, template_folder='templates/web')
 
@@ -28,13 +29,34 @@ def upload():
 # 2) 진행률 페이지
 @bp.route('/upload/<task_id>/progress')
 def progress(task_id):
-    return render_template('progress.html', task_id=task_id)
+    return render_template(
+        'progress.html',
+        events_url=url_for('web.events', task_id=task_id),
+        status_url=url_for('web.status', task_id=task_id),
+        details_url=url_for('web.info', task_id=task_id),
+    )
 
-# 3) AJAX로 진행률 가져오기
+# 3) 진행 상황 (단계 / 처리 행 수 / ETA)
 @bp.route('/upload/<task_id>/status')
 def status(task_id):
-    prog = get_progress(task_id)
-    return jsonify({"progress": prog})
+    return jsonify(get_status(task_id))
+
+# 3-1) 진행 상황 push (Server-Sent Events) - 바뀔 때만 전송
+@bp.route('/upload/<task_id>/events')
+def events(task_id):
+    def stream():
+        seq = None
+        while True:
+            current = wait_for_change(task_id, seq, timeout=15)
+            if current is None:
+                yield ": keepalive\n\n"
+                continue
+            seq = current["progress"].get("seq")
+            yield format_sse('progress', current, event_id=seq)
+            if current["status"] != "running":
+                yield format_sse('done', current)
+                return
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 # 4) 파일 세부 정보 API
 @bp.route('/upload/<task_id>/info')
@@ -0,0 +1,60 @@
+# apps/web/schema.py
+
+import numpy as np
+import pandas as pd
+
+# 고유값 비율이 이 값 이하인 문자열 컬럼은 category 로 변환
+CATEGORY_RATIO = 0.5
+
+NUMERIC_DTYPES     = ['number', 'bool']
+CATEGORICAL_DTYPES = ['object', 'category', 'string']
+
+
+def split_columns(data):
+    """
+    숫자형 / 문자형 컬럼 분리
+    int32, uint8, bool 등 int64/float64 가 아닌 숫자형도 숫자형으로 포함
+    """
+    numeric_cols     = list(data.select_dtypes(include=NUMERIC_DTYPES).columns)
+    categorical_cols = list(data.select_dtypes(include=CATEGORICAL_DTYPES).columns)
+    return numeric_cols, categorical_cols
+
+
+def optimize_dtypes(data, category_ratio=CATEGORY_RATIO):
+    """
+    인코딩 전에 dtype 을 줄여 DataFrame 메모리 사용량을 낮춘다
+    - 정수: 값 범위에 맞는 가장 작은 정수형 (음수가 없으면 unsigned)
+    - 실수: 값이 유지되면 float32
+    - 고유값이 적은 문자열: category
+    (최적화된 DataFrame, 메모리 리포트) 반환
+    """
+    before = int(data.memory_usage(deep=True).sum())
+
+    converted = {}
+    for col, series in data.items():
+        kind = series.dtype.kind
+        if kind in 'iu':
+            converted[col] = pd.to_numeric(series, downcast='unsigned' if (series >= 0).all() else 'integer')
+        elif kind == 'f':
+            converted[col] = pd.to_numeric(series, downcast='float')
+        elif kind == 'O' and len(series) and series.nunique() <= category_ratio * len(series):
+            converted[col] = series.astype('category')
+    if converted:
+        # assign(**kwargs) 는 문자열이 아닌 컬럼 이름(숫자 헤더 등)을 받지 못하므로 컬럼별로 대입
+        data = data.copy()
+        for col, series in converted.items():
+            data[col] = series
+
+    after = int(data.memory_usage(deep=True).sum())
+    report = {
+        "memory_before": before,
+        "memory_after": after,
+        "memory_saved": before - after,
+        "memory_saved_pct": round((before - after) / before * 100, 1) if before else 0.0,
+    }
+    return data, report
+
+
+def to_feature_matrix(full_data):
+    """모델 입력용 feature 행렬은 float32 로 통일 (IsolationForest 도 내부적으로 float32 사용)"""
+    return full_data.astype(np.float32)
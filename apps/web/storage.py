@@ -0,0 +1,290 @@
+# apps/web/storage.py
+"""
+저장 공간 관리
+- 세션 삭제 시 그 세션만 쓰던 파일(결과 / 아티팩트 / 업로드 / 컬럼형 캐시 / 전처리 캐시) 삭제
+- 원본 업로드와 컬럼형 / 전처리 캐시를 보관 기간(ANOMALY_UPLOAD_RETENTION_DAYS)과 디스크 쿼터(ANOMALY_STORAGE_QUOTA)에 맞춰
+  오래 안 쓴 것부터(LRU) 정리 - 결과 파일 / 아티팩트는 세션이 있는 동안 남긴다 (분석 결과는 원본 없이 조회 가능)
+정리는 run_storage_manager 명령이 주기적으로 실행
+"""
+
+import os
+import shutil
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AnalysisJob, AnalysisSession, ChunkedUpload
+
+ACTIVE_JOB_STATUSES = (AnalysisJob.STATUS_QUEUED, AnalysisJob.STATUS_RUNNING)
+# 아무 세션 / 작업도 쓰지 않는 업로드와 쓰다 남은 임시 파일은 이 시간(초)이 지나면 삭제
+# (업로드 직후 작업 등록 전이거나 배치 추가 중일 수 있다)
+ORPHAN_GRACE_SECONDS = 3600
+# 이 시간(초) 동안 청크가 들어오지 않은 청크 업로드는 실패 처리하고 받은 청크 삭제
+STALE_CHUNKED_UPLOAD_SECONDS = 24 * 3600
+TMP_SUFFIXES = ('.part', '.tmp', '.unsorted')
+
+
+def delete_session_files(session):
+    """
+    삭제된 세션의 파일 정리 - 다른 세션이나 진행 중인 작업이 같은 파일을 쓰면 남긴다
+    (결과를 재사용한 세션은 원본 세션과 결과 파일 / 업로드를 같이 쓴다)
+    반환값: 삭제한 경로 목록
+    """
+    removed = []
+    if session.results_path and not AnalysisSession.objects.filter(results_path=session.results_path).exists():
+        removed += _remove(session.results_path)
+    if session.artifact_path and not AnalysisSession.objects.filter(artifact_path=session.artifact_path).exists():
+        removed += _remove(session.artifact_path)
+        # 배치 추가로 남아 있던 이전 리비전 (이 세션이 없으면 그 리비전을 찾을 세션도 없다)
+        for revision in range(1, session.artifact_revision):
+            removed += _remove(session.artifact_path_for(revision))
+    if session.file_path and not _upload_in_use(session.file_path):
+        removed += _remove(session.file_path)
+    if session.content_hash and not _content_in_use(session.content_hash):
+        removed += _remove(columnar_cache_path(session.content_hash))
+        for path in feature_cache_files(session.content_hash):
+            removed += _remove(path)
+    return removed
+
+
+def delete_replaced_files(session, revision, results_path):
+    """
+    배치 추가로 새 리비전이 된 세션의 이전 아티팩트(revision) / 이전 결과 파일 정리
+    그 리비전으로 만든 결과를 가진 세션이나 그 리비전으로 점수를 계산할 작업, 같은 결과 파일을 쓰는 세션이 있으면 남긴다
+    반환값: 삭제한 경로 목록
+    """
+    removed = []
+    if not _revision_in_use(session, revision):
+        removed += _remove(session.artifact_path_for(revision))
+    if results_path and not AnalysisSession.objects.filter(results_path=results_path).exists():
+        removed += _remove(results_path)
+    return removed
+
+
+def delete_unused_upload(path):
+    """어떤 세션 / 진행 중인 작업도 쓰지 않는 업로드 원본 삭제. 반환값: 삭제한 경로 목록"""
+    if _upload_in_use(path):
+        return []
+    return _remove(path)
+
+
+def collect_garbage(dry_run=False):
+    """
+    한 번의 정리 실행. 반환값: 보고서 dict
+    removed : (경로, 크기, 이유) 목록 - 이유는 stale_upload / tmp / duplicate / orphan / retention / quota
+    usage   : 정리 후 MEDIA_ROOT 사용량 (byte), over_quota : 정리할 수 있는 걸 다 지워도 쿼터를 넘는지
+    """
+    now = time.time()
+    usage = _directory_size(settings.MEDIA_ROOT)
+    removed = _expire_chunked_uploads(dry_run)
+
+    active = AnalysisJob.objects.filter(status__in=ACTIVE_JOB_STATUSES)
+    protected_paths = set(active.values_list('file_path', flat=True))
+    protected_hashes = set(active.values_list('content_hash', flat=True))
+    referenced = set(AnalysisSession.objects.values_list('file_path', flat=True)) | protected_paths
+    # 참조되는 업로드의 내용 해시 - 같은 내용의 참조되지 않는 사본(이름만 다른 중복)은 orphan 과 같이 정리
+    referenced_hashes = {_upload_hash(path) for path in referenced if path}
+
+    candidates = []
+    for path, size, mtime in _evictable_files():
+        if _is_tmp(path):
+            if now - mtime > ORPHAN_GRACE_SECONDS:
+                removed.append((path, size, 'tmp'))
+            continue
+        if path in protected_paths or _cache_hash(path) in protected_hashes:
+            continue
+        if _is_upload(path) and path not in referenced:
+            # 저장 직후 작업 등록 전일 수 있으므로 유예 시간은 둘 다 같다
+            if now - mtime > ORPHAN_GRACE_SECONDS:
+                reason = 'duplicate' if _upload_hash(path) in referenced_hashes else 'orphan'
+                removed.append((path, size, reason))
+            continue
+        candidates.append((path, size, mtime))
+
+    # 보관 기간 - 마지막으로 쓴 시각(mtime)이 기간을 넘은 원본
+    if settings.ANOMALY_UPLOAD_RETENTION_DAYS:
+        cutoff = now - settings.ANOMALY_UPLOAD_RETENTION_DAYS * 86400
+        removed += [(path, size, 'retention') for path, size, mtime in candidates if mtime < cutoff]
+        candidates = [c for c in candidates if c[2] >= cutoff]
+
+    # 쿼터 - 넘으면 오래 안 쓴 원본부터
+    usage -= sum(size for _, size, _ in removed)
+    quota = settings.ANOMALY_STORAGE_QUOTA
+    if quota:
+        for path, size, mtime in sorted(candidates, key=lambda c: c[2]):
+            if usage <= quota:
+                break
+            removed.append((path, size, 'quota'))
+            usage -= size
+
+    if not dry_run:
+        removed = [
+            entry for entry in removed
+            if entry[2] == 'stale_upload' or _evict(entry[0], protected_hashes, now)
+        ]
+        usage = _directory_size(settings.MEDIA_ROOT)
+    return {
+        'removed': removed,
+        'freed': sum(size for _, size, _ in removed),
+        'usage': usage,
+        'quota': quota,
+        'over_quota': bool(quota) and usage > quota,
+    }
+
+
+def touch(path):
+    """파일을 다시 썼다고 기록 (LRU 정리 순서는 mtime 기준)"""
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+
+
+def columnar_cache_path(content_hash):
+    from .columnar import COLUMNAR_EXT
+    return os.path.join(settings.ANOMALY_COLUMNAR_CACHE_DIR, content_hash + COLUMNAR_EXT)
+
+
+def feature_cache_files(content_hash):
+    from .features import feature_cache_paths
+    return feature_cache_paths(settings.ANOMALY_FEATURE_CACHE_DIR, content_hash)
+
+
+def _revision_in_use(session, revision):
+    dependents = AnalysisSession.objects.filter(
+        Q(artifact_source=session) | Q(source_session=session) | Q(source_session__artifact_source=session),
+        artifact_revision=revision,
+    )
+    jobs = AnalysisJob.objects.filter(
+        status__in=ACTIVE_JOB_STATUSES,
+        analysis_params__artifact_session=session.session_id,
+        analysis_params__artifact_revision=revision,
+    )
+    return dependents.exists() or jobs.exists()
+
+
+def _upload_in_use(path):
+    return (
+        AnalysisSession.objects.filter(file_path=path).exists()
+        or AnalysisJob.objects.filter(file_path=path, status__in=ACTIVE_JOB_STATUSES).exists()
+    )
+
+
+def _content_in_use(content_hash):
+    return (
+        AnalysisSession.objects.filter(content_hash=content_hash).exists()
+        or AnalysisJob.objects.filter(content_hash=content_hash, status__in=ACTIVE_JOB_STATUSES).exists()
+    )
+
+
+def _expire_chunked_uploads(dry_run):
+    """오래 멈춘 청크 업로드를 실패 처리하고 받은 청크 삭제"""
+    from .uploads import chunked_upload_dir
+
+    removed = []
+    cutoff = timezone.now() - timedelta(seconds=STALE_CHUNKED_UPLOAD_SECONDS)
+    for upload in ChunkedUpload.objects.filter(status=ChunkedUpload.STATUS_UPLOADING, updated_at__lt=cutoff):
+        directory = chunked_upload_dir(upload)
+        removed.append((directory, _directory_size(directory), 'stale_upload'))
+        if dry_run:
+            continue
+        upload.status = ChunkedUpload.STATUS_FAILED
+        upload.error = "업로드가 오래 멈춰 받은 청크를 삭제했습니다. 처음부터 다시 업로드해주세요."
+        upload.save(update_fields=['status', 'error', 'updated_at'])
+        shutil.rmtree(directory, ignore_errors=True)
+    return removed
+
+
+def _evictable_files():
+    """정리할 수 있는 파일 (업로드 원본, 컬럼형 / 전처리 캐시, 결과 폴더의 임시 파일): (경로, 크기, mtime)"""
+    directories = [
+        os.path.join(settings.MEDIA_ROOT, "uploads"),
+        settings.ANOMALY_COLUMNAR_CACHE_DIR,
+        settings.ANOMALY_FEATURE_CACHE_DIR,
+        os.path.join(settings.MEDIA_ROOT, "results"),
+        os.path.join(settings.MEDIA_ROOT, "artifacts"),
+    ]
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                path = os.path.join(directory, entry.name)
+                # 결과 / 아티팩트 폴더는 임시 파일만
+                if directory in directories[3:] and not _is_tmp(path):
+                    continue
+                stat = entry.stat()
+                yield path, stat.st_size, stat.st_mtime
+
+
+def _evict(path, protected_hashes, started):
+    """정리 직전 다시 확인 - 목록을 만든 뒤 다시 쓰였거나(touch) 새 작업이 같은 원본을 쓰기 시작했으면 남긴다"""
+    if _cache_hash(path) in protected_hashes:
+        return False
+    try:
+        if os.path.getmtime(path) > started:
+            return False
+    except FileNotFoundError:
+        return False
+    if _is_upload(path) and AnalysisJob.objects.filter(file_path=path, status__in=ACTIVE_JOB_STATUSES).exists():
+        return False
+    return bool(_remove(path))
+
+
+def _remove(path):
+    """MEDIA_ROOT 안의 파일 / 폴더만 삭제 (반환값: 삭제했으면 [path])"""
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    if not os.path.realpath(path).startswith(root + os.sep):
+        return []
+    try:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+    except FileNotFoundError:
+        return []
+    return [path]
+
+
+def _is_tmp(path):
+    name = os.path.basename(path)
+    return name.startswith('.') or name.endswith(TMP_SUFFIXES)
+
+
+def _is_upload(path):
+    return os.path.dirname(path) == os.path.join(settings.MEDIA_ROOT, "uploads")
+
+
+def _upload_hash(path):
+    """
+    업로드 파일명의 내용 해시 앞 16자리로 비교
+    (uploads/<해시><확장자>, 이전 형식은 uploads/<해시 앞 16자리>_<원래 이름>)
+    """
+    return os.path.basename(path)[:16]
+
+
+def _cache_hash(path):
+    """컬럼형 / 전처리 캐시 파일이면 내용 해시, 아니면 None"""
+    directory, name = os.path.split(path)
+    if directory == settings.ANOMALY_COLUMNAR_CACHE_DIR:
+        return os.path.splitext(name)[0]
+    if directory == settings.ANOMALY_FEATURE_CACHE_DIR:
+        # <내용 해시>-<전처리 설정 해시>.npy / .meta
+        return name.split('-', 1)[0]
+    return None
+
+
+def _directory_size(directory):
+    total = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except FileNotFoundError:
+                pass
+    return total
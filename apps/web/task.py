@@ -1,7 +1,6 @@
 # app/tasks.py
 import uuid, os, time
 from threading import Thread
-from .ai_script import detect_anomalies
 
 # 메모리 내 태스크 저장소
 _tasks = {}
@@ -10,30 +9,51 @@ def start_task(file_path):
     task_id = str(uuid.uuid4())
     _tasks[task_id] = {
         "filename": os.path.basename(file_path),
-        "progress": 0,
+        "status": "running",
+        "progress": {},
+        "error": "",
         "result_html": None,
     }
     Thread(target=_run, args=(task_id, file_path), daemon=True).start()
     return task_id
 
 def _run(task_id, file_path):
-    # 1) 시작 표시
-    _tasks[task_id]["progress"] = 5
-
-    # 2) 실제 AI 탐지 함수 호출
-    #    detect_anomalies는 file_path만 받아 HTML 문자열을 반환합니다.
-    html = detect_anomalies(file_path)
-
-    # 3) 중간 진척도를 80% → 100% 로 올려 줘도 되고
-    _tasks[task_id]["progress"] = 80
-    time.sleep(0.2)  # (필요 시)
-
-    # 4) 결과 저장
-    _tasks[task_id]["result_html"] = html
-    _tasks[task_id]["progress"]    = 100
+    from .ai_script import detect_anomalies
+    from .profiling import StageProfiler
+    from .progress import ProgressTracker
+
+    # 파이프라인 단계 / 처리 행 수 / ETA 를 그대로 진행 상황으로 저장
+    tracker = ProgressTracker(lambda snapshot: _tasks[task_id].update(progress=snapshot))
+    try:
+        result = detect_anomalies(file_path, profiler=StageProfiler(progress=tracker))
+    except Exception as e:
+        _tasks[task_id].update(status="failed", error=str(e))
+        return
+
+    # 결과 저장
+    _tasks[task_id]["result_html"] = f"<p>{result['summary']}</p>" + result["table_html"]
+    _tasks[task_id]["status"] = "done"
 
 def get_progress(task_id):
-    return _tasks.get(task_id, {}).get("progress", 0)
+    return _tasks.get(task_id, {}).get("progress", {})
+
+def get_status(task_id):
+    task = _tasks.get(task_id, {})
+    return {
+        "status": task.get("status"),
+        "progress": task.get("progress", {}),
+        "error": task.get("error", ""),
+    }
+
+def wait_for_change(task_id, seq, timeout):
+    """진행 상황이 seq 이후로 바뀌거나 끝날 때까지 대기 (SSE 스트림용)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = get_status(task_id)
+        if status["progress"].get("seq") != seq or status["status"] != "running":
+            return status
+        time.sleep(0.2)
+    return None
 
 def get_info(task_id):
     return _tasks.get(task_id, {})
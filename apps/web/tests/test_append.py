@@ -0,0 +1,72 @@
+# apps/web/tests/test_append.py
+
+import os
+from datetime import timedelta
+from unittest import mock
+
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.web import views
+from apps.web.jobs import execute_job
+from apps.web.models import AnalysisSession
+
+from .utils import MediaTestCase, log_csv, upload_file
+
+
+class AppendBatchTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        response = self.client.post(
+            reverse('web:upload'), {'datafile': upload_file(log_csv()), 'backend': 'sklearn'},
+            HTTP_ACCEPT='application/json',
+        )
+        execute_job(response.json()['job_id'])
+        self.session = AnalysisSession.objects.get(session_id=response.json()['session_id'])
+
+    def append(self, seed=1):
+        return self.client.post(
+            reverse('web:analysis_append', args=[self.session.session_id]),
+            {'datafile': upload_file(log_csv(rows=50, seed=seed), 'batch.csv')},
+        )
+
+    def test_append_writes_new_revision_and_releases_lease(self):
+        old_artifact, old_results = self.session.artifact_path, self.session.results_path
+
+        response = self.append()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['artifact_revision'], 2)
+        self.assertEqual(response.json()['batch']['total'], 50)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.artifact_revision, 2)
+        self.assertIsNone(self.session.append_started_at)
+        self.assertNotEqual(self.session.artifact_path, old_artifact)
+        self.assertNotEqual(self.session.results_path, old_results)
+        self.assertTrue(self.session.has_artifact())
+        # 이전 리비전을 쓰는 세션이 없으므로 이전 파일은 정리된다
+        self.assertFalse(os.path.exists(old_artifact))
+        self.assertFalse(os.path.exists(old_results))
+
+    def test_held_lease_returns_conflict(self):
+        AnalysisSession.objects.filter(pk=self.session.pk).update(append_started_at=timezone.now())
+
+        with mock.patch.object(views, 'APPEND_WAIT_SECONDS', 0):
+            response = self.append()
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()['success'])
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.artifact_revision, 1)
+
+    def test_stale_lease_is_taken_over(self):
+        stale = timezone.now() - timedelta(seconds=views.APPEND_STALE_SECONDS + 60)
+        AnalysisSession.objects.filter(pk=self.session.pk).update(append_started_at=stale)
+
+        with mock.patch.object(views, 'APPEND_WAIT_SECONDS', 0):
+            response = self.append()
+
+        self.assertEqual(response.status_code, 200)
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.artifact_revision, 2)
+        self.assertIsNone(self.session.append_started_at)
@@ -0,0 +1,49 @@
+# apps/web/tests/test_artifacts.py
+
+import os
+
+import joblib
+
+from apps.web import encoding
+from apps.web.ai_script import detect_anomalies
+from apps.web.artifacts import ARTIFACT_VERSION, load_artifact
+
+from .utils import MediaTestCase, log_csv
+
+
+class ArtifactVersionTests(MediaTestCase):
+    def path(self, name):
+        return os.path.join(self.media_root, name)
+
+    def test_current_artifact_round_trip(self):
+        data_path = self.path('logs.csv')
+        with open(data_path, 'wb') as f:
+            f.write(log_csv(rows=500))
+        artifact_path = self.path('current.pkl')
+
+        trained = detect_anomalies(data_path, save_artifact_to=artifact_path, backend='sklearn')
+        scored = detect_anomalies(data_path, artifact_path=artifact_path)
+
+        self.assertEqual(load_artifact(artifact_path)['version'], ARTIFACT_VERSION)
+        self.assertEqual(scored['anomaly_count'], trained['anomaly_count'])
+
+    def test_version_2_artifact_is_rejected(self):
+        path = self.path('v2.pkl')
+        joblib.dump({'version': 2, 'encoder': None, 'scaler': None, 'backend': None,
+                     'numeric_cols': [], 'categorical_cols': []}, path)
+
+        with self.assertRaisesMessage(ValueError, '지원하지 않는 아티팩트 버전'):
+            load_artifact(path)
+
+    def test_artifact_referencing_removed_encoder_is_rejected(self):
+        # 이전 트리의 스트리밍 아티팩트처럼 이제 없는 apps.web.encoding.StreamingCountEncoder 를 참조하는 파일
+        legacy_class = type('StreamingCountEncoder', (), {'__module__': encoding.__name__})
+        encoding.StreamingCountEncoder = legacy_class
+        try:
+            path = self.path('v2-streaming.pkl')
+            joblib.dump({'version': 2, 'encoder': legacy_class()}, path)
+        finally:
+            del encoding.StreamingCountEncoder
+
+        with self.assertRaisesMessage(ValueError, '지원하지 않는 아티팩트 버전'):
+            load_artifact(path)
@@ -0,0 +1,92 @@
+# apps/web/tests/test_chunked_uploads.py
+
+import hashlib
+import json
+import os
+from unittest import mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from apps.web.models import AnalysisJob, ChunkedUpload
+
+from .utils import MediaTestCase, log_csv
+
+CHUNK_SIZE = 4096
+
+
+@override_settings(ANOMALY_UPLOAD_CHUNK_SIZE=CHUNK_SIZE)
+class ChunkedUploadTests(MediaTestCase):
+    def start(self, content, sha256=None):
+        response = self.client.post(
+            reverse('web:chunked_upload_start'),
+            json.dumps({
+                'filename': 'logs.csv', 'size': len(content),
+                'sha256': sha256 or hashlib.sha256(content).hexdigest(), 'backend': 'sklearn',
+            }),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()['upload']['upload_id']
+
+    def send_chunks(self, upload_id, content, order=None):
+        chunks = [content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE)]
+        for index in order or range(len(chunks)):
+            response = self.client.put(
+                reverse('web:chunked_upload_chunk', args=[upload_id, index]), chunks[index],
+                content_type='application/octet-stream',
+                HTTP_X_CHUNK_SHA256=hashlib.sha256(chunks[index]).hexdigest(),
+            )
+            self.assertEqual(response.status_code, 200)
+        return len(chunks)
+
+    def complete(self, upload_id):
+        return self.client.post(reverse('web:chunked_upload_complete', args=[upload_id]))
+
+    def test_chunks_out_of_order_assemble_into_one_job(self):
+        content = log_csv(rows=1000)
+        upload_id = self.start(content)
+        count = self.send_chunks(upload_id, content, order=[2, 0, 1] + list(range(3, len(content) // CHUNK_SIZE + 1)))
+        self.assertGreater(count, 3)
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 202)
+        upload = ChunkedUpload.objects.get(upload_id=upload_id)
+        self.assertEqual(upload.status, ChunkedUpload.STATUS_COMPLETE)
+        self.assertEqual(upload.parsed_rows, 1000)
+        job = AnalysisJob.objects.get(job_id=response.json()['job_id'])
+        with open(job.file_path, 'rb') as f:
+            self.assertEqual(f.read(), content)
+        # 다시 호출해도 같은 작업
+        self.assertEqual(self.complete(upload_id).json()['job_id'], job.job_id)
+
+    def test_checksum_mismatch_fails_upload(self):
+        content = log_csv(rows=200)
+        upload_id = self.start(content, sha256='0' * 64)
+        self.send_chunks(upload_id, content)
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ChunkedUpload.objects.get(upload_id=upload_id).status, ChunkedUpload.STATUS_FAILED)
+        self.assertFalse(AnalysisJob.objects.exists())
+
+    def test_retry_after_failed_registration_registers_stored_file(self):
+        content = log_csv(rows=500)
+        upload_id = self.start(content)
+        self.send_chunks(upload_id, content)
+
+        with mock.patch('apps.web.uploads.register_upload', side_effect=RuntimeError('db is locked')):
+            response = self.complete(upload_id)
+        self.assertEqual(response.status_code, 500)
+        upload = ChunkedUpload.objects.get(upload_id=upload_id)
+        self.assertEqual(upload.status, ChunkedUpload.STATUS_UPLOADING)
+        self.assertIsNone(upload.assembling_at)
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 202)
+        job = AnalysisJob.objects.get(job_id=response.json()['job_id'])
+        self.assertTrue(os.path.exists(job.file_path))
+        self.assertEqual(job.content_hash, hashlib.sha256(content).hexdigest())
@@ -0,0 +1,73 @@
+# apps/web/tests/test_jobs.py
+
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.web.jobs import claim_job, claim_next_job, enqueue_analysis, release_job, requeue_stale_jobs, touch_jobs
+from apps.web.models import AnalysisJob
+
+
+def enqueue(name='logs.csv'):
+    return enqueue_analysis(f"session-{name}", name, f"/tmp/{name}", '', {})
+
+
+@override_settings(ANOMALY_JOB_STALE_SECONDS=60, ANOMALY_JOB_MAX_ATTEMPTS=2)
+class JobQueueTests(TestCase):
+    def test_claim_next_job_takes_oldest_queued_once(self):
+        first, second = enqueue('a.csv'), enqueue('b.csv')
+
+        claimed = claim_next_job('worker-1')
+
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual(claimed.status, AnalysisJob.STATUS_RUNNING)
+        self.assertEqual(claimed.worker, 'worker-1')
+        self.assertEqual(claimed.attempts, 1)
+        # 이미 실행 중인 작업은 다른 워커가 가져가지 못한다
+        self.assertFalse(claim_job(first.pk, 'worker-2'))
+        self.assertEqual(claim_next_job('worker-2').pk, second.pk)
+        self.assertIsNone(claim_next_job('worker-3'))
+
+    def test_stale_job_is_requeued_then_failed_after_max_attempts(self):
+        job = enqueue()
+        claim_job(job.pk, 'worker-1')
+        old = timezone.now() - timedelta(seconds=120)
+        AnalysisJob.objects.filter(pk=job.pk).update(heartbeat_at=old)
+
+        self.assertEqual(requeue_stale_jobs(), (1, 0))
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_QUEUED)
+        self.assertEqual(job.worker, '')
+
+        claim_job(job.pk, 'worker-2')
+        AnalysisJob.objects.filter(pk=job.pk).update(heartbeat_at=old)
+
+        self.assertEqual(requeue_stale_jobs(), (0, 1))
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_heartbeat_keeps_running_job(self):
+        job = enqueue()
+        claim_job(job.pk, 'worker-1')
+        AnalysisJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(seconds=120))
+
+        touch_jobs([job.job_id])
+
+        self.assertEqual(requeue_stale_jobs(), (0, 0))
+        self.assertEqual(AnalysisJob.objects.get(pk=job.pk).status, AnalysisJob.STATUS_RUNNING)
+
+    def test_release_job_requeues_until_max_attempts(self):
+        job = enqueue()
+        claim_job(job.pk, 'worker-1')
+
+        release_job(job.job_id, 'BrokenProcessPool()')
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_QUEUED)
+
+        claim_job(job.pk, 'worker-1')
+        release_job(job.job_id, 'BrokenProcessPool()')
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.STATUS_FAILED)
+        self.assertEqual(job.error, 'BrokenProcessPool()')
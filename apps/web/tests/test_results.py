@@ -0,0 +1,66 @@
+# apps/web/tests/test_results.py
+
+import os
+
+import pandas as pd
+from django.urls import reverse
+
+from apps.web.models import AnalysisSession
+from apps.web.results import parse_filters, query_results, write_results
+
+from .utils import MediaTestCase
+
+
+class ResultQueryTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.media_root, 'results.arrow')
+        write_results(pd.DataFrame({
+            'method': ['GET', 'POST', 'GET', 'PUT', 'GET'],
+            'bytes': [10, 20, 30, 40, 50],
+            'Anomaly': [1] * 5,
+            'Anomaly_Score': [0.1, 0.5, 0.3, 0.9, 0.7],
+        }), self.path)
+        self.session = AnalysisSession.objects.create(
+            session_id='s1', original_filename='l.csv', file_path='l.csv', file_type='CSV',
+            analysis_result={}, results_path=self.path,
+        )
+
+    def anomalies(self, **params):
+        return self.client.get(reverse('web:analysis_anomalies', args=[self.session.session_id]), params)
+
+    def test_pages_in_score_order(self):
+        page = query_results(self.path, page=2, page_size=2)
+
+        self.assertEqual(page['total'], 5)
+        self.assertEqual(page['pages'], 3)
+        self.assertEqual([row['Anomaly_Score'] for row in page['rows']], [0.5, 0.3])
+
+    def test_filters_and_sort(self):
+        page = query_results(self.path, sort='bytes', filters=[('method', 'eq', 'GET'), ('bytes', 'gte', '30')])
+
+        self.assertEqual([row['bytes'] for row in page['rows']], [30, 50])
+
+    def test_parse_filters_only_takes_result_columns_or_prefixed_keys(self):
+        params = {'page': '2', '_': '123', 'utm_source': 'mail', 'bytes__gt': '10', 'f_method': 'GET'}
+
+        filters = parse_filters(params, ['method', 'bytes', 'Anomaly_Score'])
+
+        self.assertEqual(sorted(filters), [('bytes', 'gt', '10'), ('method', 'eq', 'GET')])
+
+    def test_view_ignores_unrelated_query_parameters(self):
+        response = self.anomalies(_='1700000000000', utm_source='mail', method='GET', page_size=2)
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['total'], 3)
+        self.assertEqual(len(body['rows']), 2)
+
+    def test_view_rejects_explicit_filter_on_unknown_column(self):
+        response = self.anomalies(f_missing='1')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('missing', response.json()['error'])
+
+    def test_view_rejects_invalid_page(self):
+        self.assertEqual(self.anomalies(page='x').status_code, 400)
@@ -0,0 +1,67 @@
+# apps/web/tests/test_uploads.py
+
+import os
+import time
+
+from django.urls import reverse
+
+from apps.web.jobs import execute_job
+from apps.web.models import AnalysisSession
+from apps.web.storage import collect_garbage, ORPHAN_GRACE_SECONDS
+
+from .utils import MediaTestCase, log_csv, upload_file
+
+
+class UploadDedupTests(MediaTestCase):
+    def upload(self, content, name, **headers):
+        return self.client.post(
+            reverse('web:upload'), {'datafile': upload_file(content, name), 'backend': 'sklearn'}, **headers,
+        )
+
+    def analyse(self, content, name):
+        response = self.upload(content, name, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 202)
+        execute_job(response.json()['job_id'])
+        return AnalysisSession.objects.get(session_id=response.json()['session_id'])
+
+    def uploads(self):
+        directory = os.path.join(self.media_root, 'uploads')
+        return sorted(name for name in os.listdir(directory) if not name.startswith('.'))
+
+    def test_same_content_under_another_name_is_stored_once(self):
+        content = log_csv()
+        first = self.analyse(content, 'l.csv')
+
+        response = self.upload(content, 'l2.csv', HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['status'], 'reused')
+        self.assertIsNone(body['job_id'])
+        reused = AnalysisSession.objects.get(session_id=body['session_id'])
+        self.assertEqual(reused.original_filename, 'l2.csv')
+        self.assertEqual(reused.file_path, first.file_path)
+        self.assertEqual(self.uploads(), [os.path.basename(first.file_path)])
+
+    def test_reused_upload_redirects_browser_form(self):
+        content = log_csv(seed=1)
+        self.analyse(content, 'l.csv')
+
+        response = self.upload(content, 'l.csv')
+
+        self.assertRedirects(response, reverse('web:dashboard'), fetch_redirect_response=False)
+
+    def test_garbage_collection_removes_unreferenced_duplicate(self):
+        session = self.analyse(log_csv(seed=2), 'l.csv')
+        # 이전 형식 이름(<해시 앞 16자리>_<이름>)으로 남은 같은 내용의 사본
+        duplicate = os.path.join(self.media_root, 'uploads', f"{session.content_hash[:16]}_l2.csv")
+        with open(session.file_path, 'rb') as src, open(duplicate, 'wb') as dest:
+            dest.write(src.read())
+        old = time.time() - ORPHAN_GRACE_SECONDS - 60
+        os.utime(duplicate, (old, old))
+
+        report = collect_garbage()
+
+        self.assertIn((duplicate, os.path.getsize(session.file_path), 'duplicate'), report['removed'])
+        self.assertFalse(os.path.exists(duplicate))
+        self.assertTrue(os.path.exists(session.file_path))
@@ -0,0 +1,43 @@
+# apps/web/tests/utils.py
+
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+
+
+class MediaTestCase(TestCase):
+    """MEDIA_ROOT / 캐시 폴더를 임시 디렉터리로 바꿔 실행 (운영 파일을 건드리지 않는다)"""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(
+            MEDIA_ROOT=self.media_root,
+            ANOMALY_COLUMNAR_CACHE_DIR=f"{self.media_root}/cache/columnar",
+            ANOMALY_FEATURE_CACHE_DIR=f"{self.media_root}/cache/features",
+            ANOMALY_BACKEND='sklearn',
+            ANOMALY_N_JOBS=1,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+def log_csv(rows=300, seed=0):
+    """작은 합성 로그 CSV (첫 컬럼은 인덱스) 바이트"""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'bytes': rng.integers(100, 5_000, rows),
+        'latency': rng.normal(50, 10, rows).round(2),
+        'method': rng.choice(['GET', 'POST', 'PUT'], rows),
+        'path': rng.choice(['/', '/login', '/api', '/static'], rows),
+    })
+    return frame.to_csv().encode()
+
+
+def upload_file(content, name='logs.csv'):
+    return SimpleUploadedFile(name, content, content_type='text/csv')
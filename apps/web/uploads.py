@@ -0,0 +1,394 @@
+# apps/web/uploads.py
+
+import hashlib
+import logging
+import os
+import shutil
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .jobs import create_reused_session, enqueue_analysis, find_reusable_session
+from .models import AnalysisSession, ChunkedUpload
+from .profiling import StageProfiler
+from .storage import delete_unused_upload, touch
+
+logger = logging.getLogger(__name__)
+
+# 청크 요청 본문을 읽어 디스크에 쓰는 단위 (byte)
+COPY_BLOCK_SIZE = 1024 * 1024
+# 이어 붙이기 / 마무리 임대: 완료 요청이 기다리는 시간 / 응답 없이 이 시간이 지난 임대는 가져온다 (초)
+ASSEMBLE_WAIT_SECONDS = 30
+ASSEMBLE_STALE_SECONDS = 600
+ASSEMBLE_POLL_INTERVAL = 0.5
+# 이어 붙이기 진행 상황 (임대를 놓을 때 기록)
+ASSEMBLE_FIELDS = ['assembled_bytes', 'parsed_bytes', 'parsed_rows', 'parsed_segments', 'parse_error']
+
+
+def save_upload(file):
+    """
+    업로드 파일을 청크 단위로 저장하면서 SHA-256 계산
+    내용 해시를 파일명으로 저장하므로 같은 내용은 이름이 달라도 디스크에 한 번만 남는다 (원래 이름은 DB 에)
+    """
+    save_dir = os.path.join(settings.MEDIA_ROOT, "uploads")
+    os.makedirs(save_dir, exist_ok=True)
+
+    digest = hashlib.sha256()
+    tmp_path = os.path.join(save_dir, f".{uuid.uuid4().hex}.part")
+    with open(tmp_path, "wb") as dest:
+        for chunk in file.chunks():
+            digest.update(chunk)
+            dest.write(chunk)
+    content_hash = digest.hexdigest()
+    return store_upload(tmp_path, file.name, content_hash), content_hash
+
+
+def store_upload(tmp_path, file_name, content_hash):
+    """다 받은 임시 파일을 uploads/<내용 해시><확장자> 로 옮긴다 (같은 내용이 있으면 임시 파일만 삭제)"""
+    save_path = upload_path(content_hash, file_name)
+    if os.path.exists(save_path):
+        os.remove(tmp_path)
+        # 저장 공간 정리(LRU)에서 최근에 쓴 원본으로 보이도록
+        touch(save_path)
+    else:
+        os.replace(tmp_path, save_path)
+    return save_path
+
+
+def upload_path(content_hash, file_name):
+    """내용 해시 기반 업로드 저장 경로 (확장자만 원래 이름에서 - 파일 형식 판별용)"""
+    ext = os.path.splitext(file_name)[1].lower()
+    return os.path.join(settings.MEDIA_ROOT, "uploads", content_hash + ext)
+
+
+def get_fit_sample_params(streaming=False):
+    """
+    표본 학습 설정 (재사용 판정용 파라미터에 포함 - 표본이 다르면 결과도 다르다)
+    스트리밍 모드는 random 추출만 하므로 설정과 관계없이 random 으로 기록 (실제로 실행되는 설정과 맞춘다)
+    """
+    if not settings.ANOMALY_FIT_SAMPLE_SIZE:
+        return None
+    strategy = 'random' if streaming else settings.ANOMALY_SAMPLE_STRATEGY
+    return {
+        'size': settings.ANOMALY_FIT_SAMPLE_SIZE,
+        'strategy': strategy,
+        'stratify_col': settings.ANOMALY_STRATIFY_COLUMN if strategy == 'stratified' else None,
+        'seed': settings.ANOMALY_SAMPLE_SEED,
+    }
+
+
+def build_analysis_params(source, backend, file_size, detectors=None):
+    """업로드 옵션 + 서버 설정으로 분석 파라미터 구성 (결과 재사용 판정에도 쓰인다)"""
+    backend = backend or settings.ANOMALY_BACKEND
+    # 큰 파일은 청크 단위 스트리밍 모드 (메모리 사용량 제한)
+    chunksize = settings.ANOMALY_CHUNK_SIZE if file_size >= settings.ANOMALY_STREAMING_THRESHOLD else None
+    params = {
+        'artifact_session': source.session_id if source is not None else None,
+        'backend': None if source is not None else backend,
+        'chunksize': chunksize,
+        'sketch_threshold': None if source is not None else settings.ANOMALY_SKETCH_THRESHOLD,
+        'fit_sample': None if source is not None else get_fit_sample_params(streaming=chunksize is not None),
+    }
+    # 저장된 모델은 배치 추가로 바뀔 수 있으므로 사용할 리비전을 고정 (다른 리비전의 결과는 재사용하지 않는다)
+    if source is not None:
+        params['artifact_revision'] = source.artifact_revision
+    # 앙상블만 탐지기 목록을 남긴다 (다른 백엔드의 기존 세션과 재사용 판정이 그대로 맞도록)
+    if source is None and backend == 'ensemble':
+        params['detectors'] = list(detectors or settings.ANOMALY_ENSEMBLE_DETECTORS)
+    return params
+
+
+def register_upload(file_name, save_path, content_hash, analysis_params, profile):
+    """
+    저장된 업로드의 분석 등록. 반환값: (작업, 세션 ID)
+    같은 내용 + 같은 설정으로 분석한 세션이 있으면 결과를 재사용하고 작업은 None
+    """
+    session_id = str(uuid.uuid4())
+    reused = find_reusable_session(content_hash, analysis_params)
+    if reused is not None:
+        create_reused_session(session_id, file_name, content_hash, analysis_params, reused)
+        # 재사용 세션은 원본 세션의 파일을 쓴다 - 이번에 저장한 사본(확장자만 다른 경우 등)은 바로 삭제
+        if save_path != reused.file_path:
+            delete_unused_upload(save_path)
+        return None, session_id
+
+    job = enqueue_analysis(session_id, file_name, save_path, content_hash, analysis_params, profile)
+    logger.info("분석 작업 등록: %s", job.job_id)
+    return job, session_id
+
+
+def start_chunked_upload(cleaned_data):
+    """청크 업로드 시작 - 청크 크기는 서버가 정한다 (ANOMALY_UPLOAD_CHUNK_SIZE)"""
+    source = cleaned_data.get('artifact_session')
+    upload = ChunkedUpload.objects.create(
+        upload_id=str(uuid.uuid4()),
+        original_filename=cleaned_data['filename'],
+        total_size=cleaned_data['size'],
+        chunk_size=settings.ANOMALY_UPLOAD_CHUNK_SIZE,
+        sha256=cleaned_data['sha256'],
+        analysis_options={
+            'artifact_session': source.session_id if source is not None else None,
+            'backend': cleaned_data.get('backend') or None,
+            'detectors': cleaned_data.get('detectors') or None,
+        },
+    )
+    os.makedirs(chunked_upload_dir(upload), exist_ok=True)
+    return upload
+
+
+def receive_chunk(upload, index, stream, checksum):
+    """
+    청크 하나 저장 (같은 청크를 다시 보내도 된다)
+    본문 길이와 SHA-256(checksum)이 맞지 않으면 ValueError - 클라이언트는 그 청크만 다시 보낸다
+    검증된 청크는 앞 청크가 모두 있으면 바로 파일에 이어 붙이고 완성된 줄을 컬럼형으로 변환
+    """
+    if upload.status != ChunkedUpload.STATUS_UPLOADING:
+        raise ValueError("이미 완료되었거나 실패한 업로드입니다.")
+    length = upload.chunk_length(index)
+    if index in upload.received:
+        return upload
+
+    directory = chunked_upload_dir(upload)
+    tmp_path = os.path.join(directory, f".{index}.{uuid.uuid4().hex}.tmp")
+    digest = hashlib.sha256()
+    written = 0
+    with open(tmp_path, 'wb') as dest:
+        for block in iter(lambda: stream.read(COPY_BLOCK_SIZE), b''):
+            written += len(block)
+            if written > length:
+                break
+            digest.update(block)
+            dest.write(block)
+    if written != length or digest.hexdigest() != checksum.lower():
+        os.remove(tmp_path)
+        raise ValueError(f"청크 {index} 의 길이 또는 체크섬이 맞지 않습니다. 다시 보내주세요.")
+    os.replace(tmp_path, _part_path(directory, index))
+
+    # 받은 청크 기록만 짧은 트랜잭션으로
+    with transaction.atomic():
+        upload = ChunkedUpload.objects.select_for_update().get(pk=upload.pk)
+        if index not in upload.received:
+            upload.received = sorted(upload.received + [index])
+            upload.save(update_fields=['received', 'updated_at'])
+
+    # 이어 붙이기 / 변환은 임대를 잡은 요청 하나가 트랜잭션 밖에서 한다
+    # 못 잡으면 잡고 있는 요청이 임대를 놓은 뒤 다음 청크가 있는지 다시 보므로 이 청크도 붙는다
+    while True:
+        upload.refresh_from_db()
+        if not _next_part_ready(upload, directory):
+            break
+        claimed = _claim_assembly(upload)
+        if claimed is None:
+            break
+        try:
+            upload.refresh_from_db()
+            _assemble(upload, directory)
+        finally:
+            _release_assembly(upload, claimed)
+    return upload
+
+
+def complete_chunked_upload(upload):
+    """
+    모든 청크를 받은 업로드 마무리 (이미 완료됐으면 그대로 반환)
+    전체 SHA-256 확인 → 해시 기반 경로로 이동 → 받는 중 변환한 조각을 컬럼형 캐시로 합침 → 분석 등록
+    (캐시가 이미 있으므로 워커는 CSV 를 다시 파싱하지 않는다)
+    옮긴 뒤 등록이 실패했으면 다시 호출할 때 조립 / 체크섬을 건너뛰고 옮겨 둔 파일을 그대로 등록
+    짧은 트랜잭션으로 assembling 상태를 잡고, 해시 / 합치기는 트랜잭션 밖에서, 등록과 완료 기록을 다시 짧은 트랜잭션으로
+    다른 요청이 이어 붙이는 / 마무리하는 중이면 ASSEMBLE_WAIT_SECONDS 동안 기다리고, 그래도 안 끝나면
+    assembling(또는 uploading) 상태 그대로 반환 (호출한 쪽에서 나중에 다시 호출)
+    """
+    from .columnar import COLUMNAR_EXT, file_sha256, merge_columnar
+
+    upload.refresh_from_db()
+    if upload.status == ChunkedUpload.STATUS_COMPLETE:
+        return upload
+    if upload.status == ChunkedUpload.STATUS_FAILED:
+        raise ValueError(upload.error)
+    missing = upload.missing_chunks()
+    if missing:
+        raise ValueError(f"받지 못한 청크가 있습니다: {missing[:20]}")
+
+    claimed = _claim_assembly(upload, wait=ASSEMBLE_WAIT_SECONDS, status=ChunkedUpload.STATUS_ASSEMBLING)
+    upload.refresh_from_db()
+    if claimed is None:
+        if upload.status == ChunkedUpload.STATUS_FAILED:
+            raise ValueError(upload.error)
+        return upload
+
+    directory = chunked_upload_dir(upload)
+    profiler = StageProfiler()
+    try:
+        with profiler.stage('assemble_upload', rows=upload.parsed_rows) as stage:
+            if _already_stored(upload, directory):
+                # 이전 요청이 체크섬 확인 후 해시 경로로 옮겼지만 등록 전에 실패함 - 옮긴 파일을 그대로 등록
+                content_hash = upload.sha256
+                save_path = upload_path(content_hash, upload.original_filename)
+                touch(save_path)
+            else:
+                # 이어 붙이던 요청이 중단됐으면 남은 청크부터 붙인다
+                _assemble(upload, directory)
+                _parse_received(upload, directory, final=True)
+                content_hash = file_sha256(_data_path(directory))
+                if content_hash != upload.sha256:
+                    upload.error = "파일 체크섬이 일치하지 않습니다. 처음부터 다시 업로드해주세요."
+                    _release_assembly(upload, claimed, status=ChunkedUpload.STATUS_FAILED, error=upload.error)
+                    shutil.rmtree(directory, ignore_errors=True)
+                    # 실패 상태를 남기고 반환 (호출한 쪽에서 오류로 응답)
+                    upload.refresh_from_db()
+                    return upload
+                save_path = store_upload(_data_path(directory), upload.original_filename, content_hash)
+            stage['rows'] = upload.parsed_rows
+            cache_path = os.path.join(settings.ANOMALY_COLUMNAR_CACHE_DIR, content_hash + COLUMNAR_EXT)
+            if not upload.parse_error and upload.parsed_segments and not os.path.exists(cache_path):
+                os.makedirs(settings.ANOMALY_COLUMNAR_CACHE_DIR, exist_ok=True)
+                merge_columnar(
+                    [_segment_path(directory, i) for i in range(upload.parsed_segments)],
+                    cache_path,
+                )
+
+        options = upload.analysis_options
+        source = None
+        if options.get('artifact_session'):
+            source = AnalysisSession.objects.get(session_id=options['artifact_session'])
+        analysis_params = build_analysis_params(
+            source, options.get('backend'), upload.total_size, options.get('detectors'),
+        )
+        with transaction.atomic():
+            job, session_id = register_upload(
+                upload.original_filename, save_path, content_hash, analysis_params, profiler.stages,
+            )
+            if not _release_assembly(
+                upload, claimed, status=ChunkedUpload.STATUS_COMPLETE, content_hash=content_hash,
+                session_id=session_id, job_id=job.job_id if job is not None else '',
+            ):
+                raise ValueError("다른 요청이 업로드를 마무리했습니다.")
+    except Exception:
+        # 다시 완료를 호출할 수 있도록 받는 중 상태로 되돌린다
+        _release_assembly(upload, claimed, status=ChunkedUpload.STATUS_UPLOADING)
+        raise
+
+    shutil.rmtree(directory, ignore_errors=True)
+    upload.refresh_from_db()
+    return upload
+
+
+def chunked_upload_dir(upload):
+    return os.path.join(settings.MEDIA_ROOT, "uploads", "chunked", upload.upload_id)
+
+
+def _claim_assembly(upload, wait=0, **changes):
+    """
+    업로드의 이어 붙이기 / 마무리 임대(assembling_at)를 잡는다 - 짧은 UPDATE 한 번
+    ASSEMBLE_STALE_SECONDS 가 지난 임대는 중단된 요청으로 보고 가져온다. changes 는 잡으면서 같이 바꿀 필드
+    반환값: 잡은 시각 (놓을 때 조건으로 쓴다) 또는 None (wait 초 동안 못 잡음)
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        now = timezone.now()
+        free = Q(assembling_at__isnull=True) | Q(assembling_at__lt=now - timedelta(seconds=ASSEMBLE_STALE_SECONDS))
+        claimable = ChunkedUpload.objects.filter(
+            free, pk=upload.pk,
+            status__in=[ChunkedUpload.STATUS_UPLOADING, ChunkedUpload.STATUS_ASSEMBLING],
+        )
+        if claimable.update(assembling_at=now, updated_at=now, **changes):
+            return now
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(ASSEMBLE_POLL_INTERVAL)
+
+
+def _release_assembly(upload, claimed, **changes):
+    """이어 붙인 진행 상황을 기록하고 임대를 놓는다 (그 사이 임대를 뺏겼으면 기록하지 않고 False)"""
+    progress = {field: getattr(upload, field) for field in ASSEMBLE_FIELDS}
+    return bool(ChunkedUpload.objects.filter(pk=upload.pk, assembling_at=claimed).update(
+        assembling_at=None, updated_at=timezone.now(), **progress, **changes,
+    ))
+
+
+def _already_stored(upload, directory):
+    """다 붙인 data.csv 가 체크섬 확인 후 이미 해시 경로로 옮겨졌는지 (그 뒤 등록이 실패한 재시도)"""
+    return (
+        upload.assembled_bytes >= upload.total_size
+        and not os.path.exists(_data_path(directory))
+        and os.path.exists(upload_path(upload.sha256, upload.original_filename))
+    )
+
+
+def _next_part_ready(upload, directory):
+    """앞에서부터 이어 붙일 다음 청크가 도착해 있는지"""
+    if upload.status != ChunkedUpload.STATUS_UPLOADING or upload.assembled_bytes >= upload.total_size:
+        return False
+    return os.path.exists(_part_path(directory, upload.assembled_bytes // upload.chunk_size))
+
+
+def _assemble(upload, directory):
+    """앞에서부터 이어지는 청크를 파일 끝에 붙이고 (붙인 청크 파일은 삭제) 완성된 줄을 변환"""
+    with open(_data_path(directory), 'ab') as data:
+        # 이전 요청이 붙이다 중단됐으면 DB 에 기록된 길이까지 되돌린다
+        data.truncate(upload.assembled_bytes)
+        while upload.assembled_bytes < upload.total_size:
+            part_path = _part_path(directory, upload.assembled_bytes // upload.chunk_size)
+            if not os.path.exists(part_path):
+                break
+            with open(part_path, 'rb') as part:
+                shutil.copyfileobj(part, data, COPY_BLOCK_SIZE)
+            data.flush()
+            upload.assembled_bytes += os.path.getsize(part_path)
+            os.remove(part_path)
+            _parse_received(upload, directory)
+
+
+def _parse_received(upload, directory, final=False):
+    """
+    붙여 둔 데이터 중 아직 변환하지 않은 완성된 줄을 Arrow 조각 하나로 변환
+    final 이면 줄바꿈 없이 끝나는 마지막 줄까지. 변환할 수 없는 내용이면 parse_error 를 남기고
+    이후 조각 변환은 멈춘다 (완료 후 워커가 ensure_columnar 로 한 번에 변환)
+    """
+    if upload.parse_error:
+        return
+    with open(_data_path(directory), 'rb') as data:
+        header = data.readline()
+        if not header.endswith(b'\n'):
+            return
+        start = max(upload.parsed_bytes, len(header))
+        data.seek(start)
+        block = data.read(upload.assembled_bytes - start)
+    end = len(block) if final else block.rfind(b'\n') + 1
+    if end <= 0 or not block[:end].strip():
+        return
+    block = block[:end]
+    # 따옴표 안의 줄바꿈은 줄 단위로 자를 수 없다
+    if b'"' in block:
+        upload.parse_error = "따옴표가 있는 CSV 는 업로드 완료 후 한 번에 변환합니다."
+        return
+
+    import pyarrow as pa
+    from .columnar import parse_csv_block, read_columnar_schema, write_columnar
+    schema = read_columnar_schema(_segment_path(directory, 0)) if upload.parsed_segments else None
+    try:
+        table = parse_csv_block(header, block, schema)
+    except (pa.ArrowInvalid, ValueError) as e:
+        upload.parse_error = str(e)
+        return
+    write_columnar(table, _segment_path(directory, upload.parsed_segments))
+    upload.parsed_segments += 1
+    upload.parsed_rows += table.num_rows
+    upload.parsed_bytes = start + end
+
+
+def _data_path(directory):
+    return os.path.join(directory, "data.csv")
+
+
+def _part_path(directory, index):
+    return os.path.join(directory, f"{index}.part")
+
+
+def _segment_path(directory, index):
+    return os.path.join(directory, f"segment-{index:05d}.arrow")
@@ -20,4 +20,15 @@ urlpatterns = [
     path("api/analysis/detail/<str:session_id>/", views.get_analysis_detail, name="analysis_detail"),
     path("api/analysis/delete/<str:session_id>/", views.delete_analysis_session, name="analysis_delete"),
     path("api/analysis/rename/<str:session_id>/", views.rename_analysis_session, name="analysis_rename"),
+    path("api/analysis/<str:session_id>/anomalies/", views.get_analysis_anomalies, name="analysis_anomalies"),
+    path("api/analysis/<str:session_id>/export/", views.export_analysis, name="analysis_export"),
+    path("api/analysis/append/<str:session_id>/", views.append_analysis_batch, name="analysis_append"),
+    path("api/upload/", views.upload_async_view, name="upload_async"),
+    path("api/uploads/", views.start_chunked_upload_view, name="chunked_upload_start"),
+    path("api/uploads/<str:upload_id>/", views.get_chunked_upload, name="chunked_upload"),
+    path("api/uploads/<str:upload_id>/chunks/<int:index>/", views.upload_chunk, name="chunked_upload_chunk"),
+    path("api/uploads/<str:upload_id>/complete/", views.complete_chunked_upload_view, name="chunked_upload_complete"),
+    path("upload/<str:job_id>/progress/", views.job_progress_view, name="job_progress"),
+    path("api/jobs/<str:job_id>/", views.get_job_status, name="job_status"),
+    path("api/jobs/<str:job_id>/events/", views.stream_job_events, name="job_events"),
 ]
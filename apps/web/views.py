@@ -1,23 +1,87 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render, get_object_or_404, redirect
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
-from .forms import UploadFileForm
-from .models import AnalysisSession
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
+from .forms import ChunkedUploadForm, UploadFileForm
+from .models import AnalysisJob, AnalysisSession, ChunkedUpload
+from .profiling import StageProfiler
+from .progress import format_sse
+from .storage import delete_session_files
+from .uploads import (
+    build_analysis_params, complete_chunked_upload, receive_chunk, register_upload, save_upload,
+    start_chunked_upload,
+)
+import asyncio
+import base64
+import hashlib
 import uuid
 import json
 import os
+import re
+import shutil
+import time
+from datetime import datetime, timedelta
 from django.conf import settings
 
+# 작업 진행 이벤트 스트림: DB 확인 간격 / keepalive 간격 / 한 연결의 최대 유지 시간 (초)
+JOB_EVENTS_POLL_INTERVAL = 0.5
+JOB_EVENTS_KEEPALIVE = 15
+JOB_EVENTS_TIMEOUT = 300
+# 배치 추가 임대: 다른 요청이 반영 중이면 기다리는 시간 / 응답 없이 이 시간이 지난 임대는 가져온다
+APPEND_WAIT_SECONDS = 60
+APPEND_STALE_SECONDS = 600
+APPEND_POLL_INTERVAL = 0.5
+# 분석 히스토리 한 번에 반환하는 세션 수 (기본 / 최대)
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+
 def dashboard_view(request):
     return render(request, 'web/dashboard.html')
 
 
+@require_http_methods(["GET"])
 def get_analysis_history(request):
-    """분석 히스토리 목록 반환"""
+    """
+    분석 히스토리 목록 반환 (목록에 필요한 컬럼만 읽고 커서 단위로 나눠서)
+    쿼리: cursor (이전 응답의 next_cursor), limit (기본 HISTORY_PAGE_SIZE)
+    히스토리가 바뀌지 않았으면 ETag / Last-Modified 로 304 응답
+    """
     try:
-        sessions = AnalysisSession.objects.all().order_by('-created_at')
-        
+        try:
+            limit = min(max(int(request.GET.get('limit', HISTORY_PAGE_SIZE)), 1), HISTORY_MAX_PAGE_SIZE)
+            cursor = decode_history_cursor(request.GET.get('cursor'))
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+        # 세션 수 + 마지막 변경 시각으로 히스토리 전체의 버전을 정한다 (추가 / 이름 변경 / 삭제 모두 반영)
+        stamp = AnalysisSession.objects.aggregate(total=Count('id'), last_modified=Max('updated_at'))
+        last_modified = stamp['last_modified']
+        etag = quote_etag(hashlib.md5(
+            f"{stamp['total']}:{last_modified.isoformat() if last_modified else ''}:"
+            f"{request.GET.get('cursor', '')}:{limit}".encode()
+        ).hexdigest())
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        sessions = AnalysisSession.objects.only(
+            'id', 'session_id', 'original_filename', 'file_type', 'created_at',
+        ).order_by('-created_at', '-id')
+        if cursor is not None:
+            created_at, pk = cursor
+            sessions = sessions.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+        sessions = list(sessions[:limit + 1])
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
+
         # JSON 형태로 변환
         history_data = []
         for session in sessions:
@@ -29,13 +93,20 @@ def get_analysis_history(request):
                 'file_type': session.file_type,
                 'created_at': session.created_at.strftime('%Y-%m-%d %H:%M'),
             })
-        
-        return JsonResponse({
+
+        response = JsonResponse({
             'success': True,
             'history': history_data,
-            'total': len(history_data)
+            'total': stamp['total'],
+            'next_cursor': encode_history_cursor(sessions[-1]) if has_more else None,
         })
-        
+        response.headers['ETag'] = etag
+        if last_modified is not None:
+            response.headers['Last-Modified'] = http_date(last_modified)
+        # 브라우저가 캐시를 쓰기 전에 항상 재검증 (바뀌지 않았으면 304)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
     except Exception as e:
         return JsonResponse({
             'success': False,
@@ -43,11 +114,39 @@ def get_analysis_history(request):
         }, status=500)
 
 
+def encode_history_cursor(session):
+    """히스토리 페이지의 마지막 세션 위치 (created_at, id) → 커서 문자열"""
+    raw = f"{session.created_at.isoformat()}|{session.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_history_cursor(cursor):
+    """커서 문자열 → (created_at, id). 비어 있으면 None, 잘못된 커서는 ValueError"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split('|')
+        created_at = datetime.fromisoformat(created_at)
+        return created_at, int(pk)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("잘못된 cursor 입니다.") from e
+
+
 @require_http_methods(["GET"])
 def get_analysis_detail(request, session_id):
-    """특정 분석 결과 상세 정보 반환"""
+    """특정 분석 결과 상세 정보 반환 (?top=N 이면 점수 상위 N 개 이상치 행 포함)"""
     try:
         session = get_object_or_404(AnalysisSession, session_id=session_id)
+
+        top_anomalies = None
+        if request.GET.get('top') and session.has_results():
+            from .results import MAX_PAGE_SIZE, query_results
+            try:
+                top = min(int(request.GET['top']), MAX_PAGE_SIZE)
+            except ValueError:
+                return JsonResponse({'success': False, 'error': 'top 은 정수여야 합니다.'}, status=400)
+            top_anomalies = query_results(session.results_path, page_size=top, top=top)['rows']
         
         return JsonResponse({
             'success': True,
@@ -58,6 +157,15 @@ def get_analysis_detail(request, session_id):
                 'file_type': session.file_type,
                 'created_at': session.created_at.strftime('%Y-%m-%d %H:%M:%S'),
                 'analysis_result': session.analysis_result,
+                'has_artifact': session.has_artifact(),
+                'source_session': session.source_session.session_id if session.source_session else None,
+                'artifact_source': session.artifact_source.session_id if session.artifact_source else None,
+                'profile': session.analysis_result.get('profile') if isinstance(session.analysis_result, dict) else None,
+                # 이상치 행은 응답에 넣지 않고 페이지 단위로 조회
+                'anomalies_url': reverse('web:analysis_anomalies', args=[session.session_id]) if session.has_results() else None,
+                'top_anomalies': top_anomalies,
+                'export_url': reverse('web:analysis_export', args=[session.session_id]),
+                'can_export_all': export_artifact_path(session) is not None,
             }
         })
         
@@ -68,6 +176,219 @@ def get_analysis_detail(request, session_id):
         }, status=500)
 
 
+@require_http_methods(["GET"])
+def get_analysis_anomalies(request, session_id):
+    """
+    분석 세션의 이상치 행을 페이지 단위로 반환
+    쿼리: page, page_size, sort (기본 -Anomaly_Score, '-' 는 내림차순),
+          top (점수 상위 N 행만 - 필터 적용 후),
+          결과 컬럼 이름인 키는 컬럼 필터 (<컬럼>=값, <컬럼>__gte=값, __gt / __lte / __lt)
+          f_<컬럼>__<연산자> 는 명시적 필터 (없는 컬럼이면 400), 그 밖의 키(_ 캐시 버스터, utm_* 등)는 무시
+    """
+    try:
+        session = get_object_or_404(AnalysisSession, session_id=session_id)
+        if not session.has_results():
+            return JsonResponse({'success': False, 'error': '결과 파일이 없는 분석입니다.'}, status=404)
+
+        from .results import DEFAULT_PAGE_SIZE, DEFAULT_SORT, parse_filters, query_results, result_columns
+        params = request.GET.dict()
+        try:
+            page = query_results(
+                session.results_path,
+                page=params.get('page', 1),
+                page_size=params.get('page_size', DEFAULT_PAGE_SIZE),
+                sort=params.get('sort') or DEFAULT_SORT,
+                filters=parse_filters(params, result_columns(session.results_path)),
+                top=params.get('top'),
+            )
+        except (ValueError, TypeError) as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+        return JsonResponse({'success': True, **page})
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+@require_http_methods(["GET"])
+def export_analysis(request, session_id):
+    """
+    분석 결과를 파일로 내보내기 (배치 단위로 만들어 보내는 스트리밍 응답)
+    쿼리: format (csv / csv.gz / parquet, 기본 csv),
+          rows (anomalies = 결과 파일의 이상치 행, all = 저장된 모델로 전체 행을 다시 점수 계산)
+    """
+    try:
+        session = get_object_or_404(AnalysisSession, session_id=session_id)
+
+        from .exports import EXPORT_FORMATS, EXPORT_ROWS, export_stream, result_batches, scored_batches
+        export_format = request.GET.get('format', 'csv')
+        rows = request.GET.get('rows', 'anomalies')
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({'success': False, 'error': f"format 은 {', '.join(EXPORT_FORMATS)} 중 하나여야 합니다."}, status=400)
+        if rows not in EXPORT_ROWS:
+            return JsonResponse({'success': False, 'error': f"rows 는 {', '.join(EXPORT_ROWS)} 중 하나여야 합니다."}, status=400)
+
+        if rows == 'anomalies':
+            if not session.has_results() or not os.path.exists(session.results_path):
+                return JsonResponse({'success': False, 'error': '결과 파일이 없는 분석입니다.'}, status=404)
+            batches = result_batches(session.results_path)
+        else:
+            artifact_path = export_artifact_path(session)
+            if artifact_path is None:
+                return JsonResponse({'success': False, 'error': '학습된 모델이 없는 분석은 전체 행을 내보낼 수 없습니다.'}, status=400)
+            # 컬럼형 캐시가 있으면 CSV 를 다시 파싱하지 않는다
+            from .storage import columnar_cache_path
+            paths = [columnar_cache_path(session.content_hash)] if session.content_hash else []
+            source_path = next((path for path in paths + [session.file_path] if path and os.path.exists(path)), None)
+            if source_path is None:
+                return JsonResponse({'success': False, 'error': '원본 파일이 정리되어 전체 행을 내보낼 수 없습니다.'}, status=410)
+            batches = scored_batches(source_path, artifact_path)
+
+        content_type, ext = EXPORT_FORMATS[export_format]
+        response = StreamingHttpResponse(export_stream(batches, export_format), content_type=content_type)
+        filename = f"{os.path.splitext(session.original_filename)[0]}-{rows}{ext}"
+        response.headers['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+def export_artifact_path(session):
+    """전체 행 점수 계산에 쓸 아티팩트 (직접 학습한 모델 → 점수 계산에 쓴 모델 → 결과를 재사용한 원본 세션의 모델)"""
+    candidates = [session, session.artifact_source, session.source_session]
+    if session.source_session is not None:
+        candidates.append(session.source_session.artifact_source)
+    for candidate in candidates:
+        if candidate is not None and candidate.artifact_path:
+            # 세션 결과를 만든 리비전 (이후 배치 추가로 바뀐 모델이 아니라)
+            path = candidate.artifact_path_for(session.artifact_revision)
+            return path if os.path.exists(path) else None
+    return None
+
+
+@require_http_methods(["GET"])
+def get_job_status(request, job_id):
+    """업로드 분석 작업 상태 반환 (완료되면 분석 세션 ID 포함)"""
+    try:
+        job = get_object_or_404(AnalysisJob, job_id=job_id)
+        queue_position = None
+        if job.status == AnalysisJob.STATUS_QUEUED:
+            queue_position = AnalysisJob.objects.filter(
+                status=AnalysisJob.STATUS_QUEUED, created_at__lt=job.created_at,
+            ).count() + 1
+
+        return JsonResponse({
+            'success': True,
+            'job': {
+                'job_id': job.job_id,
+                'status': job.status,
+                'filename': job.original_filename,
+                'attempts': job.attempts,
+                'queue_position': queue_position,
+                'error': job.error,
+                'session_id': job.result_session.session_id if job.result_session else None,
+                'progress': job.progress,
+                'created_at': job.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'started_at': job.started_at.strftime('%Y-%m-%d %H:%M:%S') if job.started_at else None,
+                'finished_at': job.finished_at.strftime('%Y-%m-%d %H:%M:%S') if job.finished_at else None,
+            }
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+@require_http_methods(["GET"])
+def stream_job_events(request, job_id):
+    """
+    작업 진행 상황을 Server-Sent Events 로 전송
+    클라이언트가 주기적으로 상태 API 를 호출하는 대신, 서버가 진행 상황이 바뀔 때만 보낸다
+    ASGI 에서는 비동기 generator 로 보내 연결이 열려 있는 동안 스레드를 점유하지 않는다
+    WSGI 에서는 현재 상태만 보내고 닫는다 (EventSource 가 retry 간격 뒤 다시 연결 - 요청마다 워커를 붙잡지 않도록)
+    """
+    get_object_or_404(AnalysisJob, job_id=job_id)
+    events = _job_events_async(job_id) if isinstance(request, ASGIRequest) else _job_events(job_id)
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # nginx 등 프록시가 이벤트를 모아두지 않도록
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _job_events(job_id):
+    for message in _job_event_steps(job_id):
+        if message is None:
+            return
+        yield message
+
+
+async def _job_events_async(job_id):
+    steps = _job_event_steps(job_id)
+    # DB 조회가 들어 있는 한 단계씩만 동기 스레드에서 진행하고 대기는 이벤트 루프에서
+    next_step, end = sync_to_async(next), object()
+    while True:
+        message = await next_step(steps, end)
+        if message is end:
+            return
+        if message is None:
+            await asyncio.sleep(JOB_EVENTS_POLL_INTERVAL)
+        else:
+            yield message
+
+
+def _job_event_steps(job_id):
+    """SSE 메시지를 차례로 반환 (None 은 다음 DB 확인까지 JOB_EVENTS_POLL_INTERVAL 만큼 대기)"""
+    yield "retry: 2000\n\n"
+    deadline = time.monotonic() + JOB_EVENTS_TIMEOUT
+    last_state, last_sent = None, time.monotonic()
+    while time.monotonic() < deadline:
+        job = AnalysisJob.objects.filter(job_id=job_id).values(
+            'status', 'progress', 'error', 'result_session__session_id',
+        ).first()
+        if job is None:
+            return
+        data = {
+            'status': job['status'],
+            'progress': job['progress'],
+            'error': job['error'],
+            'session_id': job['result_session__session_id'],
+        }
+        state = (job['status'], job['progress'].get('seq'))
+        if state != last_state:
+            last_state, last_sent = state, time.monotonic()
+            yield format_sse('progress', data, event_id=job['progress'].get('seq'))
+        elif time.monotonic() - last_sent > JOB_EVENTS_KEEPALIVE:
+            # 변화가 없어도 연결이 끊기지 않도록 주석 한 줄
+            last_sent = time.monotonic()
+            yield ": keepalive\n\n"
+        if job['status'] in (AnalysisJob.STATUS_DONE, AnalysisJob.STATUS_FAILED):
+            yield format_sse('done', data)
+            return
+        yield None
+    # 제한 시간이 지나면 스트림을 닫는다 (EventSource 가 retry 후 자동으로 다시 연결)
+
+
+def job_progress_view(request, job_id):
+    """업로드 분석 작업 진행 화면"""
+    job = get_object_or_404(AnalysisJob, job_id=job_id)
+    return render(request, 'web/progress.html', {
+        'job': job,
+        'events_url': reverse('web:job_events', args=[job.job_id]),
+        'status_url': reverse('web:job_status', args=[job.job_id]),
+        'details_url': reverse('web:dashboard'),
+    })
+
+
 def create_analysis_session(filename, file_path, file_type, analysis_result):
     """새로운 분석 세션 생성 (완료된 분석 결과와 함께)"""
     session_id = str(uuid.uuid4())
@@ -91,6 +412,8 @@ def delete_analysis_session(request, session_id):
     try:
         session = get_object_or_404(AnalysisSession, session_id=session_id)
         session.delete()
+        # 다른 세션이 같이 쓰지 않는 결과 / 아티팩트 / 업로드 파일도 삭제
+        delete_session_files(session)
         
         return JsonResponse({'success': True, 'message': '분석 기록이 삭제되었습니다.'})
         
@@ -128,6 +451,140 @@ def rename_analysis_session(request, session_id):
         }, status=500)
 
 
+@csrf_exempt
+@require_http_methods(["POST"])
+def append_analysis_batch(request, session_id):
+    """
+    기존 분석 세션에 새 로그 배치(CSV)를 증분 추가하고 새 행만 점수 계산
+    아티팩트 / 결과 파일은 새 리비전 경로에 쓰고 (이전 리비전을 쓰는 점수 계산 세션 / 작업은 그대로 둔다)
+    학습과 파일 작업은 트랜잭션 밖에서 하고 세션 갱신만 짧은 비교-교체(CAS)로 반영
+    """
+    try:
+        session = get_object_or_404(AnalysisSession, session_id=session_id)
+        if not session.has_artifact():
+            return JsonResponse({'success': False, 'error': '학습된 모델이 없는 분석에는 배치를 추가할 수 없습니다.'}, status=400)
+
+        form = UploadFileForm(request.POST, request.FILES)
+        if not form.is_valid():
+            return JsonResponse({'success': False, 'error': form.errors.get('datafile', form.errors)}, status=400)
+        batch_path, batch_hash = save_upload(form.cleaned_data['datafile'])
+
+        claimed_at = claim_append(session)
+        if claimed_at is None:
+            return JsonResponse({'success': False, 'error': '다른 배치를 반영하는 중입니다. 잠시 후 다시 시도해주세요.'}, status=409)
+        try:
+            return apply_batch(session, claimed_at, batch_path, batch_hash)
+        finally:
+            AnalysisSession.objects.filter(pk=session.pk, append_started_at=claimed_at).update(append_started_at=None)
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+def claim_append(session):
+    """
+    세션의 배치 추가 임대(append_started_at)를 잡는다 - 짧은 UPDATE 한 번이라 쓰기 잠금을 오래 잡지 않는다
+    다른 요청이 잡고 있으면 APPEND_WAIT_SECONDS 동안 기다리고, APPEND_STALE_SECONDS 가 지난 임대는 죽은 요청으로 보고 가져온다
+    반환값: 잡은 시각 (CAS 조건으로 쓴다) 또는 None
+    """
+    deadline = time.monotonic() + APPEND_WAIT_SECONDS
+    while True:
+        now = timezone.now()
+        free = Q(append_started_at__isnull=True) | Q(append_started_at__lt=now - timedelta(seconds=APPEND_STALE_SECONDS))
+        if AnalysisSession.objects.filter(free, pk=session.pk).update(append_started_at=now):
+            return now
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(APPEND_POLL_INTERVAL)
+
+
+def apply_batch(session, claimed_at, batch_path, batch_hash):
+    """임대를 잡은 상태에서 새 리비전 아티팩트 / 결과 파일을 만들고 CAS 로 세션에 반영"""
+    from .ai_script import append_batch, merge_results
+    from .storage import delete_replaced_files
+
+    session.refresh_from_db()
+    old_revision, old_results = session.artifact_revision, session.results_path
+    revision = old_revision + 1
+    artifact_path = session.artifact_path_for(revision)
+    results_path = copy_results_file(session) if session.has_results() else session.results_path
+    try:
+        batch_result = append_batch(
+            batch_path, session.artifact_path,
+            window_size=settings.ANOMALY_WINDOW_SIZE, n_jobs=settings.ANOMALY_N_JOBS,
+            results_path=results_path or None, save_artifact_to=artifact_path,
+        )
+        analysis_result = merge_results(session.analysis_result, batch_result)
+        # 내용이 바뀌었으므로 같은 파일 재업로드 시 결과 재사용 대상에서 빠지도록 기록
+        analysis_params = {
+            **session.analysis_params,
+            'appended': session.analysis_params.get('appended', []) + [batch_hash],
+        }
+        updated = AnalysisSession.objects.filter(
+            pk=session.pk, artifact_revision=old_revision, append_started_at=claimed_at,
+        ).update(
+            artifact_path=artifact_path, artifact_revision=revision, results_path=results_path,
+            analysis_result=analysis_result, analysis_params=analysis_params,
+            append_started_at=None, updated_at=timezone.now(),
+        )
+    except Exception:
+        discard_files(artifact_path, results_path if results_path != old_results else None)
+        raise
+    if not updated:
+        # 임대가 만료되어 다른 요청이 먼저 반영함 - 이 요청의 결과는 버린다
+        discard_files(artifact_path, results_path if results_path != old_results else None)
+        return JsonResponse({'success': False, 'error': '다른 배치가 먼저 반영되었습니다. 다시 시도해주세요.'}, status=409)
+
+    session.refresh_from_db()
+    delete_replaced_files(session, old_revision, old_results if old_results != results_path else None)
+    return JsonResponse({
+        'success': True,
+        'batch': {
+            'anomaly_count': batch_result['anomaly_count'],
+            'total': batch_result['total'],
+        },
+        'summary': analysis_result['summary'],
+        'artifact_revision': revision,
+    })
+
+
+def job_accepted_response(job, session_id):
+    """작업 등록 응답 (202) - 진행 상황은 events_url 로 받는다"""
+    return JsonResponse({
+        'success': True,
+        'job_id': job.job_id,
+        'session_id': session_id,
+        'status': job.status,
+        'events_url': reverse('web:job_events', args=[job.job_id]),
+    }, status=202)
+
+
+def reused_response(session_id):
+    """같은 내용 + 같은 설정의 결과를 재사용해 작업 없이 끝난 업로드 응답"""
+    return JsonResponse({'success': True, 'job_id': None, 'session_id': session_id, 'status': 'reused'})
+
+
+def copy_results_file(session):
+    """
+    결과 파일 복사본 경로 (copy-on-write) - 배치 추가는 복사본에 쓰고 CAS 가 성공하면 세션이 복사본을 가리킨다
+    결과를 재사용한 세션이나 export 중인 요청은 이전 파일을 계속 읽는다
+    """
+    root, ext = os.path.splitext(session.results_path)
+    root = re.sub(r'-r[0-9a-f]{8}$', '', root)
+    path = f"{root}-r{uuid.uuid4().hex[:8]}{ext}"
+    shutil.copyfile(session.results_path, path)
+    return path
+
+
+def discard_files(*paths):
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
 @require_http_methods(["GET", "POST"])
 def upload_view(request):
     if request.method == "POST":
@@ -135,30 +592,26 @@ def upload_view(request):
         if form.is_valid():
             file = form.cleaned_data['datafile']
             try:
-                # 파일 저장
-                save_dir = os.path.join(settings.MEDIA_ROOT, "uploads")
-                os.makedirs(save_dir, exist_ok=True)
-                save_path = os.path.join(save_dir, file.name)
-                with open(save_path, "wb+") as dest:
-                    for chunk in file.chunks():
-                        dest.write(chunk)
+                # 단계별 소요 시간 / 메모리 기록 (analysis_result["profile"] 로 저장)
+                profiler = StageProfiler()
+
+                # 파일 저장 (저장하면서 내용 해시 계산)
+                with profiler.stage('save_upload'):
+                    save_path, content_hash = save_upload(file)
                 print(f"파일 저장 완료: {save_path}")
 
-                # 이상 탐지
-                from .ai_script import detect_anomalies
-                analysis_result = detect_anomalies(save_path)
-                print(f"분석 결과: {analysis_result}")
-
-                # DB 저장
-                AnalysisSession.objects.create(
-                    session_id=str(uuid.uuid4()),
-                    original_filename=file.name,
-                    file_path=save_path,
-                    file_type=os.path.splitext(file.name)[-1][1:].upper(),
-                    analysis_result=analysis_result,
+                # 분석은 워커(run_analysis_worker)가 실행 - 요청은 작업 등록 후 바로 응답
+                analysis_params = build_analysis_params(
+                    form.cleaned_data.get('artifact_session'), form.cleaned_data.get('backend'), file.size,
+                    form.cleaned_data.get('detectors'),
                 )
-                print("DB 저장 완료")
-                return redirect("dashboard")
+                job, session_id = register_upload(file.name, save_path, content_hash, analysis_params, profiler.stages)
+                wants_json = 'application/json' in request.headers.get('Accept', '')
+                if job is None:
+                    return reused_response(session_id) if wants_json else redirect("web:dashboard")
+                if wants_json:
+                    return job_accepted_response(job, session_id)
+                return redirect("web:job_progress", job_id=job.job_id)
             except Exception as e:
                 print(f"업로드 중 오류: {e}")
                 return render(request, "web/upload.html", {"form": form, "error": str(e)})
@@ -166,4 +619,152 @@ def upload_view(request):
             print("폼이 유효하지 않음:", form.errors)
     else:
         form = UploadFileForm()
-    return render(request, "web/upload.html", {"form": form})
\ No newline at end of file
+    return render(request, "web/upload.html", {"form": form})
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def upload_async_view(request):
+    """
+    ASGI 배포용 비동기 업로드 API (응답은 upload_view 의 JSON 응답과 같다)
+    본문 파싱(임시 파일 기록)과 저장/해시는 스레드에서, 분석은 프로세스 풀(executor)에서 실행해
+    이벤트 루프가 막히지 않으므로 한 서버 프로세스가 분석 중에도 다른 업로드를 계속 받는다
+    """
+    try:
+        # multipart 파싱 - 큰 파일은 업로드 핸들러가 임시 파일로 쓰는 블로킹 작업
+        await asyncio.to_thread(lambda: request.FILES)
+        form = UploadFileForm(request.POST, request.FILES)
+        if not await sync_to_async(form.is_valid)():
+            return JsonResponse({'success': False, 'error': form.errors.get('datafile', form.errors)}, status=400)
+        file = form.cleaned_data['datafile']
+
+        profiler = StageProfiler()
+        with profiler.stage('save_upload'):
+            save_path, content_hash = await asyncio.to_thread(save_upload, file)
+
+        analysis_params = build_analysis_params(
+            form.cleaned_data.get('artifact_session'), form.cleaned_data.get('backend'), file.size,
+            form.cleaned_data.get('detectors'),
+        )
+        job, session_id = await sync_to_async(register_upload)(
+            file.name, save_path, content_hash, analysis_params, profiler.stages,
+        )
+        if job is None:
+            return reused_response(session_id)
+
+        # ANOMALY_ASYNC_EXECUTOR=0 이면 run_analysis_worker 가 대기열에서 가져간다
+        if settings.ANOMALY_ASYNC_EXECUTOR:
+            from .executor import submit_job
+            submit_job(job)
+        return job_accepted_response(job, session_id)
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+def chunked_upload_status(upload):
+    """청크 업로드 상태 (재개할 때 missing_chunks 만 다시 보낸다)"""
+    return {
+        'upload_id': upload.upload_id,
+        'filename': upload.original_filename,
+        'status': upload.status,
+        'size': upload.total_size,
+        'chunk_size': upload.chunk_size,
+        'total_chunks': upload.total_chunks(),
+        'missing_chunks': upload.missing_chunks(),
+        'assembled_bytes': upload.assembled_bytes,
+        'parsed_rows': upload.parsed_rows,
+        'parse_error': upload.parse_error,
+        'error': upload.error,
+        'session_id': upload.session_id or None,
+        'job_id': upload.job_id or None,
+    }
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def start_chunked_upload_view(request):
+    """
+    청크 업로드 시작 (JSON: filename, size, sha256, 선택: backend / detectors / artifact_session)
+    응답의 chunk_size 로 파일을 나눠 PUT api/uploads/<upload_id>/chunks/<번호>/ 로 보내고
+    (헤더 X-Chunk-SHA256 에 청크의 SHA-256) 모두 보내면 api/uploads/<upload_id>/complete/ 호출
+    """
+    try:
+        form = ChunkedUploadForm(json.loads(request.body))
+        if not form.is_valid():
+            return JsonResponse({'success': False, 'error': form.errors}, status=400)
+        upload = start_chunked_upload(form.cleaned_data)
+        return JsonResponse({'success': True, 'upload': chunked_upload_status(upload)}, status=201)
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+@require_http_methods(["GET"])
+def get_chunked_upload(request, upload_id):
+    """청크 업로드 상태 반환 (연결이 끊긴 뒤 이어 보낼 청크 확인)"""
+    try:
+        upload = get_object_or_404(ChunkedUpload, upload_id=upload_id)
+        return JsonResponse({'success': True, 'upload': chunked_upload_status(upload)})
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["PUT"])
+def upload_chunk(request, upload_id, index):
+    """청크 하나 수신 - 본문은 청크 바이트 그대로 (메모리에 모으지 않고 디스크로 복사)"""
+    try:
+        upload = get_object_or_404(ChunkedUpload, upload_id=upload_id)
+        checksum = request.headers.get('X-Chunk-SHA256')
+        if not checksum:
+            return JsonResponse({'success': False, 'error': 'X-Chunk-SHA256 헤더가 필요합니다.'}, status=400)
+        try:
+            upload = receive_chunk(upload, index, request, checksum)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        return JsonResponse({'success': True, 'upload': chunked_upload_status(upload)})
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def complete_chunked_upload_view(request, upload_id):
+    """청크 업로드 완료 - 전체 체크섬 확인 후 분석 작업 등록 (여러 번 호출해도 같은 결과)"""
+    try:
+        upload = get_object_or_404(ChunkedUpload, upload_id=upload_id)
+        try:
+            upload = complete_chunked_upload(upload)
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e), 'upload': chunked_upload_status(upload)}, status=400)
+        if upload.status == ChunkedUpload.STATUS_FAILED:
+            return JsonResponse({'success': False, 'error': upload.error, 'upload': chunked_upload_status(upload)}, status=400)
+        if upload.status != ChunkedUpload.STATUS_COMPLETE:
+            # 다른 요청이 이어 붙이는 / 마무리하는 중 - 잠시 후 다시 호출
+            return JsonResponse({'success': False, 'error': '업로드를 마무리하는 중입니다. 잠시 후 다시 시도해주세요.',
+                                 'upload': chunked_upload_status(upload)}, status=409)
+        if not upload.job_id:
+            return reused_response(upload.session_id)
+        job = AnalysisJob.objects.get(job_id=upload.job_id)
+        return job_accepted_response(job, upload.session_id)
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+        }, status=500)
@@ -0,0 +1,39 @@
+# apps/web/warmup.py
+
+import time
+from importlib import import_module
+
+# 탐지에 필요한 무거운 모듈 (Django 시작 시에는 불러오지 않음)
+ENGINE_MODULES = [
+    'apps.web.ai_script',
+    'apps.web.columnar',
+    'sklearn.ensemble',
+]
+BACKEND_MODULES = {
+    'pycaret': ['pycaret.anomaly'],
+}
+
+
+def warm_up(backend=None):
+    """
+    탐지 엔진과 무거운 의존성을 미리 import 하고 걸린 시간(초)을 반환
+    워커가 첫 업로드 요청에서 import 시간을 기다리지 않도록 fork 후(또는 --preload 시 fork 전)에 호출
+    wsgi.py / asgi.py 가 ANOMALY_WARMUP 설정을 보고 호출한다
+    """
+    from django.conf import settings
+    started = time.perf_counter()
+    for module in ENGINE_MODULES + BACKEND_MODULES.get(backend or settings.ANOMALY_BACKEND, []):
+        import_module(module)
+    return round(time.perf_counter() - started, 3)
+
+
+def init_job_worker():
+    """
+    분석 워커 풀(spawn)의 자식 프로세스 초기화 - Django 설정을 새로 불러오고 필요하면 warm-up
+    (이 모듈은 모델을 import 하지 않으므로 django.setup() 전에 불러와도 된다)
+    """
+    import django
+    django.setup()
+    from django.conf import settings
+    if settings.ANOMALY_WARMUP:
+        warm_up()
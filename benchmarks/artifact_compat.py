@@ -0,0 +1,85 @@
+# benchmarks/artifact_compat.py
+"""
+아티팩트 호환성 확인: 현재 형식은 저장 → 불러오기 → 점수 계산이 되고,
+이전 형식(버전 2, ce.CountEncoder / StreamingCountEncoder 시절)은 load_artifact 가
+"지원하지 않는 아티팩트 버전" 오류로 거부하는지 확인 (실패하면 종료 코드 1)
+
+    python -m benchmarks.artifact_compat
+
+인코더 / 백엔드 등 아티팩트에 들어가는 객체를 바꾸면 ARTIFACT_VERSION 을 올리고 이 확인을 다시 실행할 것
+"""
+
+import os
+import sys
+import tempfile
+
+import joblib
+
+from apps.web.ai_script import detect_anomalies
+from apps.web.artifacts import ARTIFACT_VERSION, load_artifact
+
+from .generate_logs import generate_logs
+
+ROWS = 2_000
+
+
+def check_current(tmp_dir):
+    """현재 형식으로 학습 → 저장한 아티팩트로 점수 계산"""
+    data_path = generate_logs(os.path.join(tmp_dir, 'logs.csv'), ROWS)
+    artifact_path = os.path.join(tmp_dir, 'current.pkl')
+    trained = detect_anomalies(data_path, save_artifact_to=artifact_path, backend='sklearn')
+    scored = detect_anomalies(data_path, artifact_path=artifact_path)
+    if load_artifact(artifact_path)["version"] != ARTIFACT_VERSION:
+        return "저장된 아티팩트 버전이 ARTIFACT_VERSION 과 다릅니다"
+    if scored["anomaly_count"] != trained["anomaly_count"]:
+        return f"다시 점수 계산한 결과가 다릅니다: {trained['anomaly_count']} → {scored['anomaly_count']}"
+    return None
+
+
+def check_version_2(tmp_dir):
+    """버전 2 아티팩트 (버전 값 / 이제 없는 StreamingCountEncoder 클래스) 는 ValueError 로 거부"""
+    failures = []
+    plain = os.path.join(tmp_dir, 'v2.pkl')
+    joblib.dump({"version": 2, "encoder": None, "scaler": None, "backend": None,
+                 "numeric_cols": [], "categorical_cols": []}, plain)
+
+    # 이전 트리의 스트리밍 아티팩트처럼 apps.web.encoding.StreamingCountEncoder 를 참조하는 파일
+    import apps.web.encoding as encoding
+    legacy_class = type('StreamingCountEncoder', (), {'__module__': encoding.__name__})
+    encoding.StreamingCountEncoder = legacy_class
+    try:
+        streaming = os.path.join(tmp_dir, 'v2-streaming.pkl')
+        joblib.dump({"version": 2, "encoder": legacy_class()}, streaming)
+    finally:
+        del encoding.StreamingCountEncoder
+
+    for path in (plain, streaming):
+        try:
+            load_artifact(path)
+        except ValueError as e:
+            if "지원하지 않는 아티팩트 버전" not in str(e):
+                failures.append(f"{os.path.basename(path)}: 다른 오류 메시지 - {e}")
+        except Exception as e:
+            failures.append(f"{os.path.basename(path)}: ValueError 가 아닌 오류 - {type(e).__name__}: {e}")
+        else:
+            failures.append(f"{os.path.basename(path)}: 거부되지 않았습니다")
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        failures = check_version_2(tmp_dir)
+        current = check_current(tmp_dir)
+        if current:
+            failures.append(f"현재 형식: {current}")
+    if failures:
+        print("❌ 아티팩트 호환성 확인 실패")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"✅ 현재 형식(버전 {ARTIFACT_VERSION}) 정상, 버전 2 아티팩트는 거부됨")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,200 @@
+# benchmarks/db_concurrency.py
+"""
+DB 동시성 확인: 분석 워커처럼 결과를 쓰는 프로세스와 대시보드처럼 조회하는 프로세스를 함께 돌려
+쓰기 / 읽기 지연과 'database is locked' 오류 수를 비교 (SQLite)
+
+    python -m benchmarks.db_concurrency                          # tuned(settings.py) / plain 비교
+    python -m benchmarks.db_concurrency --writers 4 --readers 8 --seconds 20 --mode tuned
+
+tuned : settings.DATABASES 그대로 (WAL, IMMEDIATE 트랜잭션, busy timeout)
+plain : OPTIONS 없는 기본 SQLite (rollback journal, DEFERRED 트랜잭션)
+모드마다 임시 디렉터리에 새 DB 를 만들어 migrate 한 뒤 측정 - 운영 DB 는 건드리지 않는다
+tuned 에서 'database is locked' 오류가 하나라도 있거나 읽기 p99 가 --max-read-p99-ms 를 넘으면 종료 코드 1
+(plain 은 비교용이라 판정하지 않는다)
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+MODES = ('tuned', 'plain')
+# 워커의 세션 저장 한 번에 들어가는 analysis_result 크기 (byte)
+RESULT_PAYLOAD_SIZE = 50_000
+# 이보다 오래 걸린 읽기 / 쓰기는 다른 프로세스에 막힌 것으로 센다 (초)
+SLOW_SECONDS = 0.1
+# tuned 모드 읽기 p99 상한 기본값 (ms) - WAL 이면 읽기는 쓰기에 막히지 않아야 한다
+MAX_READ_P99_MS = 500
+
+
+def setup_django(db_path, mode):
+    """이 프로세스의 Django 를 db_path 의 SQLite 로 설정 (plain 이면 튜닝 옵션 제거)"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'anomalytoolkit.settings')
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    import django
+    from django.conf import settings
+
+    database = settings.DATABASES['default']
+    database['ENGINE'] = 'django.db.backends.sqlite3'
+    database['NAME'] = db_path
+    if mode == 'plain':
+        database['OPTIONS'] = {}
+        database['CONN_MAX_AGE'] = 0
+    django.setup()
+
+
+def writer(db_path, mode, start_at, seconds, results):
+    """
+    분석 워커의 db_write 단계처럼 세션을 만들고 작업 진행 상황을 갱신
+    트랜잭션은 청크 업로드(receive_chunk)처럼 먼저 읽고 나서 쓴다
+    """
+    setup_django(db_path, mode)
+    from django.db import OperationalError, transaction
+    from apps.web.models import AnalysisJob, AnalysisSession
+
+    payload = {'table_html': 'x' * RESULT_PAYLOAD_SIZE}
+    latencies, errors = [], 0
+    time.sleep(max(start_at - time.time(), 0))
+    while time.time() < start_at + seconds:
+        started = time.perf_counter()
+        try:
+            with transaction.atomic():
+                AnalysisJob.objects.select_for_update().order_by('-id').first()
+                session_id = str(uuid.uuid4())
+                job = AnalysisJob.objects.create(
+                    job_id=str(uuid.uuid4()), session_id=session_id,
+                    original_filename='bench.csv', file_path='bench.csv',
+                )
+                AnalysisSession.objects.create(
+                    session_id=session_id, original_filename='bench.csv',
+                    file_path='bench.csv', file_type='CSV', analysis_result=payload,
+                )
+            AnalysisJob.objects.filter(pk=job.pk).update(progress={'percent': 100})
+        except OperationalError:
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - started)
+    results.put(('write', latencies, errors))
+
+
+def reader(db_path, mode, start_at, seconds, results):
+    """대시보드처럼 히스토리 첫 페이지와 세션 하나의 상세 결과를 조회"""
+    setup_django(db_path, mode)
+    from django.db import OperationalError
+    from apps.web.models import AnalysisSession
+
+    latencies, errors = [], 0
+    time.sleep(max(start_at - time.time(), 0))
+    while time.time() < start_at + seconds:
+        started = time.perf_counter()
+        try:
+            history = list(AnalysisSession.objects.only(
+                'id', 'session_id', 'original_filename', 'file_type', 'created_at',
+            ).order_by('-created_at', '-id')[:50])
+            if history:
+                AnalysisSession.objects.get(pk=random.choice(history).pk).analysis_result
+        except OperationalError:
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - started)
+    results.put(('read', latencies, errors))
+
+
+def run(mode, writers, readers, seconds):
+    """모드 하나를 새 DB 에서 측정하고 역할(write / read) → 측정값 dict 반환"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.sqlite3')
+        # migrate 는 자식 프로세스에서 (이 프로세스는 모드마다 다른 설정으로 다시 setup 할 수 없다)
+        ctx = multiprocessing.get_context('spawn')
+        migrate = ctx.Process(target=_migrate, args=(db_path, mode))
+        migrate.start()
+        migrate.join()
+
+        results = ctx.Queue()
+        start_at = time.time() + 3
+        processes = [ctx.Process(target=writer, args=(db_path, mode, start_at, seconds, results))
+                     for _ in range(writers)]
+        processes += [ctx.Process(target=reader, args=(db_path, mode, start_at, seconds, results))
+                      for _ in range(readers)]
+        for process in processes:
+            process.start()
+        collected = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+    report = {}
+    for role in ('write', 'read'):
+        latencies = sorted(x for r, values, _ in collected if r == role for x in values)
+        report[role] = {
+            'ops_per_sec': round(len(latencies) / seconds, 1),
+            'p50_ms': _percentile_ms(latencies, 0.5),
+            'p99_ms': _percentile_ms(latencies, 0.99),
+            'max_ms': round(latencies[-1] * 1000, 1) if latencies else None,
+            'slow': sum(1 for x in latencies if x > SLOW_SECONDS),
+            'locked_errors': sum(errors for r, _, errors in collected if r == role),
+        }
+    return report
+
+
+def _migrate(db_path, mode):
+    setup_django(db_path, mode)
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def _percentile_ms(values, q):
+    if not values:
+        return None
+    return round(values[min(int(len(values) * q), len(values) - 1)] * 1000, 1)
+
+
+def check_report(report, max_read_p99_ms):
+    """tuned 모드 판정 - 실패 사유 목록 (비어 있으면 통과)"""
+    failures = []
+    for role, m in report.items():
+        if m['locked_errors']:
+            failures.append(f"{role}: database is locked {m['locked_errors']}건")
+    p99 = report['read']['p99_ms']
+    if p99 is not None and p99 > max_read_p99_ms:
+        failures.append(f"read p99 {p99}ms > {max_read_p99_ms}ms")
+    return failures
+
+
+def print_report(mode, report):
+    print(f"\n[{mode}]")
+    print(f"{'role':<8}{'ops/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'>100ms':>10}{'locked':>10}")
+    for role, m in report.items():
+        print(f"{role:<8}{m['ops_per_sec']:>10}{str(m['p50_ms']):>10}{str(m['p99_ms']):>10}"
+              f"{str(m['max_ms']):>10}{m['slow']:>10}{m['locked_errors']:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--mode', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--max-read-p99-ms', type=float, default=MAX_READ_P99_MS,
+                        help="tuned 모드 읽기 p99 상한 (넘으면 종료 코드 1)")
+    args = parser.parse_args(argv)
+
+    failures = []
+    for mode in args.mode:
+        report = run(mode, args.writers, args.readers, args.seconds)
+        print_report(mode, report)
+        if mode == 'tuned':
+            failures = check_report(report, args.max_read_p99_ms)
+    if failures:
+        print("\n❌ tuned 설정 확인 실패")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# benchmarks/ensemble.py
+"""
+앙상블 벤치마크: 탐지기마다 detect_anomalies 를 따로 실행한 시간과
+전처리 한 번 + 병렬 학습(backend='ensemble') 한 번의 시간을 비교
+
+    python -m benchmarks.ensemble --rows 100000
+    python -m benchmarks.ensemble --rows 100000 --detectors iforest lof knn hbos ecod --n-jobs 4
+
+앙상블 시간은 가장 느린 단일 탐지기 시간에 가까워야 한다 (코어가 탐지기 수보다 적으면 그만큼 늘어남)
+pyod 일부 모델(hbos 등)은 첫 실행에 numba 컴파일 시간이 들어가므로 측정 전에 작은 데이터로 한 번 실행한다
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from apps.web.ai_script import detect_anomalies
+from apps.web.backends import DEFAULT_ENSEMBLE, ENSEMBLE_DETECTORS
+
+from .generate_logs import generate_logs
+
+WARMUP_ROWS = 2_000
+
+
+def run(path, detectors, n_jobs=None):
+    """detect_anomalies(backend='ensemble') 한 번의 (전체 시간, fit_score 단계 내부 시간)"""
+    started = time.perf_counter()
+    result = detect_anomalies(path, backend='ensemble', detectors=detectors, n_jobs=n_jobs)
+    elapsed = time.perf_counter() - started
+    stage = next(s for s in result["profile"]["stages"] if s["name"] == 'fit_score')
+    return elapsed, stage.get("steps", {})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--detectors', nargs='+', default=list(DEFAULT_ENSEMBLE), choices=list(ENSEMBLE_DETECTORS))
+    parser.add_argument('--n-jobs', type=int, default=None)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'anomaly-bench'))
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    path = os.path.join(args.data_dir, f"logs-{args.rows}.csv")
+    if not os.path.exists(path):
+        print(f"데이터 생성 중: {args.rows:,}행")
+        generate_logs(path, args.rows)
+    warmup_path = os.path.join(args.data_dir, f"logs-{WARMUP_ROWS}.csv")
+    if not os.path.exists(warmup_path):
+        generate_logs(warmup_path, WARMUP_ROWS)
+    run(warmup_path, args.detectors, args.n_jobs)
+
+    print(f"\n[{args.rows:,}행, cpus={os.cpu_count()}]")
+    print(f"{'run':<12}{'seconds':>10}")
+    singles = {}
+    for name in args.detectors:
+        singles[name], _ = run(path, [name])
+        print(f"{name:<12}{singles[name]:>10.2f}")
+    elapsed, steps = run(path, args.detectors, args.n_jobs)
+    print(f"{'ensemble':<12}{elapsed:>10.2f}")
+    print(f"\n단일 실행 합계 {sum(singles.values()):.2f}s / 가장 느린 단일 {max(singles.values()):.2f}s"
+          f" / 앙상블 {elapsed:.2f}s")
+    print("앙상블 안의 탐지기별 학습 시간: " + ", ".join(f"{k}={v}s" for k, v in steps.items()))
+
+
+if __name__ == '__main__':
+    main()
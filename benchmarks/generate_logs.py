@@ -0,0 +1,87 @@
+# benchmarks/generate_logs.py
+"""
+벤치마크용 합성 로그 CSV 생성기
+
+    python -m benchmarks.generate_logs --rows 1000000 --out /tmp/logs_1m.csv
+    python -m benchmarks.generate_logs --rows 100000 --numeric 4 --categorical 3 --cardinality 5000
+
+기본 컬럼(ts, src_ip, method, url, status, bytes, latency)에 숫자형/범주형 컬럼을 더할 수 있고,
+anomaly_ratio 비율의 행은 bytes/latency/status 를 튀게 만들어 실제 이상치가 섞이도록 한다
+첫 컬럼은 인덱스 (업로드 CSV 와 같이 index_col=0 으로 읽힘)
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# 한 번에 만들어 쓰는 행 수 (1,000만 행도 메모리 사용량이 이 크기 수준)
+WRITE_CHUNK_ROWS = 500_000
+METHODS = np.array(['GET', 'POST', 'PUT', 'DELETE'])
+METHOD_P = [0.7, 0.2, 0.07, 0.03]
+
+
+def generate_chunk(start, rows, rng, cardinality=1_000, numeric=0, categorical=0, anomaly_ratio=0.01):
+    """start 번째 행부터 rows 행의 로그 DataFrame 생성"""
+    index = np.arange(start, start + rows)
+    data = {
+        'ts': (pd.Timestamp('2025-01-01') + pd.to_timedelta(index, unit='s')).astype(str),
+        'src_ip': _categories('10.0.', rng.zipf(1.5, rows) % cardinality),
+        'method': METHODS[rng.choice(len(METHODS), rows, p=METHOD_P)],
+        'url': _categories('/api/v1/r', rng.integers(0, max(cardinality // 10, 1), rows)),
+        'status': rng.choice([200, 301, 404, 500], rows, p=[0.9, 0.03, 0.05, 0.02]),
+        'bytes': rng.lognormal(8, 1, rows).astype(np.int64),
+        'latency': rng.exponential(0.2, rows),
+    }
+    for i in range(numeric):
+        data[f'num_{i}'] = rng.normal(0, 1, rows)
+    for i in range(categorical):
+        data[f'cat_{i}'] = _categories(f'c{i}_', rng.integers(0, cardinality, rows))
+
+    # 이상 행: 응답 크기 / 지연 시간이 크게 튀고 500 응답
+    anomalies = rng.random(rows) < anomaly_ratio
+    data['bytes'][anomalies] *= 50
+    data['latency'][anomalies] += rng.exponential(10, anomalies.sum())
+    data['status'][anomalies] = 500
+    return pd.DataFrame(data, index=index)
+
+
+def _categories(prefix, codes):
+    # 고유 코드만 문자열로 만든 뒤 펼친다 (행마다 f-string 을 만들지 않도록)
+    uniques, inverse = np.unique(codes, return_inverse=True)
+    return np.array([f'{prefix}{code}' for code in uniques], dtype=object)[inverse]
+
+
+def generate_logs(path, rows, seed=42, **options):
+    """rows 행짜리 합성 로그 CSV 를 path 에 청크 단위로 기록하고 path 반환"""
+    rng = np.random.default_rng(seed)
+    tmp_path = f"{path}.tmp"
+    for start in range(0, rows, WRITE_CHUNK_ROWS):
+        chunk = generate_chunk(start, min(WRITE_CHUNK_ROWS, rows - start), rng, **options)
+        chunk.to_csv(tmp_path, mode='w' if start == 0 else 'a', header=start == 0)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="합성 로그 CSV 생성")
+    parser.add_argument('--rows', type=int, default=3_000)
+    parser.add_argument('--out', default=None, help="출력 경로 (기본: logs_<rows>.csv)")
+    parser.add_argument('--numeric', type=int, default=0, help="추가 숫자형 컬럼 수")
+    parser.add_argument('--categorical', type=int, default=0, help="추가 범주형 컬럼 수")
+    parser.add_argument('--cardinality', type=int, default=1_000, help="범주형 컬럼 고유값 수")
+    parser.add_argument('--anomaly-ratio', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    path = generate_logs(
+        args.out or f"logs_{args.rows}.csv", args.rows, seed=args.seed,
+        cardinality=args.cardinality, numeric=args.numeric,
+        categorical=args.categorical, anomaly_ratio=args.anomaly_ratio,
+    )
+    print(f"✅ {args.rows:,}행 → {path} ({os.path.getsize(path) / 1024 ** 2:,.1f}MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+# benchmarks/run_pipeline.py
+"""
+탐지 파이프라인 단계별 벤치마크 (wall time + peak RSS, 백엔드별)
+
+    python -m benchmarks.run_pipeline --rows 3000 100000 1000000 --backend sklearn pycaret
+    python -m benchmarks.run_pipeline --rows 100000 --save-baseline      # 기준값 저장
+    python -m benchmarks.run_pipeline --rows 100000 --compare            # 기준값과 비교 (회귀 시 종료 코드 1)
+
+apps/web/ai_script.detect_anomalies 를 그대로 실행하고 StageProfiler 에 기록된 단계별로 측정한다
+(백엔드마다 단계가 다르다 - 예: pycaret 은 fit_score 한 단계)
+데이터는 benchmarks.generate_logs 로 만들고 --data-dir 에 캐시해 다음 실행에서 재사용
+기준값은 실행한 머신에 따라 다르므로 같은 머신(배포 전 CI 등)에서 저장/비교할 것
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from apps.web.ai_script import detect_anomalies
+from apps.web.backends import BACKENDS
+from apps.web.profiling import StageProfiler, current_rss
+
+from .generate_logs import generate_logs
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+# 기준값보다 이 비율 이상 느려지거나 메모리를 더 쓰면 회귀로 판단
+DEFAULT_TOLERANCE = 0.25
+# 너무 짧은 단계는 측정 오차가 커서 비교에서 제외 (초)
+MIN_COMPARE_SECONDS = 0.05
+RSS_SAMPLE_INTERVAL = 0.01
+
+
+class PeakRSSProfiler(StageProfiler):
+    """StageProfiler + 단계 실행 중 최대 RSS (detect_anomalies 가 실제로 기록하는 단계를 그대로 측정)"""
+
+    @contextmanager
+    def stage(self, name, rows=None, expected_rows=None):
+        start_rss = current_rss()
+        peak = [start_rss]
+        done = threading.Event()
+
+        def sample():
+            while not done.wait(RSS_SAMPLE_INTERVAL):
+                peak[0] = max(peak[0], current_rss())
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            with super().stage(name, rows, expected_rows) as record:
+                yield record
+        finally:
+            done.set()
+            sampler.join()
+            peak[0] = max(peak[0], current_rss())
+            record["peak_rss_mb"] = round(peak[0] / 1024 ** 2, 1)
+            record["rss_growth_mb"] = round((peak[0] - start_rss) / 1024 ** 2, 1)
+
+
+def run_pipeline(file_path, backend, n_jobs=None, sketch_threshold=None):
+    """detect_anomalies 를 실행하고 프로파일러에 기록된 단계 → 측정값 dict 반환"""
+    profiler = PeakRSSProfiler()
+    start_rss = current_rss()
+    detect_anomalies(file_path, backend=backend, n_jobs=n_jobs, sketch_threshold=sketch_threshold,
+                     profiler=profiler)
+
+    stages = {
+        s["name"]: {"seconds": s["seconds"], "peak_rss_mb": s["peak_rss_mb"], "rss_growth_mb": s["rss_growth_mb"]}
+        for s in profiler.stages
+    }
+    stages['total'] = {
+        "seconds": round(sum(s["seconds"] for s in stages.values()), 4),
+        "peak_rss_mb": max(s["peak_rss_mb"] for s in stages.values()),
+        "rss_growth_mb": round(max(s["peak_rss_mb"] for s in stages.values()) - start_rss / 1024 ** 2, 1),
+    }
+    return stages
+
+
+def dataset_path(data_dir, rows, options):
+    suffix = '_'.join(f"{k}{v}" for k, v in sorted(options.items()))
+    return os.path.join(data_dir, f"logs_{rows}_{suffix}.csv")
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """기준값 대비 회귀 목록 반환 [(케이스, 단계, 지표, 기준값, 현재값)]"""
+    regressions = []
+    for case, stages in report["cases"].items():
+        for stage, current in stages.items():
+            base = baseline["cases"].get(case, {}).get(stage)
+            if base is None:
+                continue
+            if base["seconds"] >= MIN_COMPARE_SECONDS and current["seconds"] > base["seconds"] * (1 + tolerance):
+                regressions.append((case, stage, 'seconds', base["seconds"], current["seconds"]))
+            if current["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+                regressions.append((case, stage, 'peak_rss_mb', base["peak_rss_mb"], current["peak_rss_mb"]))
+    return regressions
+
+
+def print_report(report):
+    for case, stages in report["cases"].items():
+        print(f"\n▶ {case}")
+        for stage, m in stages.items():
+            print(f"  {stage:<16}{m['seconds']:>10.3f}s{m['peak_rss_mb']:>10.1f}MB (+{m['rss_growth_mb']:.1f}MB)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="탐지 파이프라인 벤치마크")
+    parser.add_argument('--rows', type=int, nargs='+', default=[3_000, 100_000])
+    parser.add_argument('--backend', nargs='+', default=['sklearn'], choices=list(BACKENDS))
+    parser.add_argument('--n-jobs', type=int, default=None)
+    parser.add_argument('--sketch-threshold', type=int, default=None)
+    parser.add_argument('--numeric', type=int, default=0)
+    parser.add_argument('--categorical', type=int, default=0)
+    parser.add_argument('--cardinality', type=int, default=1_000)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'anomaly-bench'))
+    parser.add_argument('--name', default='default', help="기준값 이름 (baselines/<name>.json)")
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--compare', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--output', default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    options = {"numeric": args.numeric, "categorical": args.categorical, "cardinality": args.cardinality}
+    os.makedirs(args.data_dir, exist_ok=True)
+
+    report = {
+        "created_at": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "options": {**options, "n_jobs": args.n_jobs, "sketch_threshold": args.sketch_threshold},
+        "cases": {},
+    }
+    for rows in args.rows:
+        path = dataset_path(args.data_dir, rows, options)
+        if not os.path.exists(path):
+            print(f"데이터 생성 중: {rows:,}행")
+            generate_logs(path, rows, **options)
+        for backend in args.backend:
+            report["cases"][f"{backend}-{rows}"] = run_pipeline(
+                path, backend, n_jobs=args.n_jobs, sketch_threshold=args.sketch_threshold
+            )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path(args.name), 'w') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"\n✅ 기준값 저장: {baseline_path(args.name)}")
+
+    if args.compare:
+        if not os.path.exists(baseline_path(args.name)):
+            print(f"\n⚠️ 기준값이 없습니다: {baseline_path(args.name)} (--save-baseline 으로 먼저 저장)")
+            return 1
+        with open(baseline_path(args.name)) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%})")
+            for case, stage, metric, base, current in regressions:
+                print(f"  {case} / {stage} / {metric}: {base} → {current}")
+            return 1
+        print("\n✅ 기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())